@@ -1,12 +1,31 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import re
 import os
-from typing import Dict, List
-import PyPDF2
-import docx
-from io import BytesIO
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import json
+import time
+import gc
+import inspect
+import numpy as np
+from skill_matcher import SkillMatcher, SkillTaxonomy
+from skill_bits import overlap_counts, pack, popcount, words_for
+from caching import DiskCache, SQLiteCache, TieredCache, content_hash, text_fingerprint
+from text_extraction import extract_document_text, part_type
+from extraction_pool import ExtractionPool, ExtractionTimeout
+import atexit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from resume_index import ResumeIndex
+from scoring import IdfTable, ScoringEngine, SkillBoost
+from document import ANALYSIS_STEPS, AnalysisLimits, AnalyzedDocument, PassProfile
+from llm_client import CircuitBreaker, LLMClient, LLMUnavailable
+from metrics import CONTENT_TYPE, LLM_BUCKETS, MetricsRegistry
+from user_store import MemoryUserStore, SQLiteUserStore
+from job_queue import JobWorkers, MemoryJobBroker, QueueFull, SQLiteJobBroker
+from response_codec import COMPRESSIBLE_MIMETYPES, Compressor, json_encoder
+from uploads import UploadSpool
+from startup_snapshot import load_or_build, source_key
 
 app = Flask(__name__)
 CORS(app)
@@ -14,124 +33,469 @@ CORS(app)
 # OpenAI API key (set as environment variable)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# LLM client: endpoint/model, per-call timeout, concurrency cap with queue-wait budget, retries and circuit breaker
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 30))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv('LLM_QUEUE_TIMEOUT_SECONDS', 2))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', 5))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv('LLM_BREAKER_RESET_SECONDS', 30))
+
+# Optional JSON file of canonical skill -> aliases replacing the built-in taxonomy
+SKILL_TAXONOMY_PATH = os.getenv('SKILL_TAXONOMY_PATH')
+
+# Extracted-text cache: in-memory LRU size and optional shared on-disk directory
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+EXTRACTION_CACHE_DIR = os.getenv('EXTRACTION_CACHE_DIR')
+
+# Job analysis cache shared by /api/analyze-job and /api/tailor-resume ('memory' or 'sqlite' for all workers)
+JOB_CACHE_MAX_BYTES = int(os.getenv('JOB_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+JOB_CACHE_TTL_SECONDS = float(os.getenv('JOB_CACHE_TTL_SECONDS', 3600))
+JOB_CACHE_BACKEND = os.getenv('JOB_CACHE_BACKEND', 'memory')
+JOB_CACHE_PATH = os.getenv('JOB_CACHE_PATH', 'job_cache.sqlite3')
+
+# Tailored-resume cache for LLM results: in-memory LRU plus a size-bounded directory ('' = memory only)
+LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', 'llm_cache')
+LLM_CACHE_DISK_MAX_BYTES = int(os.getenv('LLM_CACHE_DISK_MAX_BYTES', 256 * 1024 * 1024))
+
+# Uploaded resumes kept server-side with their analyses, referenced by resume_id ('sqlite' shares them across workers)
+RESUME_STORE_MAX_BYTES = int(os.getenv('RESUME_STORE_MAX_BYTES', 32 * 1024 * 1024))
+RESUME_STORE_TTL_SECONDS = float(os.getenv('RESUME_STORE_TTL_SECONDS', 86400))
+RESUME_STORE_BACKEND = os.getenv('RESUME_STORE_BACKEND', 'memory')
+RESUME_STORE_PATH = os.getenv('RESUME_STORE_PATH', 'resumes.sqlite3')
+
+# Extraction budget: stop reading after this many PDF pages or characters (0 = unlimited)
+EXTRACT_MAX_PAGES = int(os.getenv('EXTRACT_MAX_PAGES', 50))
+EXTRACT_MAX_CHARS = int(os.getenv('EXTRACT_MAX_CHARS', 100000))
+
+# Request budgets: body bytes per endpoint, checked from Content-Length before anything is read (0 = unlimited)
+UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', 10 * 1024 * 1024))
+ANALYZE_MAX_BYTES = int(os.getenv('ANALYZE_MAX_BYTES', 256 * 1024))
+TAILOR_MAX_BYTES = int(os.getenv('TAILOR_MAX_BYTES', 512 * 1024))
+BATCH_MAX_BYTES = int(os.getenv('BATCH_MAX_BYTES', 4 * 1024 * 1024))
+INDEX_MAX_BYTES = int(os.getenv('INDEX_MAX_BYTES', 512 * 1024))
+
+# Characters accepted per resume and per job description in a request (0 = unlimited)
+RESUME_MAX_CHARS = int(os.getenv('RESUME_MAX_CHARS', 100000))
+JOB_MAX_CHARS = int(os.getenv('JOB_MAX_CHARS', 100000))
+
+# Uploads stop at the resume budget as well, so an uploaded resume can always be sent back for tailoring
+UPLOAD_TEXT_MAX_CHARS = min([limit for limit in (EXTRACT_MAX_CHARS, RESUME_MAX_CHARS) if limit], default=0)
+
+# Analysis mode: 'bounded' caps the characters each extraction step reads, 'full' reads everything
+ANALYSIS_MODE = os.getenv('ANALYSIS_MODE', 'bounded')
+ANALYSIS_STEP_MAX_CHARS = int(os.getenv('ANALYSIS_STEP_MAX_CHARS', 50000))
+
+# Optional process pool for parsing uploads outside the request process (0 = parse in-process)
+EXTRACTION_POOL_SIZE = int(os.getenv('EXTRACTION_POOL_SIZE', 0))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv('EXTRACTION_TIMEOUT_SECONDS', 20))
+EXTRACTION_WORKER_MAX_TASKS = int(os.getenv('EXTRACTION_WORKER_MAX_TASKS', 100))
+
+# Batch tailoring: postings per request and threads shared by all batch requests
+BATCH_MAX_JOBS = int(os.getenv('BATCH_MAX_JOBS', 50))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 8))
+
+# Similarity scoring: 'cosine' (TF-IDF) or 'bm25', optional corpus IDF table, skill boost and cap
+SCORING_METHOD = os.getenv('SCORING_METHOD', 'cosine')
+IDF_TABLE_PATH = os.getenv('IDF_TABLE_PATH')
+SCORE_SKILL_BOOST = float(os.getenv('SCORE_SKILL_BOOST', 0.1))
+SCORE_MAX_SKILL_BOOST = float(os.getenv('SCORE_MAX_SKILL_BOOST', 0.3))
+SCORE_CAP = float(os.getenv('SCORE_CAP', 0.95))
+
+# Dashboard stats store: 'sqlite' (shared by workers, survives restarts) or 'memory'
+USER_STORE_BACKEND = os.getenv('USER_STORE_BACKEND', 'sqlite')
+USER_STORE_PATH = os.getenv('USER_STORE_PATH', 'user_stats.sqlite3')
+USER_ACTIVITY_LIMIT = int(os.getenv('USER_ACTIVITY_LIMIT', 10))
+USER_STORE_BATCH_SIZE = int(os.getenv('USER_STORE_BATCH_SIZE', 200))
+USER_STORE_FLUSH_SECONDS = float(os.getenv('USER_STORE_FLUSH_SECONDS', 0.5))
+
+# Upper bound on top_k accepted by /api/rank-resumes
+RANK_MAX_TOP_K = int(os.getenv('RANK_MAX_TOP_K', 100))
+
+# Async tailoring jobs: broker ('memory' or 'sqlite' shared by workers), worker threads, queue depth,
+# seconds a job may wait for a worker, seconds results are kept, running-job lease and longest long-poll
+JOB_QUEUE_BACKEND = os.getenv('JOB_QUEUE_BACKEND', 'memory')
+JOB_QUEUE_PATH = os.getenv('JOB_QUEUE_PATH', 'jobs.sqlite3')
+JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', 4))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv('JOB_QUEUE_MAX_DEPTH', 100))
+JOB_TTL_SECONDS = float(os.getenv('JOB_TTL_SECONDS', 300))
+JOB_RESULT_TTL_SECONDS = float(os.getenv('JOB_RESULT_TTL_SECONDS', 600))
+JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 300))
+JOB_POLL_MAX_WAIT_SECONDS = float(os.getenv('JOB_POLL_MAX_WAIT_SECONDS', 30))
+
+# Response encoding: JSON encoder ('auto' uses orjson when installed, or 'orjson'/'stdlib'), content encodings
+# offered in preference order ('' = never compress), smallest body worth compressing and compression levels
+JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+RESPONSE_ENCODINGS = [e.strip() for e in os.getenv('RESPONSE_ENCODINGS', 'br,gzip').split(',') if e.strip()]
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 4))
+
+# Uploaded files stay in memory up to this size and are spooled to a temp file (in UPLOAD_SPOOL_DIR) past it
+UPLOAD_SPOOL_MEMORY_BYTES = int(os.getenv('UPLOAD_SPOOL_MEMORY_BYTES', 1024 * 1024))
+UPLOAD_SPOOL_DIR = os.getenv('UPLOAD_SPOOL_DIR') or None
+
+# Startup: optional snapshot file of the compiled skill matcher and IDF table (rebuilt when their sources
+# change), and a warm-up at import that loads lazy parsers and runs the pipeline once (use with gunicorn --preload)
+STARTUP_SNAPSHOT_PATH = os.getenv('STARTUP_SNAPSHOT_PATH')
+STARTUP_WARM_UP = os.getenv('STARTUP_WARM_UP', 'false').lower() == 'true'
+
+# Per-stage metrics served at /metrics
+metrics = MetricsRegistry('resume_tailor')
+EXTRACTION_SECONDS = metrics.histogram('extraction_seconds', 'Time to parse text out of an upload', ['file_type'])
+EXTRACTION_FAILURES = metrics.counter(
+    'extraction_failures_total', 'Uploads whose text could not be extracted', ['file_type', 'reason']
+)
+JOB_ANALYSIS_SECONDS = metrics.histogram(
+    'job_analysis_seconds', 'Time to analyze a job description, by analysis cache outcome', ['cache']
+)
+SIMILARITY_SECONDS = metrics.histogram('similarity_seconds', 'Time to score a batch of resumes against jobs')
+LLM_CALL_SECONDS = metrics.histogram(
+    'llm_call_seconds', 'Time spent on a tailoring completion, including queueing and retries',
+    ['mode', 'outcome'], LLM_BUCKETS
+)
+FALLBACK_SECONDS = metrics.histogram('fallback_tailoring_seconds', 'Time to build the rule-based tailored resume')
+TAILORING_TOTAL = metrics.counter('tailoring_total', 'Tailored resumes by where the text came from', ['source'])
+JSON_SECONDS = metrics.histogram('json_serialization_seconds', 'Time to serialize JSON responses')
+COMPRESSION_SECONDS = metrics.histogram('compression_seconds', 'Time to compress response bodies', ['encoding'])
+RESPONSE_SERIALIZED_BYTES = metrics.counter(
+    'response_serialized_bytes_total', 'Response body bytes before compression', ['endpoint']
+)
+RESPONSE_SENT_BYTES = metrics.counter(
+    'response_sent_bytes_total', 'Response body bytes sent, by content encoding', ['endpoint', 'encoding']
+)
+REJECTED_REQUESTS = metrics.counter(
+    'rejected_requests_total', 'Requests refused with 413 for exceeding a byte or character budget',
+    ['endpoint', 'budget']
+)
+JOBS_SUBMITTED = metrics.counter(
+    'jobs_submitted_total', 'Async tailoring jobs submitted, by whether the queue accepted them', ['outcome']
+)
+ANALYSIS_LIMIT_HITS = metrics.counter(
+    'analysis_limit_hits_total', 'Responses where a bounded analysis step read only part of its input', ['step']
+)
+
+class SpoolingRequest(Request):
+    """Request whose uploaded files are spooled into UploadSpools, hashed as they arrive"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return UploadSpool(UPLOAD_SPOOL_MEMORY_BYTES, UPLOAD_SPOOL_DIR)
+
+app.request_class = SpoolingRequest
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider using the configured encoder, with serialization time recorded
+    
+    The encoder gets Flask's default hook (dates, dataclasses, Decimal, UUID) and
+    sort_keys; calls with their own json.dumps options, and responses when
+    compact is set to False, go to Flask's implementation. Debug mode keeps the
+    compact encoder so it is measured and sized as in production.
+    """
+    
+    def __init__(self, app, encoder):
+        super().__init__(app)
+        self.encode = encoder
+    
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+    
+    def dumps_bytes(self, obj) -> bytes:
+        with JSON_SECONDS.time():
+            return self.encode(obj, self.default, self.sort_keys)
+    
+    def response(self, *args, **kwargs) -> Response:
+        if self.compact is False:
+            return super().response(*args, **kwargs)
+        # Build the body from bytes directly instead of encoding a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+app.json = FastJSONProvider(app, json_encoder(JSON_ENCODER))
+compressor = Compressor(RESPONSE_ENCODINGS, COMPRESSION_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY)
+
+@app.after_request
+def compress_response(response):
+    """Compress buffered text responses the client accepts and count bytes before and after"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code in (204, 304)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+    endpoint = request.endpoint or 'unknown'
+    body = response.get_data()
+    RESPONSE_SERIALIZED_BYTES.inc(len(body), endpoint=endpoint)
+    
+    encoding = compressor.negotiate(request.accept_encodings, len(body))
+    if compressor.encodings:
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        with COMPRESSION_SECONDS.time(encoding=encoding):
+            compressed = compressor.compress(body, encoding)
+        if len(compressed) < len(body):
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+            body = compressed
+        else:
+            encoding = None
+    RESPONSE_SENT_BYTES.inc(len(body), endpoint=endpoint, encoding=encoding or 'identity')
+    return response
+
 class ResumeProcessor:
-    def __init__(self):
+    # Bump when analyze_job_description output changes so shared caches miss old entries
+    JOB_ANALYSIS_VERSION = 3
+    
+    # Bump when text extraction output changes so the on-disk extraction cache misses old entries
+    EXTRACTION_VERSION = 2
+    
+    # Company name after "at", "join" or "@"; the name ends at the first space or punctuation
+    COMPANY_PATTERN = re.compile(r'(?:at|join|@)\s+([A-Z][a-zA-Z\s&]{1,80}?)(?:\s|,|\.|\n)')
+    
+    # Sampling parameters for the tailoring completion
+    LLM_MAX_TOKENS = 1500
+    LLM_TEMPERATURE = 0.7
+    
+    # Output headings for resume sections that are rewritten
+    RESUME_SECTION_TITLES = {
+        'experience': 'PROFESSIONAL EXPERIENCE',
+        'education': 'EDUCATION',
+        'projects': 'KEY PROJECTS'
+    }
+    
+    # Bump when the tailoring prompt changes so cached completions are not reused
+    TAILORING_PROMPT_VERSION = 1
+    
+    # Bump when document analyses change so stored resumes are not restored with stale ones
+    RESUME_SNAPSHOT_VERSION = 1
+    
+    # From this many resumes on, skill overlaps come from one packed fingerprint matrix per job
+    PACKED_OVERLAP_MIN_RESUMES = 64
+    
+    # Required skills that select portfolio project suggestions
+    PROJECT_SKILLS = ('react', 'node.js', 'aws', 'python')
+    
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None, extraction_cache: Optional[TieredCache] = None,
+                 max_pages: int = 0, max_chars: int = 0, extraction_pool: Optional[ExtractionPool] = None,
+                 scoring_engine: Optional[ScoringEngine] = None, skill_boost: Optional[SkillBoost] = None,
+                 job_cache: Optional[TieredCache] = None, llm_client: Optional[LLMClient] = None,
+                 llm_cache: Optional[TieredCache] = None, analysis_max_chars: Optional[Dict[str, int]] = None,
+                 resume_store: Optional[TieredCache] = None, skill_matcher: Optional[SkillMatcher] = None):
         self.ats_keywords = [
             'experience', 'skills', 'education', 'projects', 'achievements',
             'responsibilities', 'managed', 'developed', 'implemented', 'led',
             'created', 'designed', 'optimized', 'improved', 'collaborated'
         ]
         
-        # Common tech skills for pattern matching
-        self.tech_skills = [
-            'javascript', 'python', 'java', 'react', 'nodejs', 'node.js', 'sql', 'aws', 
-            'docker', 'kubernetes', 'git', 'html', 'css', 'typescript', 'mongodb', 
-            'postgresql', 'redis', 'graphql', 'rest', 'angular', 'vue', 'express', 
-            'django', 'flask', 'spring', 'laravel', 'ruby', 'php', 'c++', 'c#', 
-            'golang', 'rust', 'swift', 'kotlin', 'flutter', 'reactnative', 'firebase',
-            'azure', 'gcp', 'terraform', 'jenkins', 'ci/cd', 'agile', 'scrum'
-        ]
+        # Skill taxonomy compiled once into a single-pass matcher, unless one was loaded prebuilt
+        self.skill_matcher = skill_matcher or SkillMatcher(taxonomy or SkillTaxonomy.default())
+        self.tech_skills = self.skill_matcher.taxonomy.canonical_ids
+        self.project_skill_bits = {skill: self.skill_matcher.fingerprint([skill]) for skill in self.PROJECT_SKILLS}
+        
+        # Extracted text keyed by a hash of the uploaded bytes
+        self.extraction_cache = extraction_cache
+        
+        # Page and character budget for extraction
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        
+        # Parse in worker processes when a pool is configured
+        self.extraction_pool = extraction_pool
+        
+        # Base similarity plus skill-match boost and cap
+        self.scoring_engine = scoring_engine or ScoringEngine()
+        self.skill_boost = skill_boost or SkillBoost()
+        
+        # Job analyses keyed by a fingerprint of the normalized posting text
+        self.job_cache = job_cache
+        
+        # Shared LLM client; None means rule-based tailoring only
+        self.llm_client = llm_client
+        
+        # Tailored resumes from the LLM keyed by everything that goes into the prompt
+        self.llm_cache = llm_cache
+        
+        # Characters each analysis step may read per document; None analyzes everything
+        self.analysis_max_chars = analysis_max_chars
+        
+        # Resume snapshots (text plus analyses) keyed by a hash of the text
+        self.resume_store = resume_store
     
     def extract_text_from_file(self, file_content: bytes, filename: str) -> str:
         """Extract text from uploaded file"""
+        return self.extract_text_with_info(file_content, filename)['text']
+    
+    def extract_text_with_info(self, file_content: Union[bytes, UploadSpool], filename: str) -> Dict[str, any]:
+        """Extract text within the page/character budget, reusing earlier results for identical uploads
+        
+        A spooled upload is parsed in place and was already hashed while it was spooled.
+        """
+        if not self.extraction_cache:
+            return self._parse_file(file_content, filename)
+        
+        # The same bytes parse differently as PDF, DOCX or plain text, and under other budgets; only the
+        # parser chosen from the filename goes into the key, never the client's text, since it names a file
+        digest = file_content.digest if isinstance(file_content, UploadSpool) else content_hash(file_content)
+        key = f"{digest}.{part_type(filename)}.{self.max_pages}.{self.max_chars}.v{self.EXTRACTION_VERSION}"
+        cached = self.extraction_cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        
+        result = self._parse_file(file_content, filename)
+        if result['text']:  # Never cache failed extractions
+            self.extraction_cache.put(key, json.dumps(result))
+        return result
+    
+    def _parse_file(self, file_content: Union[bytes, UploadSpool], filename: str) -> Dict[str, any]:
+        """Parse text out of a PDF, DOCX or plain text upload"""
+        file_type = os.path.splitext(filename.lower())[1].lstrip('.') or 'txt'
+        start = time.perf_counter()
         try:
-            if filename.lower().endswith('.pdf'):
-                pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
-            elif filename.lower().endswith('.docx'):
-                doc = docx.Document(BytesIO(file_content))
-                text = ""
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-                return text
-            else:  # txt file
-                return file_content.decode('utf-8')
+            if isinstance(file_content, UploadSpool):
+                result = self._parse_upload(file_content, filename)
+            elif self.extraction_pool:
+                result = self.extraction_pool.extract(file_content, filename, self.max_pages, self.max_chars)
+            else:
+                result = extract_document_text(file_content, filename, self.max_pages, self.max_chars)
+            if not result['text'].strip():
+                EXTRACTION_FAILURES.inc(file_type=file_type, reason='empty')
+            return result
+        except ExtractionTimeout:
+            EXTRACTION_FAILURES.inc(file_type=file_type, reason='timeout')
+            raise
         except Exception as e:
             print(f"Error extracting text: {e}")
-            return ""
+            EXTRACTION_FAILURES.inc(file_type=file_type, reason='error')
+            return {
+                'text': '',
+                'truncated': False,
+                'truncated_by': None,
+                'parts_read': 0,
+                'part_type': part_type(filename)
+            }
+        finally:
+            EXTRACTION_SECONDS.observe(time.perf_counter() - start, file_type=file_type)
     
-    def extract_skills_and_keywords(self, text: str) -> Dict[str, List[str]]:
-        """Extract skills and keywords using pattern matching"""
-        text_lower = text.lower()
-        
-        # Find technical skills
-        found_tech_skills = []
-        for skill in self.tech_skills:
-            if skill in text_lower:
-                found_tech_skills.append(skill)
-        
-        # Extract potential skills using regex patterns
-        skill_patterns = [
-            r'\b(?:JavaScript|Python|Java|React|Node\.js|SQL|AWS|Docker|Kubernetes|Git)\b',
-            r'\b(?:HTML|CSS|TypeScript|MongoDB|PostgreSQL|Redis|GraphQL|REST)\b',
-            r'\b(?:Angular|Vue|Express|Django|Flask|Spring|Laravel|Ruby|PHP)\b',
-            r'\b(?:C\+\+|C#|Golang|Rust|Swift|Kotlin|Flutter|React Native)\b'
-        ]
-        
-        extracted_skills = []
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            extracted_skills.extend([match.lower() for match in matches])
-        
-        # Combine and deduplicate
-        all_skills = list(set(found_tech_skills + extracted_skills))
+    def _parse_upload(self, upload: UploadSpool, filename: str) -> Dict[str, any]:
+        """Parse a spooled upload from a view of its buffer or memory-mapped temp file"""
+        if self.extraction_pool and upload.path:
+            return self.extraction_pool.extract_file(upload.path, filename, self.max_pages, self.max_chars)
+        with upload.view() as content:
+            if self.extraction_pool:
+                # Still in memory, so this copy is at most UPLOAD_SPOOL_MEMORY_BYTES
+                return self.extraction_pool.extract(bytes(content), filename, self.max_pages, self.max_chars)
+            return extract_document_text(content, filename, self.max_pages, self.max_chars)
+    
+    def analyze(self, text: str, profile: Optional[PassProfile] = None) -> AnalyzedDocument:
+        """Wrap text in a document whose analyses are computed once and shared by every stage
         
-        # Extract company names (simple pattern)
-        company_pattern = r'\b([A-Z][a-z]+ (?:Inc|Corp|LLC|Ltd|Company|Technologies|Systems|Solutions))\b'
-        companies = re.findall(company_pattern, text)
+        In bounded mode the document gets its own AnalysisLimits, so each
+        extraction step reads at most analysis_max_chars of it.
+        """
+        return AnalyzedDocument(text, self.skill_matcher, self._split_sections, profile, self._limits())
+    
+    def _limits(self) -> Optional[AnalysisLimits]:
+        return AnalysisLimits(self.analysis_max_chars) if self.analysis_max_chars else None
+    
+    def _resume_key(self, resume_id: str) -> str:
+        return f"resume-v{self.RESUME_SNAPSHOT_VERSION}:{resume_id}"
+    
+    def store_resume(self, resume: AnalyzedDocument) -> str:
+        """Keep a resume and its tokens, skills and sections server-side, returning its content-hash ID"""
+        resume_id = content_hash(resume.text.encode('utf-8'))
+        if self.resume_store:
+            self.resume_store.put(self._resume_key(resume_id), json.dumps(resume.snapshot()))
+        return resume_id
+    
+    def load_resume(self, resume_id: str, profile: Optional[PassProfile] = None) -> Optional[AnalyzedDocument]:
+        """A stored resume with its analyses restored, or None if it is unknown or expired"""
+        if not self.resume_store:
+            return None
+        cached = self.resume_store.get(self._resume_key(resume_id))
+        if cached is None:
+            return None
+        return AnalyzedDocument.restore(json.loads(cached), self.skill_matcher, self._split_sections,
+                                        profile, self._limits())
+    
+    def _document(self, text: Union[str, AnalyzedDocument]) -> AnalyzedDocument:
+        return text if isinstance(text, AnalyzedDocument) else self.analyze(text)
+    
+    def _split_sections(self, doc: AnalyzedDocument) -> Dict[str, str]:
+        return {'requirements': self._extract_requirements_section(doc)}
+    
+    def extract_skills_and_keywords(self, text: Union[str, AnalyzedDocument]) -> Dict[str, List[str]]:
+        """Extract skills and keywords using pattern matching"""
+        doc = self._document(text)
         
         return {
-            'technical_skills': all_skills[:15],  # Limit to top 15
+            'technical_skills': list(doc.skills[:15]),  # Limit to top 15
             'general_skills': self.ats_keywords[:10],  # Use ATS keywords as general skills
-            'entities': companies[:5]  # Limit to 5 companies
+            'entities': list(doc.entities[:5])  # Limit to 5 companies
         }
     
-    def analyze_job_description(self, job_text: str) -> Dict[str, any]:
-        """Analyze job description to extract requirements"""
+    def analyze_job_description(self, job_text: Union[str, AnalyzedDocument]) -> Dict[str, any]:
+        """Analyze job description to extract requirements, reusing analyses of the same posting"""
+        start = time.perf_counter()
+        job = self._document(job_text)
+        if not self.job_cache:
+            job_analysis = self._analyze_job(job)
+            JOB_ANALYSIS_SECONDS.observe(time.perf_counter() - start, cache='disabled')
+            return job_analysis
+        
+        # Bounded analyses of long postings differ from full ones, so each step budget gets its own entries
+        budget = f"b{json.dumps(job.limits.max_chars, sort_keys=True)}:" if job.limits else ''
+        key = f"job-v{self.JOB_ANALYSIS_VERSION}:{budget}{text_fingerprint(job.text)}"
+        cached = self.job_cache.get(key)
+        if cached is not None:
+            entry = json.loads(cached)
+            # Report the limits the original analysis hit
+            for step in entry['limits_hit'] if job.limits else ():
+                job.limits.record(step)
+            JOB_ANALYSIS_SECONDS.observe(time.perf_counter() - start, cache='hit')
+            return entry['job_analysis']
+        
+        job_analysis = self._analyze_job(job)
+        self.job_cache.put(key, json.dumps({
+            'job_analysis': job_analysis,
+            'limits_hit': sorted(job.limits.hit) if job.limits else []
+        }))
+        JOB_ANALYSIS_SECONDS.observe(time.perf_counter() - start, cache='miss')
+        return job_analysis
+    
+    def _analyze_job(self, job: AnalyzedDocument) -> Dict[str, any]:
         # Extract requirements sections
-        requirements_section = self._extract_requirements_section(job_text)
-        skills_extracted = self.extract_skills_and_keywords(requirements_section)
+        skills_extracted = self.extract_skills_and_keywords(job.sections['requirements'])
         
         # Extract company name (simple pattern)
-        company_pattern = r'(?:at|join|@)\s+([A-Z][a-zA-Z\s&]+?)(?:\s|,|\.|\n)'
-        company_match = re.search(company_pattern, job_text)
+        company_match = self.COMPANY_PATTERN.search(job.clipped('company'))
         company = company_match.group(1).strip() if company_match else 'Tech Company'
         
         return {
             'required_skills': skills_extracted['technical_skills'],
             'preferred_skills': skills_extracted['general_skills'][:10],
             'company': company,
-            'role': self._extract_role_title(job_text),
-            'key_phrases': self._extract_key_phrases(job_text)
+            'role': self._extract_role_title(job),
+            'key_phrases': self._extract_key_phrases(job)
         }
     
-    def _extract_requirements_section(self, text: str) -> str:
-        """Extract requirements/qualifications section"""
-        patterns = [
-            r'(?i)requirements?:?(.*?)(?=responsibilities|duties|benefits|about|$)',
-            r'(?i)qualifications?:?(.*?)(?=responsibilities|duties|benefits|about|$)',
-            r'(?i)skills?:?(.*?)(?=responsibilities|duties|benefits|about|$)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.DOTALL)
-            if match:
-                return match.group(1)
-        
-        return text  # Return full text if no section found
+    def _extract_requirements_section(self, text: Union[str, AnalyzedDocument]) -> str:
+        """Extract requirements, qualifications and skills sections"""
+        # Full text if the posting has none of those headings
+        return self._document(text).section_map.requirements_text()
     
-    def _extract_role_title(self, text: str) -> str:
+    def _extract_role_title(self, text: Union[str, AnalyzedDocument]) -> str:
         """Extract job role title"""
-        lines = text.split('\n')
-        for line in lines[:5]:  # Check first 5 lines
+        doc = self._document(text)
+        # The title sits above the first heading; fall back to the opening lines
+        preamble = doc.section_map.preamble
+        candidates = preamble.split('\n')[:5] if preamble.strip() else doc.lines[:5]
+        for line in candidates:
             if any(word in line.lower() for word in ['engineer', 'developer', 'manager', 'analyst', 'specialist']):
                 return line.strip()
         return 'Software Engineer'
     
-    def _extract_key_phrases(self, text: str) -> List[str]:
+    def _extract_key_phrases(self, text: Union[str, AnalyzedDocument]) -> List[str]:
         """Extract key phrases from job description"""
         phrases = [
             'team player', 'problem solving', 'communication skills',
@@ -140,118 +504,149 @@ class ResumeProcessor:
         ]
         
         found_phrases = []
-        text_lower = text.lower()
+        text_lower = self._document(text).lower
         for phrase in phrases:
             if phrase in text_lower:
                 found_phrases.append(phrase)
         
         return found_phrases
     
-    def calculate_similarity_score(self, resume_text: str, job_text: str) -> float:
-        """Calculate similarity score using keyword matching"""
+    def calculate_similarity_score(self, resume_text: Union[str, AnalyzedDocument],
+                                   job_text: Union[str, AnalyzedDocument]) -> float:
+        """Calculate similarity score using TF-IDF/BM25 term weights plus skill matches"""
         try:
             # Ensure we have valid text
             if not resume_text or not job_text:
                 return 0.0
             
-            resume_words = set(resume_text.lower().split())
-            job_words = set(job_text.lower().split())
-            
-            # Ensure we have words to compare
-            if not resume_words or not job_words:
-                return 0.0
-            
-            # Find common words
-            common_words = resume_words.intersection(job_words)
-            
-            # Calculate Jaccard similarity
-            union_words = resume_words.union(job_words)
-            similarity = len(common_words) / len(union_words) if len(union_words) > 0 else 0.0
-            
-            # Boost score for technical skills matches
-            job_skills = self.extract_skills_and_keywords(job_text)['technical_skills']
-            resume_skills = self.extract_skills_and_keywords(resume_text)['technical_skills']
-            
-            skill_matches = len(set(job_skills).intersection(set(resume_skills)))
-            skill_boost = min(skill_matches * 0.1, 0.3) if skill_matches > 0 else 0.0  # Max 30% boost
-            
-            final_score = min(similarity + skill_boost, 0.95)  # Cap at 95%
-            return max(final_score, 0.0)  # Ensure non-negative
+            return self.calculate_similarity_scores([resume_text], [job_text])[0][0]
         except Exception as e:
             print(f"Error calculating similarity score: {e}")
             return 0.5  # Return a default score
     
-    def tailor_resume_with_ai(self, resume_text: str, job_analysis: Dict, similarity_score: float) -> Dict[str, any]:
-        """Use AI to tailor resume content"""
+    def calculate_similarity_scores(self, resume_texts: List[Union[str, AnalyzedDocument]],
+                                    job_texts: List[Union[str, AnalyzedDocument]]) -> List[List[float]]:
+        """Score every resume against every job with one matrix product"""
+        with SIMILARITY_SECONDS.time():
+            return self._similarity_scores(resume_texts, job_texts)
+    
+    def _similarity_scores(self, resume_texts: List[Union[str, AnalyzedDocument]],
+                           job_texts: List[Union[str, AnalyzedDocument]]) -> List[List[float]]:
+        resumes = [self._document(text) for text in resume_texts]
+        jobs = [self._document(text) for text in job_texts]
+        
+        base_scores = self.scoring_engine.score(
+            [resume.tokens for resume in resumes],
+            [job.tokens for job in jobs]
+        )
+        
+        # Boost score for technical skills matches, counted by ANDing skill fingerprints
+        return self.skill_boost.apply_matrix(np.asarray(base_scores), self.skill_overlaps(resumes, jobs)).tolist()
+    
+    def skill_overlaps(self, resumes: List[AnalyzedDocument], jobs: List[AnalyzedDocument]) -> np.ndarray:
+        """Shared skills of every resume/job pair, as a (resumes, jobs) matrix"""
+        if len(resumes) >= self.PACKED_OVERLAP_MIN_RESUMES:
+            packed = pack([resume.skill_bits for resume in resumes], words_for(self.skill_matcher.skill_count))
+            return np.stack([overlap_counts(job.skill_bits, packed) for job in jobs], axis=1)
+        return np.array([[popcount(resume.skill_bits & job.skill_bits) for job in jobs] for resume in resumes],
+                        dtype=np.int64).reshape(len(resumes), len(jobs))
+    
+    def skill_gap(self, resume: Union[str, AnalyzedDocument], job_analysis: Dict) -> List[str]:
+        """Required skills of a job that the resume does not mention"""
+        required = self.skill_matcher.fingerprint(job_analysis.get('required_skills', []))
+        return self.skill_matcher.skill_names(required & ~self._document(resume).skill_bits)
+    
+    def _build_tailoring_messages(self, resume_text: str, job_analysis: Dict) -> List[Dict[str, str]]:
+        """Chat messages asking the LLM to rewrite a resume for a job"""
+        prompt = f"""
+        Rewrite this resume to better match the job requirements. Focus on:
+        1. Including relevant keywords: {', '.join(job_analysis.get('required_skills', []))}
+        2. Emphasizing experience related to: {', '.join(job_analysis.get('key_phrases', []))}
+        3. Optimizing for ATS systems
+        4. Maintaining truthfulness while highlighting relevant skills
+        
+        Original Resume:
+        {resume_text}
+        
+        Job Role: {job_analysis.get('role', 'Software Engineer')}
+        Company: {job_analysis.get('company', 'Tech Company')}
+        
+        Provide a tailored version that maintains the original structure but optimizes for this specific role.
+        """
+        return [
+            {"role": "system", "content": "You are an expert resume writer and ATS optimization specialist."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _llm_cache_key(self, resume_text: str, job_analysis: Dict) -> str:
+        """Hash of the resume, canonical job analysis, model, sampling parameters and prompt version"""
+        return content_hash(json.dumps({
+            'prompt_version': self.TAILORING_PROMPT_VERSION,
+            'model': self.llm_client.model,
+            'max_tokens': self.LLM_MAX_TOKENS,
+            'temperature': self.LLM_TEMPERATURE,
+            'resume': resume_text,
+            'job_analysis': job_analysis
+        }, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    
+    def _cached_tailoring(self, resume_text: str, job_analysis: Dict,
+                          use_cache: bool) -> Tuple[Optional[str], Optional[str], str]:
+        """Look up a cached LLM result, returning (cache key, tailored text, cache outcome)"""
+        if not self.llm_client or not self.llm_cache:
+            return None, None, 'disabled'
+        key = self._llm_cache_key(resume_text, job_analysis)
+        if not use_cache:
+            return key, None, 'bypass'
+        tailored_text = self.llm_cache.get(key)
+        return key, tailored_text, 'hit' if tailored_text else 'miss'
+    
+    def tailor_resume_with_ai(self, resume_text: Union[str, AnalyzedDocument], job_analysis: Dict,
+                              similarity_score: float, use_cache: bool = True) -> Dict[str, any]:
+        """Use AI to tailor resume content
+        
+        use_cache=False skips the cached result and asks the LLM again, then
+        stores the fresh result. 'llm_cache' in the result reports hit, miss,
+        bypass or disabled.
+        """
+        resume = self._document(resume_text)
+        resume_text = resume.text
         try:
             # Validate inputs
             if not resume_text or not job_analysis:
                 raise ValueError("Invalid resume text or job analysis")
             
-            # Try OpenAI first, then fallback
-            tailored_text = None
+            # Try a cached completion, then OpenAI, then fallback
+            cache_key, tailored_text, cache_outcome = self._cached_tailoring(resume_text, job_analysis, use_cache)
             
-            if OPENAI_API_KEY:
+            if tailored_text:
+                TAILORING_TOTAL.inc(source='llm_cache')
+            elif self.llm_client:
+                start = time.perf_counter()
                 try:
-                    import openai
-                    client = openai.OpenAI(api_key=OPENAI_API_KEY)
-                    
-                    prompt = f"""
-                    Rewrite this resume to better match the job requirements. Focus on:
-                    1. Including relevant keywords: {', '.join(job_analysis.get('required_skills', []))}
-                    2. Emphasizing experience related to: {', '.join(job_analysis.get('key_phrases', []))}
-                    3. Optimizing for ATS systems
-                    4. Maintaining truthfulness while highlighting relevant skills
-                    
-                    Original Resume:
-                    {resume_text}
-                    
-                    Job Role: {job_analysis.get('role', 'Software Engineer')}
-                    Company: {job_analysis.get('company', 'Tech Company')}
-                    
-                    Provide a tailored version that maintains the original structure but optimizes for this specific role.
-                    """
-                    
-                    response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "You are an expert resume writer and ATS optimization specialist."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=1500,
-                        temperature=0.7
+                    tailored_text = self.llm_client.chat(
+                        self._build_tailoring_messages(resume_text, job_analysis),
+                        max_tokens=self.LLM_MAX_TOKENS,
+                        temperature=self.LLM_TEMPERATURE
                     )
-                    tailored_text = response.choices[0].message.content
-                except Exception as e:
+                    LLM_CALL_SECONDS.observe(time.perf_counter() - start, mode='chat', outcome='success')
+                    if tailored_text:
+                        TAILORING_TOTAL.inc(source='llm')
+                        if cache_key:
+                            self.llm_cache.put(cache_key, tailored_text)
+                except LLMUnavailable as e:
                     print(f"Error with OpenAI: {e}")
+                    LLM_CALL_SECONDS.observe(time.perf_counter() - start, mode='chat', outcome='failure')
                     tailored_text = None
             
             # Fallback to rule-based tailoring
             if not tailored_text:
-                tailored_text = self._generate_smart_tailored_resume(resume_text, job_analysis)
+                with FALLBACK_SECONDS.time():
+                    tailored_text = self._generate_smart_tailored_resume(resume, job_analysis)
+                TAILORING_TOTAL.inc(source='fallback')
             
-            # Calculate added keywords safely
-            try:
-                original_words = set(resume_text.lower().split())
-                tailored_words = set(tailored_text.lower().split())
-                added_keywords = list(tailored_words - original_words)[:8]  # Top 8 new keywords
-            except Exception as e:
-                print(f"Error calculating added keywords: {e}")
-                added_keywords = []
-            
-            # Calculate match score safely
-            try:
-                match_score = min(int(similarity_score * 100) + 15, 95) if similarity_score > 0 else 50
-            except Exception as e:
-                print(f"Error calculating match score: {e}")
-                match_score = 50
-            
-            return {
-                'tailored_text': tailored_text,
-                'match_score': match_score,
-                'added_keywords': added_keywords,
-                'ats_optimized': True
-            }
+            result = self._tailoring_result(resume, tailored_text, similarity_score)
+            result['llm_cache'] = cache_outcome
+            return result
         except Exception as e:
             print(f"Error in tailor_resume_with_ai: {e}")
             # Return a basic tailored resume as fallback
@@ -259,18 +654,102 @@ class ResumeProcessor:
                 'tailored_text': resume_text,  # Return original if all else fails
                 'match_score': 50,
                 'added_keywords': [],
-                'ats_optimized': False
+                'ats_optimized': False,
+                'llm_cache': 'disabled'
             }
     
-    def _generate_smart_tailored_resume(self, resume_text: str, job_analysis: Dict) -> str:
+    def tailor_resume_stream(self, resume_text: Union[str, AnalyzedDocument], job_analysis: Dict,
+                             similarity_score: float, use_cache: bool = True) -> Iterator[Tuple[str, any]]:
+        """Yield ('token', text) chunks of the tailored resume as they are generated
+        
+        If the LLM fails after some text was sent, ('reset', None) tells the client to
+        discard it before the rule-based resume follows. A cached result is sent as a
+        single chunk. Ends with ('result', dict) shaped like the return value of
+        tailor_resume_with_ai.
+        """
+        resume = self._document(resume_text)
+        cache_key, tailored_text, cache_outcome = self._cached_tailoring(resume.text, job_analysis, use_cache)
+        if tailored_text:
+            TAILORING_TOTAL.inc(source='llm_cache')
+            yield 'token', tailored_text
+        
+        chunks = []
+        if self.llm_client and not tailored_text:
+            start = time.perf_counter()
+            outcome = 'success'
+            deltas = self.llm_client.stream_chat(
+                self._build_tailoring_messages(resume.text, job_analysis),
+                max_tokens=self.LLM_MAX_TOKENS,
+                temperature=self.LLM_TEMPERATURE
+            )
+            try:
+                for delta in deltas:
+                    chunks.append(delta)
+                    yield 'token', delta
+            except LLMUnavailable as e:
+                print(f"Error with OpenAI: {e}")
+                outcome = 'failure'
+                if chunks:
+                    chunks = []
+                    yield 'reset', None
+            finally:
+                # Closing this generator early (client gone) closes the upstream stream and frees its slot
+                deltas.close()
+            # Includes time the client took to read each chunk, as the stream is pulled by the response
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start, mode='stream', outcome=outcome)
+            tailored_text = ''.join(chunks)
+            if tailored_text.strip():
+                TAILORING_TOTAL.inc(source='llm')
+                if cache_key:
+                    self.llm_cache.put(cache_key, tailored_text)
+        
+        if not tailored_text or not tailored_text.strip():
+            # Fallback to rule-based tailoring, sent as a single chunk
+            with FALLBACK_SECONDS.time():
+                tailored_text = self._generate_smart_tailored_resume(resume, job_analysis)
+            TAILORING_TOTAL.inc(source='fallback')
+            yield 'token', tailored_text
+        
+        result = self._tailoring_result(resume, tailored_text, similarity_score)
+        result['llm_cache'] = cache_outcome
+        yield 'result', result
+    
+    def _tailoring_result(self, resume: AnalyzedDocument, tailored_text: str, similarity_score: float) -> Dict[str, any]:
+        """Added keywords and match score for a finished tailored resume"""
+        # Calculate added keywords safely
+        try:
+            original_words = resume.words
+            tailored_words = set(tailored_text.lower().split())
+            added_keywords = list(tailored_words - original_words)[:8]  # Top 8 new keywords
+        except Exception as e:
+            print(f"Error calculating added keywords: {e}")
+            added_keywords = []
+        
+        # Calculate match score safely
+        try:
+            match_score = min(int(similarity_score * 100) + 15, 95) if similarity_score > 0 else 50
+        except Exception as e:
+            print(f"Error calculating match score: {e}")
+            match_score = 50
+        
+        return {
+            'tailored_text': tailored_text,
+            'match_score': match_score,
+            'added_keywords': added_keywords,
+            'ats_optimized': True
+        }
+    
+    def _generate_smart_tailored_resume(self, resume_text: Union[str, AnalyzedDocument], job_analysis: Dict) -> str:
         """Generate an intelligently tailored resume using rule-based approach"""
+        resume = self._document(resume_text)
+        resume_text = resume.text
         try:
             skills_to_add = job_analysis.get('required_skills', ['Python', 'JavaScript'])[:5]
             company = job_analysis.get('company', 'Tech Company')
             role = job_analysis.get('role', 'Software Engineer')
             
             # Extract sections from original resume
-            lines = resume_text.split('\n')
+            lines = resume.lines
             
             # Build tailored resume
             tailored_lines = []
@@ -293,37 +772,37 @@ class ResumeProcessor:
             tailored_lines.append("• Tools: Git, Docker, Cloud platforms, Database management")
             tailored_lines.append("")
             
-            # Process original content and enhance it
+            # Process original content and enhance it, using the headings found when segmenting
+            sections = resume.section_map
+            skill_bits = self.skill_matcher.fingerprint(skills_to_add)
             current_section = ""
-            for line in lines:
+            for number, line in enumerate(lines):
                 line = line.strip()
                 if not line:
                     continue
-                    
-                # Detect section headers
-                if any(keyword in line.upper() for keyword in ['EXPERIENCE', 'WORK', 'EMPLOYMENT']):
-                    current_section = "EXPERIENCE"
-                    tailored_lines.append("PROFESSIONAL EXPERIENCE")
-                    tailored_lines.append("")
-                elif any(keyword in line.upper() for keyword in ['EDUCATION', 'ACADEMIC']):
-                    current_section = "EDUCATION"
-                    tailored_lines.append("EDUCATION")
-                    tailored_lines.append("")
-                elif any(keyword in line.upper() for keyword in ['PROJECT', 'PORTFOLIO']):
-                    current_section = "PROJECTS"
-                    tailored_lines.append("KEY PROJECTS")
+                
+                heading = sections.heading_at(number)
+                if heading and heading.name in self.RESUME_SECTION_TITLES:
+                    current_section = heading.name
+                    tailored_lines.append(self.RESUME_SECTION_TITLES[heading.name])
                     tailored_lines.append("")
+                    inline = line.split(':', 1)[1].strip() if ':' in line else ''
+                    if inline:
+                        tailored_lines.append(inline)
+                elif heading:
+                    current_section = heading.name
+                    tailored_lines.append(line)
                 else:
                     # Enhance content based on section
-                    if current_section == "EXPERIENCE":
+                    if current_section == "experience":
                         # Add relevant keywords to experience descriptions
-                        enhanced_line = self._enhance_experience_line(line, skills_to_add)
+                        enhanced_line = self._enhance_experience_line(line, skills_to_add, skill_bits)
                         tailored_lines.append(enhanced_line)
                     else:
                         tailored_lines.append(line)
             
             # Add projects section if not present
-            if "PROJECTS" not in resume_text.upper():
+            if "projects" not in sections:
                 tailored_lines.append("")
                 tailored_lines.append("KEY PROJECTS")
                 project_suggestions = self.suggest_portfolio_projects(job_analysis)
@@ -354,38 +833,54 @@ KEY PROJECTS
 • Web Application: Full-stack development project
 • API Development: Backend services and integration"""
     
-    def _enhance_experience_line(self, line: str, skills: List[str]) -> str:
-        """Enhance experience bullet points with relevant keywords"""
+    def _enhance_experience_line(self, line: str, skills: List[str], skill_bits: Optional[int] = None) -> str:
+        """Enhance experience bullet points with relevant keywords
+        
+        skill_bits is the fingerprint of skills, if the caller already has it.
+        Only skills in the taxonomy count as already mentioned.
+        """
         if line.startswith('•') or line.startswith('-'):
-            # This is a bullet point, enhance it
-            if any(skill.lower() in line.lower() for skill in skills):
+            # This is a bullet point; only lines about development/implementation get a skill added
+            if not any(word in line.lower() for word in ['developed', 'built', 'created', 'implemented', 'designed']):
+                return line
+            if skill_bits is None:
+                skill_bits = self.skill_matcher.fingerprint(skills)
+            if self._line_skill_bits(line, skill_bits):
                 return line  # Already has relevant skills
-            else:
-                # Add a relevant skill if the line talks about development/implementation
-                if any(word in line.lower() for word in ['developed', 'built', 'created', 'implemented', 'designed']):
-                    return f"{line} using {skills[0] if skills else 'modern technologies'}"
+            return f"{line} using {skills[0] if skills else 'modern technologies'}"
         return line
     
+    def _line_skill_bits(self, line: str, skill_bits: int) -> int:
+        """Which of the fingerprinted skills a line mentions
+        
+        A substring check for their aliases rules out most lines before the word-bounded scan.
+        """
+        line_lower = line.lower()
+        if not any(alias in line_lower for alias in self.skill_matcher.aliases_of(skill_bits)):
+            return 0
+        return self.skill_matcher.fingerprint(self.skill_matcher.find_all(line)) & skill_bits
+    
     def suggest_portfolio_projects(self, job_analysis: Dict) -> List[str]:
         """Suggest relevant portfolio projects based on job requirements"""
         role = job_analysis['role'].lower()
-        skills = job_analysis['required_skills']
+        skills = self.skill_matcher.fingerprint(job_analysis['required_skills'])
+        wanted = self.project_skill_bits
         
         project_suggestions = []
         
-        if 'react' in skills or 'frontend' in role:
+        if skills & wanted['react'] or 'frontend' in role:
             project_suggestions.append("E-commerce Platform with React & TypeScript")
             project_suggestions.append("Real-time Chat Application")
         
-        if 'node' in skills or 'backend' in role:
+        if skills & wanted['node.js'] or 'backend' in role:
             project_suggestions.append("RESTful API with Node.js & Express")
             project_suggestions.append("Microservices Architecture")
         
-        if 'aws' in skills or 'cloud' in role:
+        if skills & wanted['aws'] or 'cloud' in role:
             project_suggestions.append("AWS Serverless Application")
             project_suggestions.append("CI/CD Pipeline with AWS")
         
-        if 'python' in skills:
+        if skills & wanted['python']:
             project_suggestions.append("Machine Learning Model Deployment")
             project_suggestions.append("Data Analysis Dashboard")
         
@@ -399,8 +894,184 @@ KEY PROJECTS
         
         return project_suggestions[:5]  # Return top 5 suggestions
 
+def build_startup_state() -> Dict[str, any]:
+    """Skill matcher and IDF table built from their sources"""
+    taxonomy = SkillTaxonomy.from_file(SKILL_TAXONOMY_PATH) if SKILL_TAXONOMY_PATH else SkillTaxonomy.default()
+    return {
+        'skill_matcher': SkillMatcher(taxonomy),
+        'idf_table': IdfTable.load(IDF_TABLE_PATH) if IDF_TABLE_PATH else None
+    }
+
+if STARTUP_SNAPSHOT_PATH:
+    # The modules defining the pickled classes are sources too, so code changes also rebuild the snapshot
+    startup_state, startup_source = load_or_build(
+        STARTUP_SNAPSHOT_PATH,
+        source_key(SKILL_TAXONOMY_PATH, IDF_TABLE_PATH, *(inspect.getfile(cls) for cls in (SkillMatcher, IdfTable))),
+        build_startup_state
+    )
+else:
+    startup_state, startup_source = build_startup_state(), 'built'
+
 # Initialize processor
-processor = ResumeProcessor()
+processor = ResumeProcessor(
+    None,
+    TieredCache(EXTRACTION_CACHE_MAX_BYTES, DiskCache(EXTRACTION_CACHE_DIR) if EXTRACTION_CACHE_DIR else None),
+    EXTRACT_MAX_PAGES,
+    UPLOAD_TEXT_MAX_CHARS,
+    ExtractionPool(EXTRACTION_POOL_SIZE, EXTRACTION_TIMEOUT_SECONDS, EXTRACTION_WORKER_MAX_TASKS) if EXTRACTION_POOL_SIZE > 0 else None,
+    ScoringEngine(startup_state['idf_table'], SCORING_METHOD),
+    SkillBoost(SCORE_SKILL_BOOST, SCORE_MAX_SKILL_BOOST, SCORE_CAP),
+    TieredCache(
+        JOB_CACHE_MAX_BYTES,
+        SQLiteCache(JOB_CACHE_PATH, JOB_CACHE_TTL_SECONDS) if JOB_CACHE_BACKEND == 'sqlite' else None,
+        JOB_CACHE_TTL_SECONDS
+    ),
+    LLMClient(
+        OPENAI_API_KEY,
+        base_url=OPENAI_BASE_URL,
+        model=OPENAI_MODEL,
+        timeout=LLM_TIMEOUT_SECONDS,
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        queue_timeout=LLM_QUEUE_TIMEOUT_SECONDS,
+        max_retries=LLM_MAX_RETRIES,
+        breaker=CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+    ) if OPENAI_API_KEY else None,
+    TieredCache(
+        LLM_CACHE_MAX_BYTES,
+        DiskCache(LLM_CACHE_DIR, LLM_CACHE_DISK_MAX_BYTES) if LLM_CACHE_DIR and OPENAI_API_KEY else None
+    ),
+    {step: ANALYSIS_STEP_MAX_CHARS for step in ANALYSIS_STEPS} if ANALYSIS_MODE == 'bounded' else None,
+    TieredCache(
+        RESUME_STORE_MAX_BYTES,
+        SQLiteCache(RESUME_STORE_PATH, RESUME_STORE_TTL_SECONDS) if RESUME_STORE_BACKEND == 'sqlite' else None,
+        RESUME_STORE_TTL_SECONDS
+    ),
+    skill_matcher=startup_state['skill_matcher']
+)
+if processor.extraction_pool:
+    atexit.register(processor.extraction_pool.shutdown)
+
+# Runs per-posting work for /api/tailor-resume/batch
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+
+# Stored resumes ranked by /api/rank-resumes (in-memory)
+# Without a reference corpus, IDF weights are learned from the resumes added to the ranking index
+resume_index = ResumeIndex(processor.skill_matcher,
+                           idf_table=None if IDF_TABLE_PATH else processor.scoring_engine.idf_table)
+
+def processor_caches() -> Dict[str, TieredCache]:
+    return {
+        'extraction': processor.extraction_cache,
+        'job_analysis': processor.job_cache,
+        'llm': processor.llm_cache,
+        'resumes': processor.resume_store
+    }
+
+def cache_outcome_samples():
+    for name, cache in processor_caches().items():
+        if cache:
+            yield {'cache': name, 'outcome': 'memory_hit'}, cache.memory_hits
+            yield {'cache': name, 'outcome': 'shared_hit'}, cache.shared_hits
+            yield {'cache': name, 'outcome': 'miss'}, cache.misses
+
+def cache_eviction_samples():
+    for name, cache in processor_caches().items():
+        if cache:
+            yield {'cache': name}, cache.memory.evictions
+
+def llm_call_samples():
+    if processor.llm_client:
+        stats = processor.llm_client.stats()
+        for outcome in ('calls', 'failures', 'retries', 'rejected'):
+            yield {'outcome': outcome}, stats[outcome]
+
+# Read from the caches and LLM client at scrape time rather than counted twice
+metrics.collector('cache_requests_total', 'counter', 'Cache lookups by cache and outcome', cache_outcome_samples)
+metrics.collector('cache_evictions_total', 'counter', 'Entries evicted from the memory tier', cache_eviction_samples)
+metrics.collector('llm_client_events_total', 'counter', 'LLM client calls, failures, retries and rejections',
+                  llm_call_samples)
+metrics.collector('llm_in_flight', 'gauge', 'LLM calls currently holding a concurrency slot',
+                  lambda: [({}, processor.llm_client.in_flight if processor.llm_client else 0)])
+metrics.collector('llm_circuit_open', 'gauge', '1 while the LLM circuit breaker is open or half-open',
+                  lambda: [({}, int(bool(processor.llm_client) and processor.llm_client.breaker.state != 'closed'))])
+
+# Body budget per endpoint; the largest also caps bodies sent without a Content-Length
+REQUEST_BYTE_BUDGETS = {
+    'upload_resume': UPLOAD_MAX_BYTES,
+    'analyze_job': ANALYZE_MAX_BYTES,
+    'tailor_resume': TAILOR_MAX_BYTES,
+    'tailor_resume_stream': TAILOR_MAX_BYTES,
+    'tailor_resume_batch': BATCH_MAX_BYTES,
+    'submit_tailoring_job': TAILOR_MAX_BYTES,
+    'add_resume': INDEX_MAX_BYTES,
+    'rank_resumes': INDEX_MAX_BYTES
+}
+app.config['MAX_CONTENT_LENGTH'] = (
+    max(REQUEST_BYTE_BUDGETS.values()) if all(REQUEST_BYTE_BUDGETS.values()) else None
+)
+
+@app.before_request
+def enforce_byte_budget():
+    """Refuse an oversized body from its Content-Length, before it is read or parsed"""
+    budget = REQUEST_BYTE_BUDGETS.get(request.endpoint)
+    if not budget:
+        return None
+    size = request.content_length
+    if size is None and request.mimetype == 'multipart/form-data':
+        # Chunked upload: parse it now (up to MAX_CONTENT_LENGTH) so the files are spooled, not buffered
+        size = sum(upload.stream.size for upload in request.files.values())
+    elif size is None:
+        # Chunked body: read it (up to MAX_CONTENT_LENGTH) and keep it for the handler
+        size = len(request.get_data(cache=True))
+    if size > budget:
+        REJECTED_REQUESTS.inc(endpoint=request.endpoint, budget='bytes')
+        return jsonify({
+            'error': f'Request body is too large ({size} bytes, limit {budget})',
+            'limit_bytes': budget
+        }), 413
+    return None
+
+@app.errorhandler(413)
+def request_too_large(e):
+    """Body without a Content-Length that ran past MAX_CONTENT_LENGTH while being read"""
+    REJECTED_REQUESTS.inc(endpoint=request.endpoint or 'unknown', budget='bytes')
+    return jsonify({'error': 'Request body is too large', 'limit_bytes': app.config['MAX_CONTENT_LENGTH']}), 413
+
+def text_budget_error(text: str, limit: int, field: str):
+    """A 413 response if a text field is over its character budget, else None"""
+    if limit and len(text) > limit:
+        REJECTED_REQUESTS.inc(endpoint=request.endpoint, budget='chars')
+        return jsonify({
+            'error': f'{field} is too long ({len(text)} characters, limit {limit})',
+            'limit_chars': limit
+        }), 413
+    return None
+
+def request_resume(data: Dict, profile: Optional[PassProfile] = None):
+    """The resume a request names by resume_id, or sends as resume_text, as (document, error response)"""
+    resume_id = data.get('resume_id')
+    resume_text = data.get('resume_text', '').strip()
+    if resume_id and not resume_text:
+        resume = processor.load_resume(str(resume_id), profile)
+        if resume is None:
+            return None, (jsonify({'error': 'Resume not found or expired, upload it again'}), 404)
+        return resume, None
+    if not resume_text:
+        return None, (jsonify({'error': 'Resume text is required'}), 400)
+    error = text_budget_error(resume_text, RESUME_MAX_CHARS, 'Resume text')
+    if error:
+        return None, error
+    return processor.analyze(resume_text, profile), None
+
+def analysis_limits_report(*docs: AnalyzedDocument) -> Dict[str, any]:
+    """Which analysis steps read only part of their input, counted in metrics"""
+    limits = [doc.limits for doc in docs if doc.limits]
+    if not limits:
+        return {'mode': 'full', 'limits_hit': []}
+    hit = sorted(set().union(*(doc_limits.hit for doc_limits in limits)))
+    for step in hit:
+        ANALYSIS_LIMIT_HITS.inc(step=step)
+    return {'mode': 'bounded', 'limits_hit': hit, 'step_max_chars': ANALYSIS_STEP_MAX_CHARS}
 
 @app.route('/api/upload-resume', methods=['POST'])
 def upload_resume():
@@ -413,21 +1084,36 @@ def upload_resume():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Extract text from file
-        file_content = file.read()
-        resume_text = processor.extract_text_from_file(file_content, file.filename)
+        # Extract text from the spooled file in place; it was hashed while the body was parsed
+        try:
+            extraction = processor.extract_text_with_info(file.stream, file.filename)
+        except ExtractionTimeout as e:
+            return jsonify({'error': f'Timed out extracting text from file: {str(e)}'}), 504
+        resume_text = extraction['text']
         
         if not resume_text:
             return jsonify({'error': 'Could not extract text from file'}), 400
         
         # Extract skills and information
-        extracted_data = processor.extract_skills_and_keywords(resume_text)
+        resume = processor.analyze(resume_text)
+        extracted_data = processor.extract_skills_and_keywords(resume)
+        
+        # Later requests can send resume_id instead of the text and skip analyzing it again
+        resume_id = processor.store_resume(resume)
         
         return jsonify({
             'success': True,
+            'resume_id': resume_id,
             'resume_text': resume_text,
             'filename': file.filename,
-            'extracted_data': extracted_data
+            'extracted_data': extracted_data,
+            'truncated': extraction['truncated'],
+            'extraction': {
+                'truncated_by': extraction['truncated_by'],
+                'parts_read': extraction['parts_read'],
+                'part_type': extraction['part_type']
+            },
+            'analysis_limits': analysis_limits_report(resume)
         })
     
     except Exception as e:
@@ -442,18 +1128,52 @@ def analyze_job():
         
         if not job_text:
             return jsonify({'error': 'Job description is required'}), 400
+        error = text_budget_error(job_text, JOB_MAX_CHARS, 'Job description')
+        if error:
+            return error
         
         # Analyze job description
-        job_analysis = processor.analyze_job_description(job_text)
+        job = processor.analyze(job_text)
+        job_analysis = processor.analyze_job_description(job)
         
         return jsonify({
             'success': True,
-            'job_analysis': job_analysis
+            'job_analysis': job_analysis,
+            'analysis_limits': analysis_limits_report(job)
         })
     
     except Exception as e:
         return jsonify({'error': f'Analysis error: {str(e)}'}), 500
 
+def run_tailoring(resume: AnalyzedDocument, job: AnalyzedDocument,
+                  similarity_score: Optional[float] = None, use_cache: bool = True) -> Dict[str, any]:
+    """Analyze a job, score the resume against it and tailor the resume"""
+    # Analyze job description
+    job_analysis = processor.analyze_job_description(job)
+    
+    # Calculate similarity score unless the caller scored a whole batch already
+    if similarity_score is None:
+        similarity_score = processor.calculate_similarity_score(resume, job)
+    
+    # Tailor resume with AI
+    tailored_result = processor.tailor_resume_with_ai(resume, job_analysis, similarity_score, use_cache)
+    
+    # Get project suggestions
+    project_suggestions = processor.suggest_portfolio_projects(job_analysis)
+    
+    return {
+        'success': True,
+        'tailored_resume': tailored_result['tailored_text'],
+        'match_score': tailored_result['match_score'],
+        'added_keywords': tailored_result['added_keywords'],
+        'suggested_projects': project_suggestions,
+        'ats_optimized': tailored_result['ats_optimized'],
+        'llm_cache': tailored_result['llm_cache'],
+        'skill_gap': processor.skill_gap(resume, job_analysis),
+        'job_analysis': job_analysis,
+        'analysis_limits': analysis_limits_report(resume, job)
+    }
+
 @app.route('/api/tailor-resume', methods=['POST'])
 def tailor_resume():
     """Tailor resume based on job description"""
@@ -462,62 +1182,321 @@ def tailor_resume():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
             
-        resume_text = data.get('resume_text', '').strip()
+        # Each input is analyzed once and shared by every stage; a stored resume is not analyzed again
+        profile = PassProfile() if data.get('profile') else None
+        resume, error = request_resume(data, profile)
+        if error:
+            return error
+        
         job_text = data.get('job_description', '').strip()
+        if not job_text:
+            return jsonify({'error': 'Job description is required'}), 400
+        error = text_budget_error(job_text, JOB_MAX_CHARS, 'Job description')
+        if error:
+            return error
         
-        if not resume_text:
-            return jsonify({'error': 'Resume text is required'}), 400
+        result = run_tailoring(resume, processor.analyze(job_text, profile), use_cache=not data.get('bypass_cache'))
+        if profile:
+            result['profile'] = profile.to_dict()
+        
+        return jsonify(result)
+    
+    except Exception as e:
+        print(f"Error in tailor_resume endpoint: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'Tailoring error: {str(e)}'}), 500
+
+def sse_event(event: str, data: Dict) -> str:
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+@app.route('/api/tailor-resume/stream', methods=['POST'])
+def tailor_resume_stream():
+    """Tailor resume as a Server-Sent Events stream: analysis first, then resume tokens, then the summary"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        resume, error = request_resume(data)
+        if error:
+            return error
+        
+        job_text = data.get('job_description', '').strip()
         if not job_text:
             return jsonify({'error': 'Job description is required'}), 400
+        error = text_budget_error(job_text, JOB_MAX_CHARS, 'Job description')
+        if error:
+            return error
         
-        print(f"Processing resume tailoring request...")
-        print(f"Resume length: {len(resume_text)} characters")
-        print(f"Job description length: {len(job_text)} characters")
+        job = processor.analyze(job_text)
         
-        # Analyze job description
-        job_analysis = processor.analyze_job_description(job_text)
-        print(f"Job analysis completed: {job_analysis.get('role', 'Unknown role')}")
+        def generate():
+            events = None
+            try:
+                job_analysis = processor.analyze_job_description(job)
+                similarity_score = processor.calculate_similarity_score(resume, job)
+                yield sse_event('analysis', {
+                    'job_analysis': job_analysis,
+                    'similarity_score': similarity_score
+                })
+                
+                events = processor.tailor_resume_stream(resume, job_analysis, similarity_score,
+                                                        use_cache=not data.get('bypass_cache'))
+                for kind, payload in events:
+                    if kind == 'token':
+                        yield sse_event('token', {'text': payload})
+                    elif kind == 'reset':
+                        yield sse_event('reset', {})
+                    else:
+                        yield sse_event('done', {
+                            'success': True,
+                            'match_score': payload['match_score'],
+                            'added_keywords': payload['added_keywords'],
+                            'suggested_projects': processor.suggest_portfolio_projects(job_analysis),
+                            'ats_optimized': payload['ats_optimized'],
+                            'llm_cache': payload['llm_cache'],
+                            'skill_gap': processor.skill_gap(resume, job_analysis),
+                            'analysis_limits': analysis_limits_report(resume, job)
+                        })
+            except Exception as e:
+                print(f"Error in tailor_resume_stream: {str(e)}")
+                yield sse_event('error', {'error': f'Tailoring error: {str(e)}'})
+            finally:
+                # The server closes generate() when the client disconnects; pass that on to the LLM stream
+                if events is not None:
+                    events.close()
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Stop proxies such as nginx from buffering the stream
+        })
+    
+    except Exception as e:
+        return jsonify({'error': f'Tailoring error: {str(e)}'}), 500
+
+@app.route('/api/tailor-resume/batch', methods=['POST'])
+def tailor_resume_batch():
+    """Tailor one resume against many job descriptions, streaming NDJSON results as they finish"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        # Analyze the resume once (or restore a stored one) and score it against every posting in one pass
+        resume, error = request_resume(data)
+        if error:
+            return error
+        
+        job_descriptions = data.get('job_descriptions', [])
+        if not isinstance(job_descriptions, list) or not job_descriptions:
+            return jsonify({'error': 'A list of job descriptions is required'}), 400
+        if len(job_descriptions) > BATCH_MAX_JOBS:
+            return jsonify({'error': f'At most {BATCH_MAX_JOBS} job descriptions per batch'}), 400
+        for i, job in enumerate(job_descriptions):
+            error = text_budget_error(job, JOB_MAX_CHARS, f'Job description {i}') if isinstance(job, str) else None
+            if error:
+                return error
+        
+        valid_jobs = {
+            i: processor.analyze(job.strip()) for i, job in enumerate(job_descriptions)
+            if isinstance(job, str) and job.strip()
+        }
+        use_cache = not data.get('bypass_cache')
+        scores = {}
+        if valid_jobs:
+            row = processor.calculate_similarity_scores([resume], list(valid_jobs.values()))[0]
+            scores = dict(zip(valid_jobs, row))
+        
+        def tailor_one(index: int, job_text) -> Dict[str, any]:
+            if index not in valid_jobs:
+                return {'index': index, 'success': False, 'error': 'Job description is required'}
+            try:
+                return {'index': index, **run_tailoring(resume, valid_jobs[index], scores[index], use_cache)}
+            except Exception as e:
+                print(f"Error tailoring batch item {index}: {e}")
+                return {'index': index, 'success': False, 'error': f'Tailoring error: {str(e)}'}
+        
+        futures = [batch_executor.submit(tailor_one, i, job) for i, job in enumerate(job_descriptions)]
+        
+        def generate():
+            try:
+                for future in as_completed(futures):
+                    yield app.json.dumps(future.result()) + '\n'
+            finally:
+                # Client went away: drop postings that have not started yet
+                for future in futures:
+                    future.cancel()
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+    
+    except Exception as e:
+        return jsonify({'error': f'Batch tailoring error: {str(e)}'}), 500
+
+def run_tailoring_job(payload: Dict) -> Dict[str, any]:
+    """Tailor a queued request on a job worker thread"""
+    if 'resume_id' in payload:
+        resume = processor.load_resume(payload['resume_id'])
+        if resume is None:
+            raise ValueError('Resume not found or expired, upload it again')
+    else:
+        resume = processor.analyze(payload['resume_text'])
+    return run_tailoring(resume, processor.analyze(payload['job_description']), use_cache=payload['use_cache'])
+
+# Async tailoring: requests wait in the broker and a fixed pool of threads per process runs them
+if JOB_QUEUE_BACKEND == 'sqlite':
+    job_broker = SQLiteJobBroker(JOB_QUEUE_PATH, JOB_QUEUE_MAX_DEPTH, JOB_TTL_SECONDS, JOB_RESULT_TTL_SECONDS,
+                                 JOB_LEASE_SECONDS)
+else:
+    job_broker = MemoryJobBroker(JOB_QUEUE_MAX_DEPTH, JOB_TTL_SECONDS, JOB_RESULT_TTL_SECONDS, JOB_LEASE_SECONDS)
+job_workers = JobWorkers(job_broker, run_tailoring_job, JOB_QUEUE_WORKERS)
+atexit.register(job_workers.stop)
+
+metrics.collector('jobs', 'gauge', 'Async tailoring jobs in the broker by status',
+                  lambda: [({'status': status}, count) for status, count in job_broker.counts().items()])
+
+@app.route('/api/tailor-resume/jobs', methods=['POST'])
+def submit_tailoring_job():
+    """Queue a tailoring request and return its job ID without waiting for the result"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
         
-        # Calculate similarity score
-        similarity_score = processor.calculate_similarity_score(resume_text, job_text)
-        print(f"Similarity score: {similarity_score}")
+        resume, error = request_resume(data)
+        if error:
+            return error
         
-        # Tailor resume with AI
-        tailored_result = processor.tailor_resume_with_ai(resume_text, job_analysis, similarity_score)
-        print(f"Resume tailoring completed, match score: {tailored_result.get('match_score', 0)}")
+        job_text = data.get('job_description', '').strip()
+        if not job_text:
+            return jsonify({'error': 'Job description is required'}), 400
+        error = text_budget_error(job_text, JOB_MAX_CHARS, 'Job description')
+        if error:
+            return error
         
-        # Get project suggestions
-        project_suggestions = processor.suggest_portfolio_projects(job_analysis)
+        # A stored resume is queued by ID only, keeping the queued payload small
+        if data.get('resume_id') and not data.get('resume_text', '').strip():
+            payload = {'resume_id': str(data['resume_id'])}
+        else:
+            payload = {'resume_text': resume.text}
+        payload.update(job_description=job_text, use_cache=not data.get('bypass_cache'))
+        
+        job_workers.start()
+        try:
+            job_id = job_broker.submit(payload)
+        except QueueFull as e:
+            JOBS_SUBMITTED.inc(outcome='queue_full')
+            response = jsonify({'error': f'Tailoring queue is full: {str(e)}'})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        JOBS_SUBMITTED.inc(outcome='accepted')
         
         return jsonify({
             'success': True,
-            'tailored_resume': tailored_result['tailored_text'],
-            'match_score': tailored_result['match_score'],
-            'added_keywords': tailored_result['added_keywords'],
-            'suggested_projects': project_suggestions,
-            'ats_optimized': tailored_result['ats_optimized'],
-            'job_analysis': job_analysis
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/tailor-resume/jobs/{job_id}'
+        }), 202
+    except Exception as e:
+        return jsonify({'error': f'Job submission error: {str(e)}'}), 500
+
+@app.route('/api/tailor-resume/jobs/<job_id>', methods=['GET'])
+def get_tailoring_job(job_id):
+    """Status of a tailoring job, with its result once done; ?wait=N long-polls up to N seconds"""
+    try:
+        job_workers.start()
+        wait = min(max(float(request.args.get('wait', 0)), 0), JOB_POLL_MAX_WAIT_SECONDS)
+        job = job_broker.wait(job_id, wait) if wait else job_broker.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found or its result has expired'}), 404
+        return jsonify({'success': True, **job})
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Job status error: {str(e)}'}), 500
+
+@app.route('/api/resumes', methods=['POST'])
+def add_resume():
+    """Add or replace a resume in the ranking index"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        # resume_id alone indexes an uploaded resume; with resume_text it names the indexed copy
+        resume, error = request_resume(data)
+        if error:
+            return error
+        
+        resume_id = str(data.get('resume_id') or content_hash(resume.text.encode('utf-8')))
+        # Reuse the analysis unless bounded mode read only a prefix; the index must hold every term to find the resume
+        resume_index.add(resume_id, resume.text, data.get('metadata'),
+                         None if resume.is_clipped('tokens') else resume.tokens,
+                         None if resume.is_clipped('skills') else resume.skills)
+        
+        return jsonify({
+            'success': True,
+            'resume_id': resume_id,
+            'total_resumes': len(resume_index)
         })
-    
     except Exception as e:
-        print(f"Error in tailor_resume endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': f'Tailoring error: {str(e)}'}), 500
+        return jsonify({'error': f'Indexing error: {str(e)}'}), 500
 
-# In-memory storage for demo (in production, use a database)
-user_data = {}
+@app.route('/api/resumes/<resume_id>', methods=['DELETE'])
+def delete_resume(resume_id):
+    """Remove a resume from the ranking index"""
+    if not resume_index.remove(resume_id):
+        return jsonify({'error': 'Resume not found'}), 404
+    return jsonify({
+        'success': True,
+        'resume_id': resume_id,
+        'total_resumes': len(resume_index)
+    })
+
+@app.route('/api/rank-resumes', methods=['POST'])
+def rank_resumes():
+    """Rank stored resumes against a job description"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        job_text = data.get('job_description', '').strip()
+        if not job_text:
+            return jsonify({'error': 'Job description is required'}), 400
+        error = text_budget_error(job_text, JOB_MAX_CHARS, 'Job description')
+        if error:
+            return error
+        
+        top_k = data.get('top_k', 10)
+        if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k <= 0:
+            return jsonify({'error': 'top_k must be a positive integer'}), 400
+        top_k = min(top_k, RANK_MAX_TOP_K)
+        required_skills = data.get('required_skills', [])
+        if not isinstance(required_skills, list) or not all(isinstance(skill, str) for skill in required_skills):
+            return jsonify({'error': 'required_skills must be a list of strings'}), 400
+        
+        return jsonify({
+            'success': True,
+            'results': resume_index.search(job_text, top_k, required_skills),
+            'total_resumes': len(resume_index)
+        })
+    except Exception as e:
+        return jsonify({'error': f'Ranking error: {str(e)}'}), 500
+
+# Per-user aggregates and recent activity for the dashboard
+if USER_STORE_BACKEND == 'sqlite':
+    user_store = SQLiteUserStore(USER_STORE_PATH, USER_ACTIVITY_LIMIT, USER_STORE_BATCH_SIZE, USER_STORE_FLUSH_SECONDS)
+else:
+    user_store = MemoryUserStore(USER_ACTIVITY_LIMIT)
+atexit.register(user_store.close)
 
 @app.route('/api/user/<user_id>/stats', methods=['GET'])
 def get_user_stats(user_id):
     """Get user statistics"""
     try:
-        stats = user_data.get(user_id, {
-            'resumes_tailored': 0,
-            'average_match_score': 0,
-            'applications_sent': 0,
-            'recent_activity': []
-        })
+        stats = user_store.get_stats(user_id)
         
         return jsonify({
             'success': True,
@@ -534,38 +1513,8 @@ def add_user_activity(user_id):
         action = data.get('action', '')
         match_score = data.get('match_score', 0)
         
-        if user_id not in user_data:
-            user_data[user_id] = {
-                'resumes_tailored': 0,
-                'average_match_score': 0,
-                'applications_sent': 0,
-                'recent_activity': [],
-                'match_scores': []
-            }
-        
-        # Add activity
-        activity = {
-            'id': len(user_data[user_id]['recent_activity']) + 1,
-            'action': action,
-            'time': 'Just now',
-            'status': 'completed'
-        }
-        
-        user_data[user_id]['recent_activity'].insert(0, activity)
-        
-        # Keep only last 10 activities
-        user_data[user_id]['recent_activity'] = user_data[user_id]['recent_activity'][:10]
-        
-        # Update stats
-        if 'tailored' in action.lower():
-            user_data[user_id]['resumes_tailored'] += 1
-            
-            # Track match score
-            if match_score > 0:
-                user_data[user_id]['match_scores'].append(match_score)
-                # Calculate average match score
-                scores = user_data[user_id]['match_scores']
-                user_data[user_id]['average_match_score'] = round(sum(scores) / len(scores))
+        # Tailoring actions update the running count and match score sum
+        activity = user_store.record_activity(user_id, action, match_score)
         
         return jsonify({
             'success': True,
@@ -581,8 +1530,55 @@ def health_check():
         'status': 'healthy',
         'message': 'AI Resume Tailor Backend is running',
         'openai_configured': OPENAI_API_KEY is not None,
-        'features': ['file_processing', 'keyword_extraction', 'resume_tailoring', 'ats_optimization']
+        'llm': processor.llm_client.stats() if processor.llm_client else None,
+        'features': ['file_processing', 'keyword_extraction', 'resume_tailoring', 'ats_optimization'],
+        'caches': {name: cache.stats() for name, cache in processor_caches().items()},
+        'jobs': job_broker.counts(),
+        'startup': {'state': startup_source, 'warmed_up': warmed_up_seconds is not None,
+                    'warm_up_seconds': warmed_up_seconds}
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Per-stage latency histograms, counters and gauges in Prometheus text format"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+# Small documents that take every analysis step and the scorer through their first call
+WARM_UP_RESUME = "Jane Doe\nSKILLS\nPython, Docker, AWS\n\nEXPERIENCE\n- Developed REST APIs in Python at Acme"
+WARM_UP_JOB = "Backend Engineer\nJoin Acme Technologies.\n\nRequirements:\n- Python, Kubernetes and AWS\n- Strong communication skills"
+
+warmed_up_seconds = None
+
+def warm_up() -> float:
+    """Import the lazily loaded modules and run one rule-based tailoring pass, returning the seconds taken
+    
+    Run before forking workers (STARTUP_WARM_UP=true with gunicorn --preload) so every worker starts warm and
+    shares these pages copy-on-write; gc.freeze() keeps the collector from writing to them afterwards.
+    """
+    global warmed_up_seconds
+    start = time.perf_counter()
+    import PyPDF2  # noqa: F401
+    import scipy.sparse  # noqa: F401
+    if OPENAI_API_KEY:
+        import openai  # noqa: F401
+    
+    # Straight to _analyze_job so the sample posting stays out of the shared job cache
+    resume = processor.analyze(WARM_UP_RESUME)
+    job = processor.analyze(WARM_UP_JOB)
+    job_analysis = processor._analyze_job(job)
+    processor.extract_skills_and_keywords(resume)
+    score = processor.calculate_similarity_score(resume, job)
+    processor._tailoring_result(resume, processor._generate_smart_tailored_resume(resume, job_analysis), score)
+    processor.skill_gap(resume, job_analysis)
+    app.json.dumps(job_analysis)
+    
+    gc.collect()
+    gc.freeze()
+    warmed_up_seconds = time.perf_counter() - start
+    return warmed_up_seconds
+
+if STARTUP_WARM_UP:
+    warm_up()
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark DOCX text extraction: python-docx object model vs streaming parser
+
+The previous path loaded the whole document into python-docx and read
+doc.paragraphs; the streaming extractor in text_extraction.py feeds the
+header, body and footer XML to expat a chunk at a time. Each method runs in
+a fresh subprocess that only imports what it needs, so peak RSS is the
+extraction's own. Inputs are template-style resumes with skills in the page
+header, a table and a text box; recall is the share of the resume's skills
+the default matcher finds in the extracted text.
+
+Run from the backend directory: python benchmarks/bench_docx.py [size_kb ...]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPEATS = 5
+SEED = 11
+RECALL_RESUMES = 20
+RECALL_SIZE = 2048
+
+
+def python_docx_text(content):
+    import docx
+    return '\n'.join(paragraph.text for paragraph in docx.Document(BytesIO(content)).paragraphs)
+
+
+def streaming_text(content):
+    from text_extraction import iter_docx_text
+    return '\n'.join(iter_docx_text(content))
+
+
+METHODS = {'python-docx paragraphs': python_docx_text, 'streaming expat': streaming_text}
+
+
+def reset_peak_rss():
+    """Restart the peak RSS high-water mark where the kernel allows it (Linux 4.0+)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as handle:
+            handle.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as handle:
+            return next(int(line.split()[1]) for line in handle if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as handle:
+            return next(int(line.split()[1]) for line in handle if line.startswith('VmRSS:'))
+    except (OSError, StopIteration):
+        return peak_rss_kb()
+
+
+def worker(method, path):
+    """Time one method on one file and print its timing and peak RSS as JSON"""
+    with open(path, 'rb') as handle:
+        content = handle.read()
+    function = METHODS[method]
+    if method == 'python-docx paragraphs':
+        import docx  # noqa: F401  Import cost is not extraction cost
+    else:
+        import text_extraction  # noqa: F401
+    base_kb = rss_kb()
+    reset_peak_rss()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        function(content)
+    ms = (time.perf_counter() - start) / REPEATS * 1000
+    print(json.dumps({'ms': ms, 'peak_kb': peak_rss_kb(), 'growth_kb': peak_rss_kb() - base_kb}))
+
+
+def measure(method, path):
+    output = subprocess.run([sys.executable, __file__, '--worker', method, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def recall(matcher, function, seeds):
+    """Share of all the resumes' skills found in their extracted text"""
+    from corpus import make_resume, make_template_docx, template_skills
+    found = expected = 0
+    for seed in seeds:
+        skills = set(matcher.find_all(make_resume(RECALL_SIZE, seed))) | set(template_skills(seed))
+        found += len(skills & set(matcher.find_all(function(make_template_docx(RECALL_SIZE, seed)))))
+        expected += len(skills)
+    return found / expected
+
+
+def main():
+    from corpus import make_template_docx
+    from skill_matcher import SkillMatcher, SkillTaxonomy
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [4, 64, 1024]
+    matcher = SkillMatcher(SkillTaxonomy.default())
+
+    print("DOCX Extraction Benchmark (template resumes: skills in header, table and text box)")
+    print("=" * 72)
+    print(f"{'size':>8} {'method':<24} {'ms':>10} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+    for size_kb in sizes:
+        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as handle:
+            handle.write(make_template_docx(size_kb * 1024, SEED))
+        try:
+            for method in METHODS:
+                result = measure(method, handle.name)
+                print(f"{size_kb:>6}KB {method:<24} {result['ms']:>10.2f} {result['peak_kb'] / 1024:>12.1f} "
+                      f"{result['growth_kb'] / 1024:>14.1f}")
+        finally:
+            os.unlink(handle.name)
+
+    print(f"\nSkill recall over {RECALL_RESUMES} template resumes of {RECALL_SIZE // 1024}KB")
+    for method, function in METHODS.items():
+        print(f"  {method:<24} {recall(matcher, function, range(RECALL_RESUMES)):>8.1%}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for each ResumeProcessor stage over a seeded synthetic corpus
+
+Every stage runs on resumes and job descriptions from 1 KB to 1 MB (see
+corpus.py) and, for extraction, on PDF, DOCX and plain-text uploads of the
+same text. For each stage and size the benchmark reports throughput in MB/s
+of input and the peak memory allocated during one call (tracemalloc), then
+compares both against a stored baseline. A stage counts as regressed when
+its throughput falls, or its peak allocation grows, by more than the
+tolerance; the script exits non-zero if any stage regressed.
+
+The processor is built without caches so that each call does the full work,
+and stages are given plain strings so no analysis is shared between calls.
+Throughput depends on the machine, so refresh the baseline with
+--update-baseline when moving to different hardware.
+
+Run from the backend directory:
+    python benchmarks/bench_pipeline.py [--quick] [--stages NAME ...] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import ResumeProcessor
+from corpus import make_docx, make_job, make_pdf, make_resume
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024]
+QUICK_SIZES = [1024, 10 * 1024, 100 * 1024]
+SEED = 42
+MIN_RUNS = 3
+MIN_SECONDS = 0.5
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_pipeline.json')
+DEFAULT_TOLERANCE = 0.25
+MIN_SLOWDOWN_MS = 0.05
+MIN_ALLOC_GROWTH_KB = 64
+
+
+def make_stages(processor):
+    """Stage name -> (input builder, call); builders take a size and return (input, input bytes)"""
+    def text_input(make):
+        return lambda size: (make(size, SEED), size)
+
+    def job_with_analysis(size):
+        resume = make_resume(size, SEED)
+        job_analysis = processor.analyze_job_description(make_job(min(size, 10 * 1024), SEED))
+        return (resume, job_analysis), size
+
+    def pair(size):
+        return (make_resume(size, SEED), make_job(size, SEED)), 2 * size
+
+    def upload(extension, encode):
+        def build(size):
+            content = encode(make_resume(size, SEED))
+            return (content, f"resume{extension}"), len(content)
+        return build
+
+    return {
+        'extract_skills_and_keywords': (text_input(make_resume), processor.extract_skills_and_keywords),
+        '_extract_requirements_section': (text_input(make_job), processor._extract_requirements_section),
+        'analyze_job_description': (text_input(make_job), processor.analyze_job_description),
+        'calculate_similarity_score': (pair, lambda args: processor.calculate_similarity_score(*args)),
+        '_generate_smart_tailored_resume': (
+            job_with_analysis, lambda args: processor._generate_smart_tailored_resume(*args)
+        ),
+        'extract_text_from_file[pdf]': (upload('.pdf', make_pdf), lambda args: processor.extract_text_from_file(*args)),
+        'extract_text_from_file[docx]': (upload('.docx', make_docx), lambda args: processor.extract_text_from_file(*args)),
+        'extract_text_from_file[txt]': (
+            upload('.txt', lambda text: text.encode('utf-8')), lambda args: processor.extract_text_from_file(*args)
+        )
+    }
+
+
+def measure(call, argument, input_bytes):
+    """Median throughput over repeated calls and peak allocation of one traced call"""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MIN_RUNS or time.perf_counter() - started < MIN_SECONDS:
+        start = time.perf_counter()
+        call(argument)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    call(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        'mb_per_s': round(input_bytes / (1024 * 1024) / median, 3) if median else float('inf'),
+        'ms_per_call': round(median * 1000, 3),
+        'peak_alloc_kb': round(peak / 1024, 1),
+        'runs': len(timings)
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Regression notes for one stage/size against its baseline entry"""
+    if not baseline:
+        return 'new'
+    notes = []
+    # Absolute floors keep timer noise on microsecond calls and small allocations from counting
+    if result['ms_per_call'] > baseline['ms_per_call'] * (1 + tolerance) + MIN_SLOWDOWN_MS:
+        notes.append(f"throughput {result['mb_per_s'] / baseline['mb_per_s'] - 1:+.0%}")
+    if result['peak_alloc_kb'] > baseline['peak_alloc_kb'] * (1 + tolerance) + MIN_ALLOC_GROWTH_KB:
+        notes.append(f"alloc {result['peak_alloc_kb'] / baseline['peak_alloc_kb'] - 1:+.0%}")
+    return 'REGRESSED ' + ', '.join(notes) if notes else 'ok'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--quick', action='store_true', help='skip the 1 MB inputs')
+    parser.add_argument('--stages', nargs='+', help='only run stages whose name starts with one of these')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--update-baseline', action='store_true', help='store these results as the new baseline')
+    args = parser.parse_args()
+
+    processor = ResumeProcessor()
+    stages = make_stages(processor)
+    if args.stages:
+        stages = {name: stage for name, stage in stages.items() if name.startswith(tuple(args.stages))}
+    sizes = QUICK_SIZES if args.quick else SIZES
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print("ResumeProcessor Stage Benchmark")
+    print("=" * 100)
+    print(f"{'stage':<34} {'input':>8} {'MB/s':>9} {'ms/call':>10} {'peak KB':>10} {'baseline MB/s':>14}  status")
+    results = {}
+    regressions = 0
+    for name, (build, call) in stages.items():
+        for size in sizes:
+            argument, input_bytes = build(size)
+            result = measure(call, argument, input_bytes)
+            key = f"{size // 1024}KB"
+            results.setdefault(name, {})[key] = result
+            expected = baseline.get(name, {}).get(key)
+            status = compare(result, expected, args.tolerance)
+            regressions += status.startswith('REGRESSED')
+            print(f"{name:<34} {key:>8} {result['mb_per_s']:>9.2f} {result['ms_per_call']:>10.2f} "
+                  f"{result['peak_alloc_kb']:>10.1f} {expected['mb_per_s'] if expected else '-':>14}  {status}")
+
+    if args.update_baseline:
+        for name, by_size in results.items():
+            baseline.setdefault(name, {}).update(by_size)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print(f"\n{regressions} stage/size combinations regressed beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark ranking stored resumes against a job description
+
+Builds a ResumeIndex over synthetic resumes and compares top-k search
+latency with a brute-force pass that scores every stored resume, checking
+that both return the same top-k scores.
+
+Run from the backend directory: python benchmarks/bench_resume_index.py [sizes...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_index import ResumeIndex
+from skill_matcher import DEFAULT_TAXONOMY, SkillMatcher, SkillTaxonomy
+
+CORPUS_SIZES = [10000, 100000]
+QUERIES = 20
+TOP_K = 10
+
+COMMON_WORDS = [
+    'developed', 'built', 'managed', 'team', 'software', 'engineer', 'experience',
+    'project', 'services', 'system', 'data', 'platform', 'customers', 'delivered',
+    'designed', 'improved', 'performance', 'application', 'cloud', 'testing'
+]
+
+
+def make_vocabulary(rng, size=20000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(5, 10))) for _ in range(size)]
+
+
+def make_document(rng, vocabulary, skills, words=60, skill_count=6):
+    # Zipf-like draw so a few words are common and most are rare
+    body = [vocabulary[min(int(rng.paretovariate(1.1)) - 1, len(vocabulary) - 1)] for _ in range(words)]
+    body += rng.sample(COMMON_WORDS, 8)
+    body += rng.sample(skills, skill_count)
+    rng.shuffle(body)
+    return ' '.join(body)
+
+
+def brute_force(index, job_text, k):
+    """Score every stored resume, as pairwise comparison would"""
+    job_terms = index._terms(job_text)
+    total = len(index)
+    weights = {term: index._weight(term, total) for term in job_terms if term in index._postings}
+    query_weight = sum(weights.values())
+    scores = []
+    for terms in index._doc_terms.values():
+        score = sum(weight for term, weight in weights.items() if term in terms)
+        if score:
+            scores.append(round(score / query_weight, 4))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or CORPUS_SIZES
+    print("Resume Index Benchmark")
+    print("=" * 72)
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng)
+    skills = list(DEFAULT_TAXONOMY)
+    matcher = SkillMatcher(SkillTaxonomy.default())
+    queries = [make_document(rng, vocabulary, skills, words=120, skill_count=8) for _ in range(QUERIES)]
+
+    print(f"{'resumes':>8} {'build s':>8} {'index ms/q':>11} {'2 required ms/q':>16} {'brute ms/q':>11} {'top-k agree':>12}")
+    for size in sizes:
+        index = ResumeIndex(matcher)
+        start = time.perf_counter()
+        for i in range(size):
+            index.add(f"resume-{i}", make_document(rng, vocabulary, skills))
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [index.search(query, TOP_K) for query in queries]
+        index_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        # Requiring skills intersects their posting lists before scoring
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, TOP_K, required_skills=index.skill_matcher.find_all(query)[:2])
+        required_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        start = time.perf_counter()
+        expected = [brute_force(index, query, TOP_K) for query in queries]
+        brute_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        # Compare scores rather than IDs so that ties at rank k do not count as misses
+        agree = sum([r['score'] for r in result] == scores for result, scores in zip(results, expected))
+        print(f"{size:>8} {build_s:>8.1f} {index_ms:>11.2f} {required_ms:>16.2f} {brute_ms:>11.2f} {agree:>9}/{QUERIES}")
+
+
+if __name__ == "__main__":
+    main()
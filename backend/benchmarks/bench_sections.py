@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark requirement-section extraction on 100 KB inputs
+
+Compares the previous approach (up to three lazy DOTALL regexes with an
+alternation lookahead, each retried from every candidate position) with
+the single-pass segmenter in sections.py, which indexes every heading in
+one scan. Shapes that hurt the regexes are included: a posting whose
+requirements run to the end with no terminating heading, and one with no
+requirement heading at all so every pattern scans the whole text.
+
+Run from the backend directory: python benchmarks/bench_sections.py [size_kb]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_job, make_resume
+from sections import segment
+
+REPEATS = 5
+
+LEGACY_PATTERNS = [
+    r'(?i)requirements?:?(.*?)(?=responsibilities|duties|benefits|about|$)',
+    r'(?i)qualifications?:?(.*?)(?=responsibilities|duties|benefits|about|$)',
+    r'(?i)skills?:?(.*?)(?=responsibilities|duties|benefits|about|$)'
+]
+
+
+def legacy_requirements(text):
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            return match.group(1)
+    return text
+
+
+def pad(text, size):
+    """Repeat text up to size bytes"""
+    return (text * (size // max(len(text), 1) + 1))[:size]
+
+
+def inputs(size):
+    bullets = ''.join(f"- {n}+ years building distributed systems in Python and Go\n" for n in range(1, 9))
+    return {
+        'corpus posting': make_job(size, 42),
+        'open-ended requirements': 'Staff Engineer\nRequirements:\n' + pad(bullets, size),
+        'no requirement heading': 'Staff Engineer\nWhat we build\n' + pad(bullets.replace('- ', '* '), size),
+        'corpus resume': make_resume(size, 42)
+    }
+
+
+def timed(function, text):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = function(text)
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+
+def main():
+    size = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 100 * 1024
+    print(f"Section Extraction Benchmark ({size // 1024} KB inputs)")
+    print("=" * 78)
+    print(f"{'input':<26} {'regex ms':>10} {'segment ms':>11} {'speedup':>9} {'headings':>9} {'req KB':>8}")
+    for name, text in inputs(size).items():
+        legacy_ms, _ = timed(legacy_requirements, text)
+        segment_ms, sections = timed(segment, text)
+        requirements = sections.requirements_text()
+        print(f"{name:<26} {legacy_ms:>10.2f} {segment_ms:>11.2f} {legacy_ms / segment_ms:>8.1f}x "
+              f"{len(sections):>9} {len(requirements) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
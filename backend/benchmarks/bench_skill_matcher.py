@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark skill extraction latency as the taxonomy grows
+
+Compares the compiled single-pass SkillMatcher against the previous approach
+of one substring scan per taxonomy entry. Per-document latency of the matcher
+should stay flat while the per-skill scan grows with the taxonomy.
+
+Run from the backend directory: python benchmarks/bench_skill_matcher.py
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import DEFAULT_TAXONOMY, SkillMatcher, SkillTaxonomy
+
+TAXONOMY_SIZES = [50, 500, 5000, 20000]
+DOCUMENT_REPEATS = 25
+
+SAMPLE_RESUME = """
+John Doe - Senior Software Engineer
+EXPERIENCE
+- Developed microservices in Python and Node.js deployed on AWS with Docker and Kubernetes
+- Built React and TypeScript frontends backed by GraphQL and PostgreSQL
+- Led CI/CD migration to Jenkins and Terraform, mentoring a team of five engineers
+SKILLS
+JavaScript, Java, C++, C#, Redis, MongoDB, Git, Agile, Scrum
+"""
+
+
+def build_taxonomy(size, rng):
+    """Default taxonomy padded with random made-up skills and aliases"""
+    skills = dict(DEFAULT_TAXONOMY)
+    while len(skills) < size:
+        name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        skills[name] = [name + rng.choice(['js', '.io', ' framework'])]
+    return SkillTaxonomy(skills)
+
+
+def per_skill_scan(text, skills):
+    """The previous approach: one substring search per taxonomy entry"""
+    text_lower = text.lower()
+    return [skill for skill in skills if skill in text_lower]
+
+
+def time_per_document(func, text):
+    start = time.perf_counter()
+    for _ in range(DOCUMENT_REPEATS):
+        func(text)
+    return (time.perf_counter() - start) / DOCUMENT_REPEATS * 1000
+
+
+def main():
+    print("Skill Matcher Benchmark")
+    print("=" * 64)
+    rng = random.Random(42)
+    document = SAMPLE_RESUME * 10
+    print(f"Document size: {len(document)} characters, {DOCUMENT_REPEATS} repeats")
+    print(f"\n{'skills':>8} {'aliases':>8} {'compile ms':>11} {'matcher ms/doc':>15} {'scan ms/doc':>12}")
+
+    for size in TAXONOMY_SIZES:
+        taxonomy = build_taxonomy(size, rng)
+        aliases = [alias for alias, _ in taxonomy.aliases()]
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        matcher_ms = time_per_document(matcher.find_all, document)
+        scan_ms = time_per_document(lambda text: per_skill_scan(text, aliases), document)
+        print(f"{size:>8} {len(aliases):>8} {compile_ms:>11.1f} {matcher_ms:>15.3f} {scan_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark worker cold start: importing app.py and serving the first requests
+
+Each configuration starts a fresh interpreter that imports app (what every
+new worker does) and then serves a first PDF upload and a first tailoring
+request through the Flask test client. Configurations cover the built-in
+taxonomy and a large custom taxonomy plus IDF table, built from source or
+loaded from a startup snapshot, and the warm-up that runs at import. Heavy
+modules still unimported after import are listed, since their cost moves
+to the first request that needs them.
+
+Run from the backend directory: python benchmarks/bench_startup.py [skills] [idf_terms]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+RUNS = 5
+LAZY_MODULES = ('PyPDF2', 'scipy', 'openai')
+
+
+def worker():
+    """Import app, serve two first requests and print the timings as JSON"""
+    start = time.perf_counter()
+    import app
+    imported = time.perf_counter() - start
+    lazy = [name for name in LAZY_MODULES if name not in sys.modules]
+
+    from corpus import make_pdf, make_job, make_resume
+    from io import BytesIO
+    client = app.app.test_client()
+    pdf = make_pdf(make_resume(4096, 1))
+    start = time.perf_counter()
+    upload = client.post('/api/upload-resume', data={'file': (BytesIO(pdf), 'resume.pdf')},
+                         content_type='multipart/form-data')
+    tailor = client.post('/api/tailor-resume', json={'resume_text': make_resume(4096, 2),
+                                                     'job_description': make_job(2048, 3)})
+    first = time.perf_counter() - start
+    assert upload.status_code == 200 and tailor.status_code == 200
+    print(json.dumps({'import': imported, 'first': first, 'source': app.startup_source, 'lazy': lazy}))
+
+
+def run(env):
+    results = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, __file__, '--worker'], env={**os.environ, **env}, cwd=BACKEND,
+                                check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    # Median run by import time
+    return sorted(results, key=lambda result: result['import'])[RUNS // 2]
+
+
+def main():
+    skills = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    idf_terms = int(sys.argv[2]) if len(sys.argv) > 2 else 300000
+
+    with tempfile.TemporaryDirectory() as directory:
+        taxonomy_path = os.path.join(directory, 'taxonomy.json')
+        idf_path = os.path.join(directory, 'idf.json')
+        with open(taxonomy_path, 'w') as f:
+            json.dump({f"skill{i}": [f"skill {i}", f"sk{i}"] for i in range(skills)}, f)
+        with open(idf_path, 'w') as f:
+            json.dump({'total_docs': 100000, 'total_tokens': 30000000,
+                       'doc_freq': {f"term{i}": i % 5000 + 1 for i in range(idf_terms)}}, f)
+
+        base = {'USER_STORE_BACKEND': 'memory', 'EXTRACTION_CACHE_DIR': '', 'LLM_CACHE_DIR': '',
+                'OPENAI_API_KEY': ''}
+        large = {**base, 'SKILL_TAXONOMY_PATH': taxonomy_path, 'IDF_TABLE_PATH': idf_path}
+        snapshot = {'STARTUP_SNAPSHOT_PATH': os.path.join(directory, 'startup.snapshot')}
+        configurations = [
+            ('built-in taxonomy', base),
+            ('built-in + warm-up', {**base, 'STARTUP_WARM_UP': 'true'}),
+            ('large, from source', large),
+            ('large, snapshot', {**large, **snapshot}),
+            ('large, snapshot + warm-up', {**large, **snapshot, 'STARTUP_WARM_UP': 'true'}),
+        ]
+        # The first snapshot run builds and writes it; later ones load it
+        run({**large, **snapshot})
+
+        print(f"Cold Start Benchmark (large: {skills} skills, {idf_terms} IDF terms; median of {RUNS})")
+        print("=" * 92)
+        print(f"{'configuration':<28} {'state':<9} {'import ms':>10} {'first requests ms':>18} {'total ms':>9}  not imported")
+        for name, env in configurations:
+            result = run(env)
+            total = result['import'] + result['first']
+            print(f"{name:<28} {result['source']:<9} {result['import'] * 1000:>10.0f} {result['first'] * 1000:>18.0f} "
+                  f"{total * 1000:>9.0f}  {', '.join(result['lazy']) or '-'}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['--worker']:
+        sys.path.insert(0, os.path.join(BACKEND, 'benchmarks'))
+        worker()
+    else:
+        main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of concurrent large uploads
+
+Compares the previous upload path (werkzeug's default file stream read into
+one bytes object with file.read(), hashed, then parsed) with the spooled
+path in app.py, where files past UPLOAD_SPOOL_MEMORY_BYTES are written to a
+temp file, hashed while spooling and parsed from a memory map. Uploads are
+scanned-style PDFs: a short text layer with a large image on every page.
+Each mode runs in a fresh subprocess that posts distinct PDFs from several
+threads through the Flask test client; the peak RSS growth over the idle
+process is what the uploads cost.
+
+Run from the backend directory: python benchmarks/bench_uploads.py [size_mb] [concurrency]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_docx import peak_rss_kb, reset_peak_rss, rss_kb
+
+MODES = ('read into bytes', 'spooled + mmap')
+
+
+def legacy_client():
+    """Test client for an app with the previous upload handler"""
+    from flask import Flask, jsonify, request
+    from app import processor
+    from caching import content_hash
+
+    legacy = Flask('legacy_uploads')
+
+    @legacy.route('/api/upload-resume', methods=['POST'])
+    def upload_resume():
+        file = request.files['file']
+        file_content = file.read()
+        content_hash(file_content)
+        extraction = processor._parse_file(file_content, file.filename)
+        return jsonify({'chars': len(extraction['text'])})
+
+    return legacy.test_client()
+
+
+def worker(mode, paths):
+    """Upload every file concurrently and print timing and peak RSS growth as JSON"""
+    import app as app_module
+    client = legacy_client() if mode == MODES[0] else app_module.app.test_client()
+    statuses = []
+
+    def upload(path):
+        with open(path, 'rb') as handle:
+            response = client.post('/api/upload-resume', data={'file': (handle, 'resume.pdf')},
+                                   content_type='multipart/form-data')
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=upload, args=(path,)) for path in paths]
+    base_kb = rss_kb()
+    reset_peak_rss()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    print(json.dumps({'seconds': seconds, 'growth_kb': peak_rss_kb() - base_kb, 'statuses': statuses}))
+
+
+def main():
+    from io import BytesIO
+    import PyPDF2
+    from corpus import make_pdf, make_resume
+
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    text = make_resume(6000, 3)
+    pages = len(PyPDF2.PdfReader(BytesIO(make_pdf(text))).pages)
+    pdf = make_pdf(text, image_bytes=int(size_mb * 1024 * 1024 / pages))
+    paths = []
+    for index in range(concurrency):
+        # Distinct trailing bytes give every upload its own hash, so none is served from the cache
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as handle:
+            handle.write(pdf + b'%% upload %d\n' % index)
+        paths.append(handle.name)
+
+    print(f"Concurrent Upload Benchmark ({concurrency} x {len(pdf) / 1024 / 1024:.1f}MB PDFs)")
+    print("=" * 56)
+    print(f"{'mode':<20} {'seconds':>10} {'peak RSS growth MB':>20}")
+    try:
+        for mode in MODES:
+            output = subprocess.run([sys.executable, __file__, '--worker', mode, *paths],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            assert result['statuses'] == [200] * concurrency, result['statuses']
+            print(f"{mode:<20} {result['seconds']:>10.2f} {result['growth_kb'] / 1024:>20.1f}")
+    finally:
+        for path in paths:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], sys.argv[3:])
+    else:
+        main()
@@ -0,0 +1,201 @@
+"""
+Seeded synthetic resumes, job descriptions and upload files for benchmarks
+
+The same seed and size always give the same text, so timings from different
+runs and machines are measured over identical inputs. Resumes and postings
+are built from sections that look like the real thing (headings, bullets,
+skills from the default taxonomy, company names) and padded to the requested
+size in bytes. PDFs are written directly with a standard font so PyPDF2 can
+read them back; DOCX files are written with python-docx, and template-style
+DOCX files put skills where many resume templates do: in the page header, a
+table and a text box.
+"""
+
+import random
+import textwrap
+from io import BytesIO
+from typing import List
+
+from docx import Document
+from docx.oxml import parse_xml
+
+from skill_matcher import DEFAULT_TAXONOMY
+
+SKILLS = sorted(DEFAULT_TAXONOMY)
+
+VERBS = ['Developed', 'Built', 'Designed', 'Implemented', 'Led', 'Optimized', 'Migrated', 'Maintained']
+OBJECTS = [
+    'microservices', 'data pipelines', 'REST APIs', 'dashboards', 'deployment tooling',
+    'search features', 'payment flows', 'internal platforms', 'test suites', 'mobile clients'
+]
+OUTCOMES = [
+    'cutting latency by 40%', 'serving 2M daily users', 'reducing cloud spend by 25%',
+    'with 99.9% uptime', 'for a team of eight engineers', 'ahead of schedule'
+]
+COMPANIES = ['Acme Technologies', 'Globex Systems', 'Initech Solutions', 'Umbrella Corp', 'Hooli Inc']
+ROLES = ['Senior Software Engineer', 'Backend Developer', 'Data Engineer', 'Frontend Developer', 'Platform Engineer']
+PHRASES = ['team player', 'problem solving', 'communication skills', 'agile', 'scrum', 'code review', 'mentoring']
+FILLER = [
+    'collaborated', 'with', 'product', 'design', 'and', 'operations', 'to', 'deliver', 'reliable',
+    'features', 'customers', 'across', 'regions', 'owned', 'roadmap', 'quality', 'systems'
+]
+
+
+def _bullet(rng: random.Random) -> str:
+    skills = ' and '.join(rng.sample(SKILLS, 2))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills} {rng.choice(OUTCOMES)}"
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    return ' '.join(rng.choice(FILLER) for _ in range(words)).capitalize() + '.'
+
+
+def _fit(parts: List[str], size: int) -> str:
+    text = '\n'.join(parts)
+    encoded = text.encode('utf-8')[:size]
+    return encoded.decode('utf-8', errors='ignore')
+
+
+def make_resume(size: int, seed: int = 0) -> str:
+    """Resume text of about size bytes"""
+    rng = random.Random(seed)
+    parts = [
+        'Jane Doe', 'jane.doe@example.com | +1 555 0100', '',
+        'PROFESSIONAL SUMMARY', _sentence(rng, 30), '',
+        'SKILLS', ', '.join(rng.sample(SKILLS, 20)), '',
+        'EXPERIENCE'
+    ]
+    length = sum(len(part) + 1 for part in parts)
+    while length < size:
+        block = [f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} (2019 - 2023)"]
+        block += [_bullet(rng) for _ in range(rng.randint(3, 6))]
+        if rng.random() < 0.2:
+            block += ['', 'PROJECTS', _bullet(rng), _sentence(rng)]
+        block.append('')
+        parts += block
+        length += sum(len(part) + 1 for part in block)
+    parts += ['EDUCATION', 'B.Sc. Computer Science, State University']
+    return _fit(parts, size)
+
+
+def make_job(size: int, seed: int = 0) -> str:
+    """Job description of about size bytes with requirements, responsibilities and benefits"""
+    rng = random.Random(seed)
+    company = rng.choice(COMPANIES)
+    parts = [rng.choice(ROLES), f"Join {company}, a growing team.", '', 'About the role', _sentence(rng, 40), '']
+    length = sum(len(part) + 1 for part in parts)
+    while length < size:
+        block = ['Requirements:']
+        block += [f"- {rng.randint(2, 8)}+ years with {' or '.join(rng.sample(SKILLS, 2))}" for _ in range(5)]
+        block += [f"- Strong {rng.choice(PHRASES)}", '', 'Responsibilities:']
+        block += [_bullet(rng) for _ in range(5)]
+        block += ['', 'Benefits:', _sentence(rng), '']
+        block += [_sentence(rng, 30) for _ in range(rng.randint(2, 5))]
+        parts += block
+        length += sum(len(part) + 1 for part in block)
+    return _fit(parts, size)
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(text: str, lines_per_page: int = 60, image_bytes: int = 0) -> bytes:
+    """Minimal PDF with the text laid out in Helvetica, one line per text row
+
+    image_bytes adds an incompressible grayscale image of about that size to every page, the way a
+    scanned resume carries a page image alongside its OCR text layer.
+    """
+    lines = []
+    for line in text.encode('latin-1', errors='replace').decode('latin-1').split('\n'):
+        lines += textwrap.wrap(line, 95) or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # Pages, filled in once the page object numbers are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+    page_numbers = []
+    for page in pages:
+        rows = ' Tj T* '.join(f"({_pdf_escape(row)})" for row in page)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {rows} Tj ET".encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        contents = len(objects)
+        images = b''
+        if image_bytes:
+            side = int(image_bytes ** 0.5)
+            pixels = random.Random(len(objects)).randbytes(side * side)
+            objects.append(
+                b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray '
+                b'/BitsPerComponent 8 /Length %d >>\nstream\n%s\nendstream' % (side, side, len(pixels), pixels)
+            )
+            images = b' /XObject << /Im1 %d 0 R >>' % len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+            b'/Resources << /Font << /F1 3 0 R >>%s >> /Contents %d 0 R >>' % (images, contents)
+        )
+        page_numbers.append(len(objects))
+    kids = b' '.join(b'%d 0 R' % number for number in page_numbers)
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_numbers))
+
+    out = BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(text: str) -> bytes:
+    """DOCX with one paragraph per line of text"""
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# A floating text box as Word writes it: DrawingML with a VML fallback holding the same text
+_TEXT_BOX = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"><mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>{paragraphs}</w:txbxContent></wps:txbx>'
+    '</w:drawing></mc:Choice><mc:Fallback><w:pict><v:textbox><w:txbxContent>{paragraphs}</w:txbxContent>'
+    '</v:textbox></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+
+def template_skills(seed: int = 0) -> List[str]:
+    """Skills make_template_docx places outside body paragraphs: 2 in the header, 10 in the table, 4 in the box"""
+    return random.Random(seed).sample(SKILLS, 16)
+
+
+def make_template_docx(size: int, seed: int = 0) -> bytes:
+    """Resume DOCX of about size bytes of body text with skills in the header, a table and a text box"""
+    skills = template_skills(seed)
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = f"Jane Doe | {skills[0]} and {skills[1]} engineer"
+
+    document.add_paragraph('SKILLS')
+    table = document.add_table(rows=5, cols=2)
+    for row, pair in zip(table.rows, zip(skills[2:12:2], skills[3:12:2])):
+        row.cells[0].text, row.cells[1].text = pair
+
+    boxed = ''.join(f'<w:p><w:r><w:t>{skill}</w:t></w:r></w:p>' for skill in skills[12:16])
+    document.add_paragraph()._p.append(parse_xml(_TEXT_BOX.format(paragraphs=boxed)))
+
+    for line in make_resume(size, seed).split('\n'):
+        document.add_paragraph(line)
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test for the Resume Tailor API
+
+Replays a mixed workload of resume uploads (PDF, DOCX and TXT), job
+analyses and tailoring requests against a running backend and reports
+p50/p95/p99 latency, throughput and error rate per endpoint.
+
+With --rate, requests arrive open-loop at that many per second (Poisson
+arrivals) and latency is measured from each request's scheduled arrival,
+so time spent waiting for a free worker counts; this is what shows the
+rate at which the server falls behind. Without --rate, each of the
+--concurrency workers sends its next request as soon as the last returns.
+
+Inputs come from the seeded generator in corpus.py. Start the backend
+against benchmarks/stub_llm_server.py to include LLM calls offline.
+
+Run from the backend directory:
+    python benchmarks/load_test.py --concurrency 16 --rate 20 --duration 30 --mix upload=1,analyze=2,tailor=3
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_docx, make_job, make_pdf, make_resume
+
+ENDPOINTS = {
+    'upload': '/api/upload-resume',
+    'analyze': '/api/analyze-job',
+    'tailor': '/api/tailor-resume'
+}
+
+
+def parse_mix(value):
+    """'upload=1,analyze=2,tailor=3' -> {'upload': 1.0, ...}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Workload:
+    """Pre-generated request payloads, picked at random per request"""
+
+    def __init__(self, seed, variants, resume_size, job_size):
+        resumes = [make_resume(resume_size, seed + i) for i in range(variants)]
+        self.jobs = [make_job(job_size, seed + i) for i in range(variants)]
+        self.resumes = resumes
+        self.uploads = []
+        for i, text in enumerate(resumes):
+            self.uploads.append((f"resume-{i}.pdf", make_pdf(text), 'application/pdf'))
+            self.uploads.append((f"resume-{i}.docx", make_docx(text),
+                                 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'))
+            self.uploads.append((f"resume-{i}.txt", text.encode('utf-8'), 'text/plain'))
+
+    def request(self, endpoint, rng):
+        """Keyword arguments for requests.post"""
+        if endpoint == 'upload':
+            filename, content, mimetype = rng.choice(self.uploads)
+            return {'files': {'file': (filename, content, mimetype)}}
+        if endpoint == 'analyze':
+            return {'json': {'job_description': rng.choice(self.jobs)}}
+        return {'json': {'resume_text': rng.choice(self.resumes), 'job_description': rng.choice(self.jobs)}}
+
+
+class Results:
+    """Latencies and outcomes per endpoint, safe to record from worker threads"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, latency, status, ok):
+        with self.lock:
+            self.latencies[endpoint].append(latency)
+            self.statuses[endpoint][status] += 1
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def summary(self, elapsed):
+        report = {}
+        for endpoint in sorted(self.latencies):
+            latencies = sorted(self.latencies[endpoint])
+            count = len(latencies)
+            report[endpoint] = {
+                'requests': count,
+                'rps': round(count / elapsed, 2) if elapsed else 0.0,
+                'error_rate': round(self.errors[endpoint] / count, 4) if count else 0.0,
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+                'max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+                'statuses': dict(self.statuses[endpoint])
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mixed-workload load test for the Resume Tailor API')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=8, help='worker threads sending requests')
+    parser.add_argument('--rate', type=float, default=0, help='arrivals per second (0 = closed loop)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to generate load')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('upload=1,analyze=2,tailor=3'))
+    parser.add_argument('--resume-size', type=int, default=4096, help='bytes per generated resume')
+    parser.add_argument('--job-size', type=int, default=3072, help='bytes per generated job description')
+    parser.add_argument('--variants', type=int, default=20, help='distinct resumes and postings to draw from')
+    parser.add_argument('--timeout', type=float, default=60, help='per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    workload = Workload(args.seed, args.variants, args.resume_size, args.job_size)
+    endpoints = list(args.mix)
+    weights = [args.mix[name] for name in endpoints]
+    results = Results()
+    local = threading.local()
+
+    def send(endpoint, kwargs, scheduled):
+        # One session per worker thread so connections are reused
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        try:
+            response = session.post(args.base_url + ENDPOINTS[endpoint], timeout=args.timeout, **kwargs)
+            status, ok = response.status_code, response.ok
+        except requests.RequestException as e:
+            status, ok = type(e).__name__, False
+        results.record(endpoint, time.perf_counter() - scheduled, status, ok)
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    deadline = started + args.duration
+
+    if args.rate > 0:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            next_arrival = started
+            while next_arrival < deadline:
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                endpoint = rng.choices(endpoints, weights)[0]
+                executor.submit(send, endpoint, workload.request(endpoint, rng), next_arrival)
+                next_arrival += rng.expovariate(args.rate)
+    else:
+        def worker(seed):
+            worker_rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                endpoint = worker_rng.choices(endpoints, weights)[0]
+                send(endpoint, workload.request(endpoint, worker_rng), time.perf_counter())
+
+        threads = [threading.Thread(target=worker, args=(args.seed + i,)) for i in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    elapsed = time.perf_counter() - started
+    report = results.summary(elapsed)
+    if args.json:
+        print(json.dumps({'elapsed_s': round(elapsed, 2), 'endpoints': report}, indent=2))
+        return
+
+    mode = f"open loop at {args.rate:g} req/s" if args.rate > 0 else "closed loop"
+    print(f"Load Test: {args.concurrency} workers, {mode}, {elapsed:.1f}s")
+    print("=" * 84)
+    print(f"{'endpoint':<10} {'requests':>9} {'req/s':>8} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for endpoint, stats in report.items():
+        print(f"{endpoint:<10} {stats['requests']:>9} {stats['rps']:>8.2f} {stats['error_rate']:>8.1%} "
+              f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+    for endpoint, stats in report.items():
+        failed = {status: count for status, count in stats['statuses'].items() if status != 200}
+        if failed:
+            print(f"  {endpoint} non-200 responses: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI chat completions API
+
+Answers POST /v1/chat/completions (plain and stream=true) with a resume
+built from the prompt, after a configurable delay, and fails a configurable
+share of calls with an HTTP error or by hanging past the client timeout.
+Point the backend at it to exercise LLM-bound behaviour offline:
+
+    python benchmarks/stub_llm_server.py --latency 800 --failure-rate 0.1 &
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python app.py
+
+Run from the backend directory.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    """Options plus call counters shared by handler threads"""
+
+    def __init__(self, options):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def draw(self):
+        """Delay in seconds and the failure to inject ('error', 'hang' or None) for one call"""
+        options = self.options
+        with self.lock:
+            self.calls += 1
+            delay = max(self.rng.gauss(options.latency, options.jitter), 0) / 1000
+            roll = self.rng.random()
+        if roll < options.failure_rate:
+            return delay, 'error'
+        if roll < options.failure_rate + options.hang_rate:
+            return delay, 'hang'
+        return delay, None
+
+
+def tailored_text(messages):
+    """Echo the original resume from the tailoring prompt with a marker line"""
+    prompt = messages[-1].get('content', '') if messages else ''
+    resume = prompt.split('Original Resume:', 1)[-1].split('Job Role:', 1)[0].strip()
+    return 'TAILORED RESUME (stub)\n' + '\n'.join(line.strip() for line in resume.split('\n'))
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            if state.options.verbose:
+                super().log_message(format, *args)
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+                return
+
+            delay, failure = state.draw()
+            if failure == 'hang':
+                time.sleep(state.options.hang_seconds)
+            else:
+                time.sleep(delay)
+            if failure:
+                with state.lock:
+                    state.failures += 1
+                status = state.options.error_status
+                headers = {'Retry-After': str(state.options.retry_after)} if status == 429 else None
+                self._send_json(status, {'error': {'message': 'Injected failure', 'type': 'stub_error'}}, headers)
+                return
+
+            text = tailored_text(body.get('messages', []))
+            model = body.get('model', 'stub')
+            if body.get('stream'):
+                self._stream(text, model)
+            else:
+                self._send_json(200, {
+                    'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': text}}],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': len(text.split()), 'total_tokens': 0}
+                })
+
+        def _stream(self, text, model):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            def write(data):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+                self.wfile.flush()
+
+            words = text.split(' ')
+            for i, word in enumerate(words):
+                chunk = {
+                    'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                    'model': model,
+                    'choices': [{'index': 0, 'finish_reason': None,
+                                 'delta': {'content': word if i == len(words) - 1 else word + ' '}}]
+                }
+                write(b'data: ' + json.dumps(chunk).encode('utf-8') + b'\n\n')
+                time.sleep(state.options.token_delay / 1000)
+            write(b'data: [DONE]\n\n')
+            write(b'')
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub OpenAI chat completions server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=500, help='mean response delay in ms')
+    parser.add_argument('--jitter', type=float, default=100, help='standard deviation of the delay in ms')
+    parser.add_argument('--token-delay', type=float, default=5, help='delay between streamed chunks in ms')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of calls answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--retry-after', type=float, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='share of calls that stall before failing')
+    parser.add_argument('--hang-seconds', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true')
+    options = parser.parse_args()
+
+    state = StubState(options)
+    server = ThreadingHTTPServer((options.host, options.port), make_handler(state))
+    server.daemon_threads = True
+    print(f"Stub LLM listening on http://{options.host}:{options.port}/v1 "
+          f"(latency {options.latency:g}ms, failures {options.failure_rate:.0%}, hangs {options.hang_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served {state.calls} calls, {state.failures} injected failures")
+
+
+if __name__ == "__main__":
+    main()
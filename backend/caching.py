@@ -0,0 +1,290 @@
+"""
+Content-addressed caches shared by the resume processing pipeline.
+
+LRUCache keeps recently used values in memory up to a total size in bytes,
+optionally expiring them after a TTL. DiskCache (one file per key, optionally
+bounded in total size) and
+SQLiteCache (one table in a database file) are shared tiers that survive
+restarts and are seen by every worker process pointing at the same path.
+TieredCache puts a memory tier in front of a shared one and keeps
+hit/miss/eviction counters.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest used as a content address"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_fingerprint(text: str) -> str:
+    """Content address of text ignoring case and whitespace differences"""
+    return content_hash(' '.join(text.lower().split()).encode('utf-8'))
+
+
+class LRUCache:
+    """In-memory least-recently-used cache bounded by total value size"""
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[str, Optional[float]]]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            self._entries[key] = (value, expires_at)
+            self._sizes[key] = size
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+class DiskCache:
+    """One file per key under a directory, written atomically
+
+    With max_bytes set, the least recently used files are deleted once the
+    directory grows past it, down to 90% of the budget. Reads touch a file's
+    mtime so it counts as recently used.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._files()) if max_bytes else 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = f.read()
+        except (OSError, ValueError):
+            # Missing, unreadable or undecodable entries, and keys that are not valid file names, are misses
+            return None
+        if self.max_bytes:
+            try:
+                os.utime(path)
+            except OSError:
+                pass  # Evicted by another process after the read
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so other processes never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        except (OSError, ValueError) as e:
+            print(f"Skipping disk cache entry {key!r}: {e}")
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(value)
+            size = os.path.getsize(tmp_path)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            print(f"Skipping disk cache entry {key!r}: {e}")
+            return
+        if self.max_bytes:
+            with self._lock:
+                self._total_bytes += size - replaced
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+
+    def _files(self):
+        """(mtime, path, size) of every entry file"""
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, path, stat.st_size
+
+    def _evict(self) -> None:
+        # Rescan rather than trust the running total: other processes share the directory
+        files = sorted(self._files())
+        total = sum(size for _, _, size in files)
+        target = self.max_bytes * 0.9
+        for _, path, size in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+class SQLiteCache:
+    """Key/value table in an SQLite file shared by worker processes, with expiry"""
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: int = 100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._puts = 0
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, stored_at REAL NOT NULL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads, nor used in a child forked after opening
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            row = self._connect().execute(
+                'SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading cache entry: {e}")
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)',
+                (key, value, now + self.ttl if self.ttl else None, now)
+            )
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._prune(conn, now)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then the oldest rows beyond max_entries"""
+        conn.execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        conn.execute(
+            'DELETE FROM cache WHERE key IN '
+            '(SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+
+class TieredCache:
+    """Memory LRU in front of an optional shared tier, with counters"""
+
+    def __init__(self, max_memory_bytes: int, shared=None, ttl: Optional[float] = None):
+        self.memory = LRUCache(max_memory_bytes, ttl)
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+        if self.shared:
+            value = self.shared.get(key)
+            if value is not None:
+                self._count('shared_hits')
+                self.memory.put(key, value)
+                return value
+        self._count('misses')
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        self.memory.put(key, value)
+        if self.shared:
+            try:
+                self.shared.put(key, value)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error writing cache entry: {e}")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {
+            'hits': self.memory_hits + self.shared_hits,
+            'memory_hits': self.memory_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'evictions': self.memory.evictions,
+            'expirations': self.memory.expirations,
+            'entries': len(self.memory),
+            'memory_bytes': self.memory.total_bytes
+        }
+        if getattr(self.shared, 'max_bytes', 0):
+            stats['shared_evictions'] = self.shared.evictions
+            stats['shared_bytes'] = self.shared.total_bytes
+        return stats
@@ -0,0 +1,229 @@
+"""
+Analyze-once document model for the tailoring pipeline.
+
+An AnalyzedDocument wraps one input text (a resume, a job description or a
+section of either) and computes each derived view - lowercased text, lines,
+whitespace words, tokens, skills and their fingerprints, entities, section
+headings, named sections - the first time a
+pipeline stage asks for it, then hands every later stage the same value.
+An optional PassProfile records how often each view was computed and how
+often a stage reused it instead of rescanning the text.
+
+With AnalysisLimits attached, each scanning step (skills, entities,
+sections, tokens, keywords) reads at most a fixed number of characters, so
+the time spent on one oversized input is bounded; the limits record which
+steps were cut short so the caller can report it.
+
+snapshot() turns the expensive analyses (tokens, skills, entities, section
+headings) into a JSON-safe dict, and AnalyzedDocument.restore() rebuilds a
+document from it without rescanning, so a stored resume is analyzed once
+however many requests use it.
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+from sections import Heading, SectionMap, segment
+from skill_matcher import SkillMatcher
+from tokenizer import tokenize
+
+COMPANY_PATTERN = re.compile(r'\b([A-Z][a-z]+ (?:Inc|Corp|LLC|Ltd|Company|Technologies|Systems|Solutions))\b')
+
+
+class PassProfile:
+    """Per-request counts of text passes computed versus reused"""
+
+    def __init__(self):
+        self.computed = Counter()
+        self.reused = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, field: str, reused: bool) -> None:
+        with self._lock:
+            (self.reused if reused else self.computed)[field] += 1
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'computed': dict(self.computed),
+            'reused': dict(self.reused),
+            'passes': sum(self.computed.values()),
+            'passes_avoided': sum(self.reused.values())
+        }
+
+
+# Steps that scan the text and can be capped
+ANALYSIS_STEPS = ('skills', 'entities', 'sections', 'tokens', 'keywords', 'company')
+
+
+class AnalysisLimits:
+    """Caps on the characters each analysis step reads for one document, and which caps were hit"""
+
+    def __init__(self, max_chars: Dict[str, int]):
+        self.max_chars = max_chars  # Step name -> characters (0 or missing = unlimited)
+        self.hit = set()
+        self._lock = threading.Lock()
+
+    def clip(self, step: str, text: str) -> str:
+        """The part of text this step may read"""
+        limit = self.max_chars.get(step, 0)
+        if not limit or len(text) <= limit:
+            return text
+        self.record(step)
+        return text[:limit]
+
+    def record(self, step: str) -> None:
+        with self._lock:
+            self.hit.add(step)
+
+
+class _analysis:
+    """Lazily computed document field, cached on first use and profiled"""
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.name = compute.__name__
+        self.__doc__ = compute.__doc__
+
+    def __get__(self, doc, owner):
+        if doc is None:
+            return self
+        cache = doc._cache
+        if self.name in cache:
+            if doc._profile:
+                doc._profile.record(self.name, reused=True)
+            return cache[self.name]
+        value = self.compute(doc)
+        cache[self.name] = value
+        if doc._profile:
+            doc._profile.record(self.name, reused=False)
+        return value
+
+
+class AnalyzedDocument:
+    """Immutable text with lazily computed, shared analyses"""
+
+    __slots__ = ('text', 'limits', '_skill_matcher', '_section_splitter', '_profile', '_cache')
+
+    def __init__(self, text: str, skill_matcher: SkillMatcher,
+                 section_splitter: Optional[Callable[['AnalyzedDocument'], Dict[str, str]]] = None,
+                 profile: Optional[PassProfile] = None, limits: Optional[AnalysisLimits] = None):
+        object.__setattr__(self, 'text', text)
+        object.__setattr__(self, 'limits', limits)
+        object.__setattr__(self, '_skill_matcher', skill_matcher)
+        object.__setattr__(self, '_section_splitter', section_splitter)
+        object.__setattr__(self, '_profile', profile)
+        object.__setattr__(self, '_cache', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AnalyzedDocument is immutable")
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    def clipped(self, step: str) -> str:
+        """The text a scanning step reads: all of it, or a prefix under AnalysisLimits"""
+        return self.limits.clip(step, self.text) if self.limits else self.text
+
+    def is_clipped(self, step: str) -> bool:
+        """Whether the step reads only a prefix of this text, without recording it as a limit hit"""
+        limit = self.limits.max_chars.get(step, 0) if self.limits else 0
+        return bool(limit) and len(self.text) > limit
+
+    @_analysis
+    def lower(self) -> str:
+        """Lowercased text"""
+        return self.clipped('keywords').lower()
+
+    @_analysis
+    def lines(self) -> Tuple[str, ...]:
+        """Raw lines of the text"""
+        return tuple(self.text.split('\n'))
+
+    @_analysis
+    def words(self) -> FrozenSet[str]:
+        """Distinct lowercased whitespace-separated words of the whole text"""
+        # Not clipped: callers diff this against other full texts, and a prefix would make the rest look new
+        return frozenset(self.text.lower().split())
+
+    @_analysis
+    def tokens(self) -> Tuple[str, ...]:
+        """Normalized tokens in order, without stop words"""
+        return tuple(tokenize(self.clipped('tokens')))
+
+    @_analysis
+    def token_set(self) -> FrozenSet[str]:
+        """Distinct normalized tokens"""
+        return frozenset(self.tokens)
+
+    @_analysis
+    def skills(self) -> Tuple[str, ...]:
+        """Canonical skills in order of first appearance"""
+        return tuple(self._skill_matcher.find_all(self.clipped('skills')))
+
+    @_analysis
+    def skill_bits(self) -> int:
+        """Fingerprint of the skills, one bit per skill ID"""
+        return self._skill_matcher.fingerprint(self.skills)
+
+    @_analysis
+    def entities(self) -> Tuple[str, ...]:
+        """Company names matched by a simple pattern"""
+        return tuple(COMPANY_PATTERN.findall(self.clipped('entities')))
+
+    @_analysis
+    def section_map(self) -> SectionMap:
+        """Section headings found in one scan of the text"""
+        return segment(self.clipped('sections'))
+
+    @_analysis
+    def sections(self) -> Dict[str, 'AnalyzedDocument']:
+        """Named sections of the text, each analyzed on demand"""
+        if not self._section_splitter:
+            return {}
+        return {
+            name: AnalyzedDocument(section_text, self._skill_matcher, None, self._profile, self.limits)
+            for name, section_text in self._section_splitter(self).items()
+        }
+
+    def snapshot(self) -> Dict[str, any]:
+        """Text plus its precomputed analyses, for restore()"""
+        analyses = {
+            'tokens': list(self.tokens),
+            'skills': list(self.skills),
+            'entities': list(self.entities),
+            'section_headings': [list(heading) for heading in self.section_map.headings]
+        }
+        return {
+            'text': self.text,
+            'max_chars': self.limits.max_chars if self.limits else None,
+            'limits_hit': sorted(self.limits.hit) if self.limits else [],
+            'analyses': analyses
+        }
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, any], skill_matcher: SkillMatcher,
+                section_splitter: Optional[Callable[['AnalyzedDocument'], Dict[str, str]]] = None,
+                profile: Optional[PassProfile] = None, limits: Optional[AnalysisLimits] = None) -> 'AnalyzedDocument':
+        """Document with the analyses from snapshot() already in place"""
+        doc = cls(snapshot['text'], skill_matcher, section_splitter, profile, limits)
+        # Analyses taken under other limits would not match what this document computes
+        if snapshot['max_chars'] != (limits.max_chars if limits else None):
+            return doc
+        analyses = snapshot['analyses']
+        for step in snapshot['limits_hit']:
+            limits.record(step)
+        doc._cache.update(
+            tokens=tuple(analyses['tokens']),
+            skills=tuple(analyses['skills']),
+            entities=tuple(analyses['entities']),
+            section_map=SectionMap(
+                limits.clip('sections', doc.text) if limits else doc.text,
+                [Heading(*heading) for heading in analyses['section_headings']]
+            )
+        )
+        return doc
@@ -0,0 +1,148 @@
+"""
+Process-pool backend for document text extraction.
+
+PDF parsing is pure Python and holds the GIL, so one slow upload stalls every
+request thread in the process. ExtractionPool hands each document to a
+separate worker process over a pipe, kills any worker that exceeds the
+per-document timeout, and recycles workers after a fixed number of documents
+to keep parser memory growth in check.
+
+A spawned worker needs time to start Python and import the parsers before it
+can take a document. It reports when it is ready, and the per-document timeout
+starts only after that, so a new or recycled worker does not use up a small
+file's budget on startup. Retired workers are replaced right away, so the
+replacement starts while the pool is idle.
+"""
+
+import multiprocessing
+import queue
+import threading
+from typing import Dict, Optional
+
+from text_extraction import extract_document_file, extract_document_text
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a document takes longer than the pool timeout to parse"""
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: parse documents until told to stop"""
+    conn.send('ready')
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        function, args = task
+        try:
+            conn.send(('ok', function(*args)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+        self.ready = False
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait for the process to finish starting, returning whether it did within timeout"""
+        if not self.ready:
+            if not self.conn.poll(timeout):
+                return False
+            self.ready = self.conn.recv() == 'ready'
+        return self.ready
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Fixed number of extraction worker processes with hard per-document timeouts"""
+
+    def __init__(self, size: int, timeout: float, max_tasks_per_worker: int = 100,
+                 start_method: str = 'spawn', start_timeout: float = 30.0):
+        self.size = size
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: 'queue.LifoQueue[_Worker]' = queue.LifoQueue()
+        self._closed = False
+
+    def extract(self, file_content: bytes, filename: str,
+                max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Dict[str, any]:
+        """Parse a document in a worker process, raising ExtractionTimeout if it runs too long"""
+        return self._run(extract_document_text, (file_content, filename, max_pages, max_chars), filename)
+
+    def extract_file(self, path: str, filename: str,
+                     max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Dict[str, any]:
+        """Like extract, but the worker memory-maps the file at path instead of receiving its bytes"""
+        return self._run(extract_document_file, (path, filename, max_pages, max_chars), filename)
+
+    def _run(self, function, args: tuple, filename: str) -> Dict[str, any]:
+        if self._closed:
+            raise RuntimeError("Extraction pool is shut down")
+
+        with self._slots:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = _Worker(self._context)
+
+            try:
+                if not worker.wait_ready(self.start_timeout):
+                    self._retire(worker, worker.kill)
+                    raise RuntimeError(f"Extraction worker did not start within {self.start_timeout:g}s")
+                # The document's timeout starts once the worker can take it
+                worker.conn.send((function, args))
+                if not worker.conn.poll(self.timeout):
+                    self._retire(worker, worker.kill)
+                    raise ExtractionTimeout(f"Extraction of {filename} exceeded {self.timeout:g}s")
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                self._retire(worker, worker.kill)
+                raise RuntimeError(f"Extraction worker died: {e}")
+
+            worker.tasks_done += 1
+            if worker.tasks_done >= self.max_tasks_per_worker or self._closed:
+                self._retire(worker, worker.stop)
+            else:
+                self._idle.put(worker)
+
+        if status == 'error':
+            raise RuntimeError(payload)
+        return payload
+
+    def _retire(self, worker: _Worker, end) -> None:
+        """End a worker with end (stop or kill) and start its replacement unless shutting down"""
+        end()
+        if not self._closed:
+            self._idle.put(_Worker(self._context))
+
+    def shutdown(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
@@ -0,0 +1,392 @@
+"""
+Asynchronous tailoring jobs: submit now, poll for the result later.
+
+A broker holds each job's state (queued, running, done, failed, expired),
+its request payload and its result. Two interchangeable brokers are
+provided, both with submit(), claim(), complete(), fail(), get(), wait(),
+expire() and counts():
+
+MemoryJobBroker keeps jobs in this process and wakes waiting pollers and
+workers with a condition variable. SQLiteJobBroker keeps them in an SQLite
+file in WAL mode, so any worker process can take a job submitted to another
+and any process can answer a poll; waiting is done by polling the file.
+
+JobWorkers runs a fixed number of threads that claim jobs from a broker
+and run a handler on each. The queue depth is capped at submit time. A job
+still queued after job_ttl seconds expires without running, a job left
+running for longer than the lease (its worker died) is marked failed, and
+finished jobs are removed result_ttl seconds after they finish.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+FINISHED = ('done', 'failed', 'expired')
+
+
+class QueueFull(Exception):
+    """The queue already holds max_depth jobs waiting for a worker"""
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _job(job_id: str, status: str, created_at: float, started_at: Optional[float], finished_at: Optional[float],
+         result: Optional[Dict], error: Optional[str]) -> Dict[str, any]:
+    job = {
+        'job_id': job_id,
+        'status': status,
+        'created_at': created_at,
+        'started_at': started_at,
+        'finished_at': finished_at
+    }
+    if status == 'done':
+        job['result'] = result
+    elif status in ('failed', 'expired'):
+        job['error'] = error
+    return job
+
+
+class MemoryJobBroker:
+    """Jobs in a dict with a FIFO of queued IDs, in this process only"""
+
+    def __init__(self, max_depth: int = 100, job_ttl: float = 300, result_ttl: float = 600, lease: float = 300):
+        self.max_depth = max_depth
+        self.job_ttl = job_ttl
+        self.result_ttl = result_ttl
+        self.lease = lease
+        self._jobs: Dict[str, Dict[str, any]] = {}
+        self._queued = deque()
+        self._changed = threading.Condition()
+
+    def submit(self, payload: Dict) -> str:
+        job_id = _new_id()
+        with self._changed:
+            self._drop_stale(time.time())
+            if self.max_depth and len(self._queued) >= self.max_depth:
+                raise QueueFull(f"{len(self._queued)} jobs already queued")
+            self._jobs[job_id] = {
+                'status': 'queued', 'payload': payload, 'created_at': time.time(),
+                'started_at': None, 'finished_at': None, 'result': None, 'error': None
+            }
+            self._queued.append(job_id)
+            self._changed.notify_all()
+        return job_id
+
+    def claim(self, timeout: float = 1.0) -> Optional[Tuple[str, Dict]]:
+        """Take the oldest queued job, waiting up to timeout for one; returns (job_id, payload)"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                now = time.time()
+                while self._queued:
+                    job_id = self._queued.popleft()
+                    job = self._jobs.get(job_id)
+                    if job is None or job['status'] != 'queued':
+                        continue
+                    if self.job_ttl and now - job['created_at'] > self.job_ttl:
+                        self._expire(job, now)
+                        continue
+                    job['status'] = 'running'
+                    job['started_at'] = now
+                    return job_id, job['payload']
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(remaining)
+
+    def _expire(self, job: Dict, now: float) -> None:
+        job.update(status='expired', finished_at=now, error='Job expired before a worker started it', payload=None)
+
+    def _drop_stale(self, now: float) -> None:
+        """Pop IDs of jobs no longer waiting off the front of the queue, expiring those past job_ttl"""
+        # IDs are queued in creation order, so every job past its TTL sits ahead of the live ones
+        while self._queued:
+            job = self._jobs.get(self._queued[0])
+            if job is not None and job['status'] == 'queued':
+                if not (self.job_ttl and now - job['created_at'] > self.job_ttl):
+                    return
+                self._expire(job, now)
+            self._queued.popleft()
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict], error: Optional[str]) -> None:
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != 'running':
+                return
+            job.update(status=status, result=result, error=error, finished_at=time.time(), payload=None)
+            self._changed.notify_all()
+
+    def complete(self, job_id: str, result: Dict) -> None:
+        self._finish(job_id, 'done', result, None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, 'failed', None, error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, any]]:
+        """Current state of a job, or None if it is unknown or its result expired"""
+        now = time.time()
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] == 'queued' and self.job_ttl and now - job['created_at'] > self.job_ttl:
+                self._expire(job, now)
+            if job['finished_at'] and self.result_ttl and now - job['finished_at'] > self.result_ttl:
+                del self._jobs[job_id]
+                return None
+            return _job(job_id, job['status'], job['created_at'], job['started_at'], job['finished_at'],
+                        job['result'], job['error'])
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, any]]:
+        """State of a job once it finishes, or after timeout seconds, whichever comes first"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                job = self.get(job_id)
+                remaining = deadline - time.monotonic()
+                if job is None or job['status'] in FINISHED or remaining <= 0:
+                    return job
+                self._changed.wait(remaining)
+
+    def expire(self) -> None:
+        """Expire stale queued jobs, fail jobs past their lease and drop old results"""
+        now = time.time()
+        with self._changed:
+            for job_id, job in list(self._jobs.items()):
+                if job['status'] == 'queued' and self.job_ttl and now - job['created_at'] > self.job_ttl:
+                    self._expire(job, now)
+                elif job['status'] == 'running' and self.lease and now - job['started_at'] > self.lease:
+                    job.update(status='failed', finished_at=now, error='Job did not finish within its lease')
+                elif job['finished_at'] and self.result_ttl and now - job['finished_at'] > self.result_ttl:
+                    del self._jobs[job_id]
+            self._changed.notify_all()
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(('queued', 'running') + FINISHED, 0)
+        with self._changed:
+            self._drop_stale(time.time())
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+        return counts
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteJobBroker:
+    """Jobs in an SQLite table shared by every worker process on this machine"""
+
+    def __init__(self, path: str, max_depth: int = 100, job_ttl: float = 300, result_ttl: float = 600,
+                 lease: float = 300, poll_interval: float = 0.05):
+        self.path = path
+        self.max_depth = max_depth
+        self.job_ttl = job_ttl
+        self.result_ttl = result_ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT, '
+            'result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        # One sqlite3 connection per thread and process; autocommit, one statement per change
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def submit(self, payload: Dict) -> str:
+        job_id = _new_id()
+        # The depth check and the insert are one statement, so concurrent submits cannot overshoot;
+        # jobs past job_ttl that the sweep has not marked yet do not count
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO jobs (id, status, payload, created_at) SELECT ?, 'queued', ?, ? "
+            "WHERE ? = 0 OR (SELECT COUNT(*) FROM jobs WHERE status = 'queued' "
+            "AND (? = 0 OR created_at >= ?)) < ?",
+            (job_id, json.dumps(payload), now, self.max_depth, self.job_ttl, now - self.job_ttl, self.max_depth)
+        )
+        if cursor.rowcount == 0:
+            raise QueueFull(f"{self.max_depth} jobs already queued")
+        return job_id
+
+    def claim(self, timeout: float = 1.0) -> Optional[Tuple[str, Dict]]:
+        """Take the oldest queued job, polling up to timeout for one; returns (job_id, payload)"""
+        conn = self._connect()
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.time()
+            row = conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = "
+                "(SELECT id FROM jobs WHERE status = 'queued' AND (? = 0 OR created_at >= ?) "
+                "ORDER BY created_at LIMIT 1) AND status = 'queued' RETURNING id, payload",
+                (now, self.job_ttl, now - self.job_ttl)
+            ).fetchone()
+            if row:
+                return row[0], json.loads(row[1])
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval * 4, remaining))
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict], error: Optional[str]) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, payload = NULL "
+            "WHERE id = ? AND status = 'running'",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+        )
+
+    def complete(self, job_id: str, result: Dict) -> None:
+        self._finish(job_id, 'done', result, None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, 'failed', None, error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, any]]:
+        """Current state of a job, or None if it is unknown or its result expired"""
+        row = self._connect().execute(
+            'SELECT status, created_at, started_at, finished_at, result, error FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, created_at, started_at, finished_at, result, error = row
+        now = time.time()
+        if status == 'queued' and self.job_ttl and now - created_at > self.job_ttl:
+            # The sweep will record it; report it now
+            status, finished_at, error = 'expired', now, 'Job expired before a worker started it'
+        if finished_at and self.result_ttl and now - finished_at > self.result_ttl:
+            return None
+        return _job(job_id, status, created_at, started_at, finished_at, json.loads(result) if result else None, error)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, any]]:
+        """State of a job once it finishes, or after timeout seconds, whichever comes first"""
+        deadline = time.monotonic() + timeout
+        interval = self.poll_interval
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in FINISHED or remaining <= 0:
+                return job
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, 0.5)
+
+    def expire(self) -> None:
+        """Expire stale queued jobs, fail jobs past their lease and drop old results"""
+        now = time.time()
+        conn = self._connect()
+        if self.job_ttl:
+            conn.execute(
+                "UPDATE jobs SET status = 'expired', finished_at = ?, payload = NULL, "
+                "error = 'Job expired before a worker started it' WHERE status = 'queued' AND created_at < ?",
+                (now, now - self.job_ttl)
+            )
+        if self.lease:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, payload = NULL, "
+                "error = 'Job did not finish within its lease' WHERE status = 'running' AND started_at < ?",
+                (now, now - self.lease)
+            )
+        if self.result_ttl:
+            conn.execute('DELETE FROM jobs WHERE finished_at < ?', (now - self.result_ttl,))
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(('queued', 'running') + FINISHED, 0)
+        # Queued jobs past job_ttl are reported as expired, as get() does, before the sweep records it
+        now = time.time()
+        counts.update(self._connect().execute(
+            "SELECT CASE WHEN status = 'queued' AND ? > 0 AND created_at < ? THEN 'expired' ELSE status END "
+            "AS state, COUNT(*) FROM jobs GROUP BY state",
+            (self.job_ttl, now - self.job_ttl)
+        ).fetchall())
+        return counts
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class JobWorkers:
+    """Fixed pool of threads running handler(payload) for each claimed job"""
+
+    def __init__(self, broker, handler: Callable[[Dict], Dict], workers: int = 4, sweep_interval: float = 5.0):
+        self.broker = broker
+        self.handler = handler
+        self.workers = workers
+        self.sweep_interval = sweep_interval
+        self._threads = []
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start the threads on first use, so a forking server starts them in each worker process"""
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True) for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < self.sweep_interval:
+                return
+            self._last_sweep = now
+        try:
+            self.broker.expire()
+        except sqlite3.Error as e:
+            print(f"Error expiring jobs: {e}")
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._sweep()
+            try:
+                claimed = self.broker.claim(timeout=1.0)
+            except sqlite3.Error as e:
+                print(f"Error claiming job: {e}")
+                time.sleep(1.0)
+                continue
+            if claimed is None:
+                continue
+            job_id, payload = claimed
+            try:
+                result, error = self.handler(payload), None
+            except Exception as e:
+                print(f"Error running job {job_id}: {e}")
+                result, error = None, str(e)
+            try:
+                if error is None:
+                    self.broker.complete(job_id, result)
+                else:
+                    self.broker.fail(job_id, error)
+            except sqlite3.Error as e:
+                # The lease sweep marks the job failed later
+                print(f"Error recording job {job_id}: {e}")
+
+    def stop(self) -> None:
+        self._stopped = True
+        for thread in self._threads:
+            thread.join(timeout=2)
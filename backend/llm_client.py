@@ -0,0 +1,234 @@
+"""
+Process-wide client for the OpenAI chat completions API.
+
+One LLMClient is shared by every request so HTTP connections are pooled and
+reused. Calls are limited to a fixed number in flight; a caller that cannot
+get a slot within the queue-wait budget gives up instead of piling up behind
+a slow upstream. Each attempt has a timeout, 429/5xx and connection errors
+are retried with jittered exponential backoff, and a circuit breaker stops
+calling upstream for a while after repeated failures. Whenever the client
+raises LLMUnavailable, callers fall back to rule-based tailoring.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+class LLMUnavailable(Exception):
+    """Raised when the LLM cannot serve a call: circuit open, queue full or retries exhausted"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half_open'
+            return 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True  # Only one trial call while half-open
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class LLMClient:
+    """Pooled, concurrency-limited chat completions client with retries and a circuit breaker"""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: str = 'gpt-3.5-turbo',
+                 timeout: float = 30.0, max_concurrency: int = 8, queue_timeout: float = 2.0,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._in_flight = 0
+        self._counter_lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def _get_client(self):
+        # Built once on first use; openai and httpx are only imported when the LLM is configured
+        with self._client_lock:
+            if self._client is None:
+                import httpx
+                import openai
+                self._client = openai.OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    max_retries=0,  # Retries are handled here, with jitter and the breaker
+                    http_client=httpx.Client(
+                        timeout=self.timeout,
+                        limits=httpx.Limits(
+                            max_connections=self.max_concurrency,
+                            max_keepalive_connections=self.max_concurrency
+                        )
+                    )
+                )
+            return self._client
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _count(self, counter: str, delta: int = 1) -> None:
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + delta)
+
+    def _is_retryable(self, error: Exception) -> bool:
+        import openai
+        if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+            return True
+        return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except ValueError:
+                pass
+        return delay
+
+    def _acquire(self) -> None:
+        if self.breaker.state == 'open':
+            self._count('rejected')
+            raise LLMUnavailable("LLM circuit breaker is open")
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count('rejected')
+            raise LLMUnavailable(f"No LLM slot free within {self.queue_timeout:g}s")
+        # Checked again once a slot is held so a half-open probe is never stranded in the queue
+        if not self.breaker.allow():
+            self._slots.release()
+            self._count('rejected')
+            raise LLMUnavailable("LLM circuit breaker is open")
+        self._count('_in_flight')
+
+    def _release(self) -> None:
+        self._count('_in_flight', -1)
+        self._slots.release()
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int = 1500,
+             temperature: float = 0.7) -> str:
+        """Return the completion text for a chat, raising LLMUnavailable on failure"""
+        self._acquire()
+        try:
+            return self._with_retries(lambda: self._get_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ).choices[0].message.content)
+        finally:
+            self._release()
+
+    def stream_chat(self, messages: List[Dict[str, str]], max_tokens: int = 1500,
+                    temperature: float = 0.7) -> Iterator[str]:
+        """Yield completion text deltas as they arrive, raising LLMUnavailable on failure
+
+        Only opening the stream is retried; once text has been yielded a failure is final.
+        """
+        self._acquire()
+        try:
+            stream = self._with_retries(lambda: self._get_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            ))
+            try:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+            except Exception as e:
+                if self._is_retryable(e):
+                    self.breaker.record_failure()
+                self._count('failures')
+                raise LLMUnavailable(f"LLM stream failed: {e}") from e
+            finally:
+                # Also runs when the consumer closes this generator early, so the connection is not held
+                # until the provider finishes; openai 1.3 streams only expose the httpx response to close
+                close = getattr(stream, 'close', None)
+                close() if close else stream.response.close()
+        finally:
+            self._release()
+
+    def _with_retries(self, call):
+        self._count('calls')
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = call()
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                retryable = self._is_retryable(e)
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()  # Upstream answered; the request itself was bad
+                if not retryable or attempt == self.max_retries or self.breaker.state != 'closed':
+                    self._count('failures')
+                    raise LLMUnavailable(f"LLM call failed: {e}") from e
+                self._count('retries')
+                time.sleep(self._backoff(attempt, e))
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            'model': self.model,
+            'circuit': self.breaker.state,
+            'in_flight': self._in_flight,
+            'max_concurrency': self.max_concurrency,
+            'calls': self.calls,
+            'failures': self.failures,
+            'retries': self.retries,
+            'rejected': self.rejected
+        }
@@ -0,0 +1,195 @@
+"""
+Inverted index over stored resumes for ranking them against a job description.
+
+Each resume is reduced to its set of normalized tokens plus canonical skills
+('skill:node.js'). A query is scored term-at-a-time from the rarest, heaviest
+term down; once no unseen resume can reach the current top-k, the remaining
+common terms only update existing candidates, and once the top-k set cannot
+change the scan stops early. Required skills narrow the candidates first by
+intersecting their posting lists, smallest list first.
+
+Given an IdfTable, the index keeps it counting the indexed resumes' tokens, so
+similarity scoring can weight terms by how rare they are among stored resumes
+when no reference corpus is configured.
+"""
+
+import heapq
+import math
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
+
+from scoring import IdfTable
+from skill_matcher import SkillMatcher
+from tokenizer import tokenize
+
+SKILL_PREFIX = 'skill:'
+
+
+class ResumeIndex:
+    """Incremental inverted index of resumes keyed by caller-supplied IDs"""
+
+    def __init__(self, skill_matcher: SkillMatcher, skill_weight: float = 3.0,
+                 idf_table: Optional[IdfTable] = None):
+        self.skill_matcher = skill_matcher
+        self.skill_weight = skill_weight
+        self.idf_table = idf_table
+        self._doc_lengths: Dict[int, int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._doc_terms: Dict[int, FrozenSet[str]] = {}
+        self._doc_ids: Dict[int, str] = {}
+        self._doc_numbers: Dict[str, int] = {}
+        self._metadata: Dict[int, Dict] = {}
+        self._next_number = 0
+        self._lock = threading.RLock()
+
+    def _terms(self, text: str, tokens: Optional[Sequence[str]] = None,
+               skills: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+        if tokens is None:
+            tokens = tokenize(text)
+        if skills is None:
+            skills = self.skill_matcher.find_all(text)
+        return frozenset(tokens).union(SKILL_PREFIX + skill for skill in skills)
+
+    def add(self, resume_id: str, text: str, metadata: Optional[Dict] = None,
+            tokens: Optional[Sequence[str]] = None, skills: Optional[Iterable[str]] = None) -> None:
+        """Index a resume, replacing any earlier version with the same ID; tokens and skills already found in text are not rescanned"""
+        if tokens is None:
+            tokens = tokenize(text)
+        terms = self._terms(text, tokens, skills)
+        with self._lock:
+            self.remove(resume_id)
+            number = self._next_number
+            self._next_number += 1
+            self._doc_ids[number] = resume_id
+            self._doc_numbers[resume_id] = number
+            self._doc_terms[number] = terms
+            self._doc_lengths[number] = len(tokens)
+            self._metadata[number] = metadata or {}
+            for term in terms:
+                self._postings.setdefault(term, set()).add(number)
+            if self.idf_table is not None:
+                self.idf_table.update(_token_terms(terms), len(tokens))
+
+    def remove(self, resume_id: str) -> bool:
+        """Drop a resume from the index, returning whether it was present"""
+        with self._lock:
+            number = self._doc_numbers.pop(resume_id, None)
+            if number is None:
+                return False
+            terms = self._doc_terms.pop(number)
+            for term in terms:
+                posting = self._postings[term]
+                posting.discard(number)
+                if not posting:
+                    del self._postings[term]
+            length = self._doc_lengths.pop(number)
+            if self.idf_table is not None:
+                self.idf_table.update(_token_terms(terms), length, -1)
+            del self._doc_ids[number]
+            del self._metadata[number]
+            return True
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._doc_numbers
+
+    def _weight(self, term: str, total_docs: int) -> float:
+        idf = math.log(1 + total_docs / len(self._postings[term]))
+        return idf * self.skill_weight if term.startswith(SKILL_PREFIX) else idf
+
+    def search(self, job_text: str, k: int = 10,
+               required_skills: Iterable[str] = ()) -> List[Dict[str, any]]:
+        """Return the top-k resumes for a job description, best first"""
+        job_terms = self._terms(job_text)
+        with self._lock:
+            total_docs = len(self._doc_ids)
+            if not total_docs or k <= 0:
+                return []
+
+            query = [term for term in job_terms if term in self._postings]
+            weights = {term: self._weight(term, total_docs) for term in query}
+            query.sort(key=weights.get, reverse=True)
+            query_weight = sum(weights.values())
+
+            candidates = self._required_candidates(required_skills)
+            if candidates is not None and not candidates:
+                return []
+            if not query_weight:
+                return []
+
+            scores: Dict[int, float] = {}
+            get_score = scores.get
+            remaining = query_weight
+            admit_new = True
+            for term in query:
+                weight = weights[term]
+                remaining -= weight
+                posting = self._postings[term]
+
+                if admit_new:
+                    if candidates is not None and len(candidates) < len(posting):
+                        docs = (number for number in candidates if number in posting)
+                    else:
+                        docs = posting if candidates is None else posting & candidates
+                    for number in docs:
+                        scores[number] = get_score(number, 0.0) + weight
+                elif len(posting) < len(scores):
+                    for number in posting:
+                        if number in scores:
+                            scores[number] += weight
+                else:
+                    for number in scores:
+                        if number in posting:
+                            scores[number] += weight
+
+                # No score can exceed the weight already scanned, so the checks below need it to beat the rest
+                if len(scores) < k or query_weight - remaining < remaining:
+                    continue
+                top = heapq.nlargest(k + 1, scores.values())
+                # A resume not seen yet can score at most the weight of the remaining terms
+                if admit_new and top[k - 1] >= remaining:
+                    admit_new = False
+                # Nothing outside the current top-k can overtake it any more
+                if not admit_new and (len(top) <= k or top[k - 1] > top[k] + remaining):
+                    break
+
+            best = heapq.nlargest(k, scores, key=scores.get)
+            results = []
+            for number in best:
+                # Finish the scores of the winners over the terms the scan skipped
+                terms = self._doc_terms[number]
+                matched = [term for term in query if term in terms]
+                results.append({
+                    'resume_id': self._doc_ids[number],
+                    'score': round(sum(weights[term] for term in matched) / query_weight, 4),
+                    'matched_skills': [term[len(SKILL_PREFIX):] for term in matched
+                                       if term.startswith(SKILL_PREFIX)],
+                    'metadata': self._metadata[number]
+                })
+            results.sort(key=lambda result: result['score'], reverse=True)
+            return results
+
+    def _required_candidates(self, required_skills: Iterable[str]) -> Optional[Set[int]]:
+        """Intersect the posting lists of required skills, smallest first"""
+        postings = []
+        for skill in required_skills:
+            posting = self._postings.get(SKILL_PREFIX + skill.strip().lower())
+            if not posting:
+                return set()
+            postings.append(posting)
+        if not postings:
+            return None
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+
+def _token_terms(terms: FrozenSet[str]) -> Set[str]:
+    """The plain tokens among a resume's index terms, without the skill: entries"""
+    return {term for term in terms if not term.startswith(SKILL_PREFIX)}
@@ -0,0 +1,171 @@
+"""
+Vectorized resume/job similarity scoring.
+
+Documents become sparse term-weight rows over a shared vocabulary, weighted
+by a corpus IDF table, and a whole batch is scored with a single sparse
+matrix product: one resume against N jobs, N resumes against one job, or any
+mix in between. Cosine similarity over TF-IDF and a normalized BM25 are
+supported. SkillBoost is the post-processing step applied to each base score,
+one pair at a time or to a whole matrix at once.
+"""
+
+import json
+import math
+from collections import Counter
+from typing import AbstractSet, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+def _sparse():
+    """scipy.sparse, imported on the first scoring call since scipy is the slowest import at startup"""
+    from scipy import sparse
+    return sparse
+
+
+class IdfTable:
+    """Document frequencies over a reference corpus"""
+
+    def __init__(self, doc_freq: Dict[str, int] = None, total_docs: int = 0, total_tokens: int = 0):
+        self.doc_freq = dict(doc_freq or {})
+        self.total_docs = total_docs
+        self.total_tokens = total_tokens
+
+    def add_document(self, tokens: Iterable[str]) -> None:
+        tokens = list(tokens)
+        self.update(set(tokens), len(tokens))
+
+    def update(self, terms: AbstractSet[str], length: int, delta: int = 1) -> None:
+        """Count a document's distinct terms and token length in (delta=1) or back out (delta=-1)"""
+        for term in terms:
+            count = self.doc_freq.get(term, 0) + delta
+            if count > 0:
+                self.doc_freq[term] = count
+            else:
+                self.doc_freq.pop(term, None)
+        self.total_docs += delta
+        self.total_tokens += delta * length
+
+    def fit(self, documents: Iterable[Iterable[str]]) -> 'IdfTable':
+        for tokens in documents:
+            self.add_document(tokens)
+        return self
+
+    def idf(self, term: str) -> float:
+        # Smoothed so that unseen terms get the highest weight and nothing goes to zero
+        return math.log((1 + self.total_docs) / (1 + self.doc_freq.get(term, 0))) + 1
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'total_docs': self.total_docs, 'total_tokens': self.total_tokens,
+                       'doc_freq': self.doc_freq}, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'IdfTable':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['doc_freq'], data['total_docs'], data.get('total_tokens', 0))
+
+
+class SkillBoost:
+    """Adds a bonus per matched skill to a base score, then caps the result"""
+
+    def __init__(self, per_skill: float = 0.1, max_boost: float = 0.3, cap: float = 0.95):
+        self.per_skill = per_skill
+        self.max_boost = max_boost
+        self.cap = cap
+
+    def apply(self, base_score: float, skill_matches: int) -> float:
+        boost = min(skill_matches * self.per_skill, self.max_boost) if skill_matches > 0 else 0.0
+        return max(min(base_score + boost, self.cap), 0.0)
+
+    def apply_matrix(self, base_scores: np.ndarray, skill_matches: np.ndarray) -> np.ndarray:
+        """apply() over a whole score matrix and its matching matrix of shared-skill counts"""
+        boost = np.where(skill_matches > 0, np.minimum(skill_matches * self.per_skill, self.max_boost), 0.0)
+        return np.clip(base_scores + boost, 0.0, self.cap)
+
+
+class ScoringEngine:
+    """Batch cosine or BM25 scoring of tokenized resumes against tokenized jobs"""
+
+    METHODS = ('cosine', 'bm25')
+
+    def __init__(self, idf_table: IdfTable = None, method: str = 'cosine',
+                 k1: float = 1.5, b: float = 0.75):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown scoring method: {method}")
+        self.idf_table = idf_table or IdfTable()
+        self.method = method
+        self.k1 = k1
+        self.b = b
+
+    def _term_counts(self, counts: Sequence[Counter], vocabulary: Dict[str, int]) -> 'sparse.csr_matrix':
+        """Sparse document x term matrix of raw term counts"""
+        sparse = _sparse()
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for document in counts:
+            for term, count in document.items():
+                indices.append(vocabulary[term])
+                data.append(count)
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(counts), len(vocabulary))
+        )
+
+    def _idf_vector(self, vocabulary: Dict[str, int]) -> np.ndarray:
+        idf = np.empty(len(vocabulary))
+        for term, column in vocabulary.items():
+            idf[column] = self.idf_table.idf(term)
+        return idf
+
+    def score(self, resumes: Sequence[Sequence[str]], jobs: Sequence[Sequence[str]]) -> np.ndarray:
+        """Return a len(resumes) x len(jobs) array of scores in [0, 1]"""
+        resume_bags = [Counter(tokens) for tokens in resumes]
+        job_bags = [Counter(tokens) for tokens in jobs]
+        vocabulary: Dict[str, int] = {}
+        for bag in resume_bags + job_bags:
+            for term in bag:
+                vocabulary.setdefault(term, len(vocabulary))
+        resume_counts = self._term_counts(resume_bags, vocabulary)
+        job_counts = self._term_counts(job_bags, vocabulary)
+        idf = self._idf_vector(vocabulary)
+
+        if self.method == 'bm25':
+            return self._bm25(resume_counts, job_counts, idf)
+        return self._cosine(resume_counts, job_counts, idf)
+
+    def _cosine(self, resume_counts, job_counts, idf) -> np.ndarray:
+        weights = _sparse().diags(idf)
+        resume_vectors = _normalize_rows(resume_counts @ weights)
+        job_vectors = _normalize_rows(job_counts @ weights)
+        return np.asarray((resume_vectors @ job_vectors.T).todense())
+
+    def _bm25(self, resume_counts, job_counts, idf) -> np.ndarray:
+        # Resumes are the documents and each job's distinct terms are the query
+        lengths = np.asarray(resume_counts.sum(axis=1)).ravel()
+        if self.idf_table.total_docs and self.idf_table.total_tokens:
+            average_length = self.idf_table.total_tokens / self.idf_table.total_docs
+        else:
+            average_length = lengths.mean() if lengths.size and lengths.mean() > 0 else 1.0
+        saturated = resume_counts.tocoo()
+        norm = self.k1 * (1 - self.b + self.b * lengths[saturated.row] / average_length)
+        saturated.data = saturated.data * (self.k1 + 1) / (saturated.data + norm)
+        sparse = _sparse()
+        resume_weights = sparse.csr_matrix(saturated) @ sparse.diags(idf)
+
+        job_terms = job_counts.copy()
+        job_terms.data[:] = 1.0
+        raw = np.asarray((resume_weights @ job_terms.T).todense())
+        # Best possible score per job: every query term saturated at k1 + 1
+        best = np.asarray(job_terms @ idf).ravel() * (self.k1 + 1)
+        best[best == 0] = 1.0
+        return raw / best
+
+
+def _normalize_rows(matrix: 'sparse.csr_matrix') -> 'sparse.csr_matrix':
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return _sparse().diags(1.0 / norms) @ matrix
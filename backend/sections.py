@@ -0,0 +1,162 @@
+"""
+Single-pass section segmentation for job postings and resumes.
+
+One pass over the lines finds every line that starts with a known heading
+(Requirements, Qualifications, Responsibilities, Benefits, About,
+Experience, Education, Projects and so on). A set lookup on the first word
+rules out almost every line, and only the rest are checked against the
+full heading pattern, so the cost is linear in the text. Each heading
+is mapped to a canonical section name, and the text between it and the next
+heading becomes that section's content. Headings only count at the start of
+a line, so words like "about" or "requirements" inside a sentence no longer
+split a section. The resulting SectionMap is computed once per document and
+shared by job analysis, role-title detection and resume rewriting.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Canonical section name -> heading phrases, matched case-insensitively at the start of a line
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    'requirements': (
+        'requirements', 'requirement', 'what you need', "what you'll need", 'what you will need',
+        'must haves', 'must have', 'who you are', "what we're looking for", 'what we are looking for'
+    ),
+    'qualifications': ('qualifications', 'qualification', 'nice to haves', 'nice to have', 'bonus points'),
+    'skills': ('skills', 'skill set', 'skillset', 'tech stack', 'technologies'),
+    'responsibilities': (
+        'responsibilities', 'responsibility', 'duties', "what you'll do", 'what you will do',
+        'day to day', 'your role', 'the role', 'role overview'
+    ),
+    'benefits': ('benefits', 'perks', 'what we offer', 'compensation', 'salary'),
+    'about': ('about', 'who we are', 'company overview', 'overview', 'job description', 'description'),
+    'experience': ('experience', 'work history', 'employment history', 'employment', 'career history'),
+    'education': ('education', 'academic background', 'academics', 'academic'),
+    'projects': ('projects', 'project', 'portfolio'),
+    'summary': ('summary', 'profile', 'objective'),
+    'certifications': ('certifications', 'certification', 'certificates', 'licenses')
+}
+
+# Sections whose text describes what a candidate must bring
+REQUIREMENT_SECTIONS = ('requirements', 'qualifications', 'skills')
+
+# Optional words before a heading phrase: "Preferred Qualifications", "Work Experience"
+_QUALIFIERS = (
+    'preferred', 'basic', 'minimum', 'required', 'desired', 'additional', 'key', 'core', 'technical',
+    'professional', 'relevant', 'work', 'job', 'our', 'your', 'the', 'and', '&'
+)
+
+_PHRASES = {phrase: name for name, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+
+
+def _alternation(words) -> str:
+    # Longest first so "requirements" wins over "requirement"
+    return '|'.join(re.escape(word).replace(r'\ ', r'[ \t]+') for word in sorted(words, key=len, reverse=True))
+
+
+HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:#+|\*\*)?[ \t]*'
+    r'(?P<title>(?:(?:' + _alternation(_QUALIFIERS) + r')[ \t]+){0,2}'
+    r'(?P<phrase>' + _alternation(_PHRASES) + r')\b[^:\n]{0,40})'
+    r'(?::(?P<inline>[^\n]*))?$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# First words of anything the heading pattern can start with
+_FIRST_WORDS = frozenset(word.split()[0] for word in list(_PHRASES) + list(_QUALIFIERS))
+_FIRST_WORD = re.compile(r"[A-Za-z&']+")
+
+# Words that may stay lowercase in a title-case heading ("About the Role")
+_MINOR_WORDS = frozenset(['a', 'an', 'and', 'the', 'of', 'to', 'for', 'in', 'on', 'at', 'with', 'you', '&', 'we'])
+
+
+def _looks_like_heading(title: str, has_colon: bool) -> bool:
+    """Tell "Experience" or "ABOUT THE ROLE" apart from a sentence that starts with a heading word"""
+    title = title.strip().strip('*#').strip()
+    if has_colon:
+        return len(title) <= 60
+    if title.isupper():
+        return True
+    words = title.split()
+    if len(words) > 6 or title[-1] in '.,;':
+        return False
+    # Short sentence-case headings such as "About the role" are common in pasted postings
+    if len(words) <= 3 and words[0][0].isupper():
+        return True
+    return all(word[0].isupper() or word.lower() in _MINOR_WORDS or not word[0].isalpha() for word in words)
+
+
+class Heading(NamedTuple):
+    name: str           # Canonical section name
+    title: str          # Heading text as written
+    line: int           # Zero-based line number of the heading
+    start: int          # Offset of the heading line
+    content_start: int  # Offset where the section content begins
+
+
+class SectionMap:
+    """Headings of a document and the text of each section"""
+
+    __slots__ = ('text', 'headings', '_by_name', '_by_line')
+
+    def __init__(self, text: str, headings: List[Heading]):
+        self.text = text
+        self.headings = headings
+        self._by_name: Dict[str, List[int]] = {}
+        for index, heading in enumerate(headings):
+            self._by_name.setdefault(heading.name, []).append(index)
+        self._by_line = {heading.line: heading for heading in headings}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.headings)
+
+    def _content(self, index: int) -> str:
+        end = self.headings[index + 1].start if index + 1 < len(self.headings) else len(self.text)
+        return self.text[self.headings[index].content_start:end]
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Text of every section with this name, in document order"""
+        indexes = self._by_name.get(name)
+        if not indexes:
+            return default
+        return '\n'.join(self._content(index) for index in indexes)
+
+    def names(self) -> List[str]:
+        return list(self._by_name)
+
+    def heading_at(self, line: int) -> Optional[Heading]:
+        """The heading on a given line number, if that line is one"""
+        return self._by_line.get(line)
+
+    @property
+    def preamble(self) -> str:
+        """Text before the first heading"""
+        return self.text[:self.headings[0].start] if self.headings else self.text
+
+    def requirements_text(self) -> str:
+        """Requirement-like sections joined in document order, or the whole text if there are none"""
+        indexes = sorted(index for name in REQUIREMENT_SECTIONS for index in self._by_name.get(name, ()))
+        if not indexes:
+            return self.text
+        return '\n'.join(self._content(index) for index in indexes)
+
+
+def segment(text: str) -> SectionMap:
+    """Find every section heading in one scan of the text"""
+    headings = []
+    offset = 0
+    for number, line in enumerate(text.split('\n')):
+        first_word = _FIRST_WORD.match(line.lstrip(' \t#*'))
+        if first_word and first_word.group().lower() in _FIRST_WORDS:
+            match = HEADING_PATTERN.match(text, offset)
+            if match:
+                inline = match.group('inline')
+                if _looks_like_heading(match.group('title'), inline is not None):
+                    name = _PHRASES[' '.join(match.group('phrase').lower().split())]
+                    content_start = match.start('inline') if inline is not None else match.end()
+                    headings.append(Heading(name, match.group('title').strip(), number, offset, content_start))
+        offset += len(line) + 1
+    return SectionMap(text, headings)
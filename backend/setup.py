@@ -29,7 +29,7 @@ def main():
         print("Trying with --user flag...")
         if not run_command("pip install --user -r requirements.txt"):
             print("Failed to install dependencies. Please install manually:")
-            print("pip install flask flask-cors openai PyPDF2 python-docx python-dotenv requests")
+            print("pip install flask flask-cors openai PyPDF2 python-dotenv requests numpy scipy")
             return False
     
     # Create .env file if it doesn't exist
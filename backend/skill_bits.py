@@ -0,0 +1,83 @@
+"""
+Skill fingerprints: a document's skills as one bit per taxonomy skill.
+
+Every canonical skill has a stable integer ID, its position in the taxonomy
+(new skills are appended, so existing IDs do not move). A document's skills
+become a Python int with bit i set for skill i, which makes overlap a single
+AND plus a popcount, and a skill gap an AND NOT.
+
+For scoring one job against many resumes, fingerprints are packed into an
+(n, words) uint64 matrix of 64-skill words, and overlap_counts() counts the
+shared skills of every row in one vectorized call.
+"""
+
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+# Per-byte popcounts for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+_WORD_MASK = (1 << 64) - 1
+
+# int.bit_count() is Python 3.10+
+_HAS_BIT_COUNT = hasattr(int, 'bit_count')
+
+
+def fingerprint(skill_ids: Iterable[int]) -> int:
+    """Bitset with one bit per skill ID"""
+    bits = 0
+    for skill_id in skill_ids:
+        bits |= 1 << skill_id
+    return bits
+
+
+def popcount(bits: int) -> int:
+    """Number of skills in a fingerprint"""
+    return bits.bit_count() if _HAS_BIT_COUNT else bin(bits).count('1')
+
+
+def skill_ids(bits: int) -> List[int]:
+    """Skill IDs set in a fingerprint, ascending"""
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+def words_for(skill_count: int) -> int:
+    """uint64 words needed for a taxonomy of this many skills"""
+    return max((skill_count + 63) // 64, 1)
+
+
+def to_words(bits: int, words: int) -> np.ndarray:
+    """One fingerprint as a row of uint64 words, least significant word first"""
+    return np.array([(bits >> (64 * i)) & _WORD_MASK for i in range(words)], dtype=np.uint64)
+
+
+def pack(fingerprints: Sequence[int], words: int) -> np.ndarray:
+    """(len(fingerprints), words) uint64 matrix, one fingerprint per row"""
+    packed = np.zeros((len(fingerprints), words), dtype=np.uint64)
+    for row, bits in enumerate(fingerprints):
+        for i in range(words):
+            if not bits:
+                break
+            packed[row, i] = bits & _WORD_MASK
+            bits >>= 64
+    return packed
+
+
+def _row_popcounts(words: np.ndarray) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape[0], -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def overlap_counts(job_bits: int, packed: np.ndarray) -> np.ndarray:
+    """Skills each packed resume shares with one job, as an int64 vector"""
+    if packed.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+    return _row_popcounts(packed & to_words(job_bits, packed.shape[1]))
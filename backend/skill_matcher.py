@@ -0,0 +1,218 @@
+"""
+Single-pass skill matching for resumes and job descriptions.
+
+A SkillTaxonomy maps canonical skill IDs to their aliases ('node.js' <-
+'nodejs', 'node'). A SkillMatcher compiles every alias of a taxonomy into an
+Aho-Corasick automaton once, then finds all skills in a document with one
+linear scan, accepting only matches that sit on word boundaries so that
+'java' does not fire inside 'javascript' nor 'rest' inside 'interest'.
+Each canonical skill's position in the taxonomy is its stable integer ID,
+the bit it occupies in a skill fingerprint (see skill_bits.py).
+"""
+
+import json
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from skill_bits import fingerprint, skill_ids
+
+# Canonical skill ID -> aliases. The canonical ID is always matched as well.
+DEFAULT_TAXONOMY = {
+    'javascript': ['js', 'ecmascript'],
+    'python': [],
+    'java': [],
+    'react': ['react.js', 'reactjs'],
+    'node.js': ['nodejs', 'node js', 'node'],
+    'sql': [],
+    'aws': ['amazon web services'],
+    'docker': [],
+    'kubernetes': ['k8s'],
+    'git': [],
+    'html': ['html5'],
+    'css': ['css3'],
+    'typescript': [],
+    'mongodb': ['mongo'],
+    'postgresql': ['postgres'],
+    'redis': [],
+    'graphql': [],
+    'rest': ['restful', 'rest api'],
+    'angular': ['angularjs'],
+    'vue': ['vue.js', 'vuejs'],
+    'express': ['express.js', 'expressjs'],
+    'django': [],
+    'flask': [],
+    'spring': ['spring boot'],
+    'laravel': [],
+    'ruby': [],
+    'php': [],
+    'c++': ['cpp'],
+    'c#': ['csharp'],
+    'golang': [],
+    'rust': [],
+    'swift': [],
+    'kotlin': [],
+    'flutter': [],
+    'react native': ['reactnative', 'react-native'],
+    'firebase': [],
+    'azure': [],
+    'gcp': ['google cloud'],
+    'terraform': [],
+    'jenkins': [],
+    'ci/cd': ['cicd', 'ci-cd'],
+    'agile': [],
+    'scrum': [],
+}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillTaxonomy:
+    """Ordered mapping of canonical skill IDs to their aliases"""
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        self._aliases: Dict[str, List[str]] = {}
+        for canonical, aliases in skills.items():
+            canonical = canonical.strip().lower()
+            if not canonical:
+                continue
+            names = self._aliases.setdefault(canonical, [canonical])
+            for alias in aliases:
+                alias = alias.strip().lower()
+                if alias and alias not in names:
+                    names.append(alias)
+
+    @classmethod
+    def default(cls) -> 'SkillTaxonomy':
+        return cls(DEFAULT_TAXONOMY)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillTaxonomy':
+        """Load a taxonomy from a JSON object of canonical ID -> alias list"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def canonical_ids(self) -> List[str]:
+        return list(self._aliases)
+
+    def aliases(self) -> Iterator[Tuple[str, str]]:
+        """Yield (alias, canonical ID) pairs"""
+        for canonical, names in self._aliases.items():
+            for name in names:
+                yield name, canonical
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every alias of a taxonomy"""
+
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        self._canonical = taxonomy.canonical_ids
+        index = {canonical: i for i, canonical in enumerate(self._canonical)}
+        self._ids = index
+        self._alias_lists: List[List[str]] = [[] for _ in self._canonical]
+        for alias, canonical in taxonomy.aliases():
+            self._alias_lists[index[canonical]].append(alias)
+        # Fingerprint -> aliases of its skills, for the few fingerprints callers ask about
+        self._aliases_by_bits: Dict[int, Tuple[str, ...]] = {}
+
+        # Trie: per-node transitions, failure links and (length, canonical index) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]
+
+        for alias, canonical in taxonomy.aliases():
+            node = 0
+            for ch in alias:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(alias), index[canonical]))
+
+        # Breadth-first pass to compute failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, canonical ID) for every word-bounded match in text"""
+        canonical = self._canonical
+        for start, end, skill in self.iter_match_ids(text):
+            yield start, end, canonical[skill]
+
+    def iter_match_ids(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, skill ID) for every word-bounded match in text"""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < length and _is_word_char(text[end]):
+                # Every output of this state ends here, so all fail the right boundary
+                continue
+            for alias_length, skill in out[state]:
+                start = end - alias_length
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                yield start, end, skill
+
+    def find_all(self, text: str) -> List[str]:
+        """Return the distinct canonical skills in text, in order of first appearance"""
+        seen = {}
+        for _, _, skill in self.iter_match_ids(text):
+            if skill not in seen:
+                seen[skill] = None
+        return [self._canonical[skill] for skill in seen]
+
+    @property
+    def skill_count(self) -> int:
+        return len(self._canonical)
+
+    def skill_id(self, skill: str) -> int:
+        """Stable integer ID of a canonical skill, or -1 if it is not in the taxonomy"""
+        return self._ids.get(skill.strip().lower(), -1)
+
+    def skill_name(self, skill_id: int) -> str:
+        """Canonical skill with this ID"""
+        return self._canonical[skill_id]
+
+    def fingerprint(self, skills: Iterable[str]) -> int:
+        """Bitset of canonical skill names; names outside the taxonomy are ignored"""
+        return fingerprint(skill_id for skill_id in map(self.skill_id, skills) if skill_id >= 0)
+
+    def skill_names(self, bits: int) -> List[str]:
+        """Canonical skills set in a fingerprint, in taxonomy order"""
+        return [self._canonical[skill_id] for skill_id in skill_ids(bits)]
+
+    def aliases_of(self, bits: int) -> Tuple[str, ...]:
+        """Every alias of the skills in a fingerprint"""
+        aliases = self._aliases_by_bits.get(bits)
+        if aliases is None:
+            aliases = tuple(alias for skill_id in skill_ids(bits) for alias in self._alias_lists[skill_id])
+            if len(self._aliases_by_bits) < 1024:
+                self._aliases_by_bits[bits] = aliases
+        return aliases
@@ -0,0 +1,79 @@
+"""
+Prebuilt startup state loaded from a snapshot file.
+
+Compiling a large custom skill taxonomy into its Aho-Corasick automaton and
+parsing a large IDF table from JSON both grow with their inputs, and every
+worker repeats them at startup. A snapshot pickles the built objects once.
+Its key records the size and modification time of every source file (the
+taxonomy, the IDF table and the modules that define the pickled classes),
+the way .pyc files track their sources, so a stale snapshot is rebuilt
+instead of loaded.
+
+Snapshots are pickles: only point STARTUP_SNAPSHOT_PATH at a file this
+deployment writes.
+"""
+
+import gc
+import os
+import pickle
+import sys
+import tempfile
+from typing import Callable, Dict, Optional, Tuple
+
+SNAPSHOT_VERSION = 1
+
+
+def source_key(*paths: Optional[str]) -> str:
+    """Identity of the files a snapshot was built from; None paths are recorded as absent"""
+    parts = [f"v{SNAPSHOT_VERSION}", f"py{sys.version_info[0]}.{sys.version_info[1]}"]
+    for path in paths:
+        if path is None:
+            parts.append('-')
+            continue
+        stat = os.stat(path)
+        parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return '|'.join(parts)
+
+
+def load_snapshot(path: str, key: str) -> Optional[Dict]:
+    """The state stored at path if it was built from the same sources, else None"""
+    # Unpickling creates hundreds of thousands of small containers; collections meanwhile find nothing to free
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, 'rb') as f:
+            stored_key, state = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Ignoring unreadable startup snapshot {path}: {e}")
+        return None
+    finally:
+        if collecting:
+            gc.enable()
+    return state if stored_key == key else None
+
+
+def save_snapshot(path: str, key: str, state: Dict) -> None:
+    """Write the state atomically so workers starting concurrently never read a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_or_build(path: str, key: str, build: Callable[[], Dict]) -> Tuple[Dict, str]:
+    """State from the snapshot if current, otherwise built and saved; also returns 'snapshot' or 'built'"""
+    state = load_snapshot(path, key)
+    if state is not None:
+        return state, 'snapshot'
+    state = build()
+    try:
+        save_snapshot(path, key, state)
+    except OSError as e:
+        print(f"Could not write startup snapshot {path}: {e}")
+    return state, 'built'
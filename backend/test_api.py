@@ -5,6 +5,11 @@ Test script for Resume Tailor API
 
 import requests
 import json
+import os
+import tempfile
+import time
+import zipfile
+from io import BytesIO
 
 BASE_URL = "http://localhost:5000"
 
@@ -108,6 +113,969 @@ def test_resume_tailoring():
         print(f"Error: {e}")
         return False
 
+def test_skill_word_boundaries():
+    """Test that skills only match on word boundaries and aliases collapse"""
+    print("\nTesting skill word boundaries...")
+    
+    sample_job = """
+    Frontend Engineer
+    
+    Requirements:
+    - Strong JavaScript skills and an interest in nodejs tooling
+    - Experience with Node.js services
+    """
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/analyze-job",
+            json={"job_description": sample_job}
+        )
+        print(f"Status: {response.status_code}")
+        skills = response.json().get('job_analysis', {}).get('required_skills', [])
+        print(f"Required Skills: {skills}")
+        return (response.status_code == 200
+                and 'javascript' in skills
+                and 'java' not in skills
+                and 'rest' not in skills
+                and skills.count('node.js') == 1)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_upload_cache():
+    """Test that re-uploading the same file is served from the extraction cache"""
+    print("\nTesting upload cache...")
+    
+    sample_resume = b"Jane Doe\nBackend Engineer\n\nSKILLS:\nPython, Flask, PostgreSQL, Docker\n"
+    
+    try:
+        before = requests.get(f"{BASE_URL}/api/health").json()['caches']['extraction']
+        for _ in range(2):
+            response = requests.post(
+                f"{BASE_URL}/api/upload-resume",
+                files={"file": ("resume.txt", sample_resume)}
+            )
+            print(f"Status: {response.status_code}")
+            if response.status_code != 200:
+                return False
+        after = requests.get(f"{BASE_URL}/api/health").json()['caches']['extraction']
+        print(f"Cache stats: {json.dumps(after)}")
+        return after['hits'] > before['hits']
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_upload_cache_file_names():
+    """Test that crafted upload file names cannot break the on-disk extraction cache"""
+    print("\nTesting upload cache file names...")
+    
+    import app as app_module
+    from caching import DiskCache, TieredCache
+    
+    names = ["resume." + "x" * 300, "resume.txt/../../escape", "resume.\x00txt", "resume.txt"]
+    original = app_module.processor.extraction_cache
+    with tempfile.TemporaryDirectory() as directory:
+        app_module.processor.extraction_cache = TieredCache(1024 * 1024, DiskCache(directory))
+        try:
+            client = app_module.app.test_client()
+            statuses = [client.post("/api/upload-resume", content_type="multipart/form-data",
+                                    data={"file": (BytesIO(b"Jane Doe\nPython, Docker"), name)}).status_code
+                        for name in names]
+            disk = DiskCache(directory)
+            disk.put("\x00bad" + "y" * 300, "value")
+            entries = [name for _, _, files in os.walk(directory) for name in files]
+            print(f"Statuses: {statuses}, entries: {entries}")
+            return (statuses == [200] * len(names) and disk.get("\x00bad" + "y" * 300) is None
+                    and len(entries) == 1 and all('/' not in name and '\x00' not in name for name in entries))
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+        finally:
+            app_module.processor.extraction_cache = original
+
+def test_batch_tailoring():
+    """Test batch tailoring streams one NDJSON result per job description"""
+    print("\nTesting batch tailoring...")
+    
+    sample_resume = """
+    Jane Doe
+    Backend Engineer
+    
+    EXPERIENCE:
+    - Developed REST APIs in Python and Flask
+    - Built data pipelines on AWS
+    """
+    
+    sample_jobs = [
+        "Python Developer\n\nRequirements:\n- Python and Django\n- AWS experience",
+        "Frontend Engineer\n\nRequirements:\n- React and TypeScript",
+        ""
+    ]
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/tailor-resume/batch",
+            json={
+                "resume_text": sample_resume,
+                "job_descriptions": sample_jobs
+            },
+            stream=True
+        )
+        print(f"Status: {response.status_code}")
+        results = [json.loads(line) for line in response.iter_lines() if line]
+        for result in results:
+            print(f"Job {result['index']}: success={result['success']} match={result.get('match_score', 'N/A')}")
+        indexes = sorted(result['index'] for result in results)
+        return (response.status_code == 200
+                and indexes == [0, 1, 2]
+                and [r['success'] for r in sorted(results, key=lambda r: r['index'])] == [True, True, False])
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_rank_resumes():
+    """Test indexing resumes and ranking them against a job description"""
+    print("\nTesting resume ranking...")
+    
+    resumes = {
+        "test-backend": "Backend engineer building Python and Django services on AWS with PostgreSQL",
+        "test-frontend": "Frontend developer focused on React, TypeScript and CSS design systems",
+        "test-mobile": "Mobile engineer shipping Swift and Kotlin apps with Firebase"
+    }
+    
+    try:
+        for resume_id, resume_text in resumes.items():
+            response = requests.post(
+                f"{BASE_URL}/api/resumes",
+                json={"resume_id": resume_id, "resume_text": resume_text}
+            )
+            if response.status_code != 200:
+                print(f"Index status: {response.status_code}")
+                return False
+        
+        response = requests.post(
+            f"{BASE_URL}/api/rank-resumes",
+            json={
+                "job_description": "Senior Python Engineer. Requirements: Python, Django, AWS",
+                "top_k": 2
+            }
+        )
+        print(f"Status: {response.status_code}")
+        results = response.json().get('results', [])
+        for result in results:
+            print(f"{result['resume_id']}: {result['score']} {result['matched_skills']}")
+        
+        invalid = [
+            requests.post(f"{BASE_URL}/api/rank-resumes",
+                          json={"job_description": "Python Engineer", **fields}).status_code
+            for fields in ({"top_k": "x"}, {"top_k": 0}, {"required_skills": "python"})
+        ]
+        print(f"Invalid input statuses: {invalid}")
+        
+        for resume_id in resumes:
+            requests.delete(f"{BASE_URL}/api/resumes/{resume_id}")
+        missing = requests.delete(f"{BASE_URL}/api/resumes/test-backend")
+        
+        return (response.status_code == 200
+                and results and results[0]['resume_id'] == 'test-backend'
+                and invalid == [400, 400, 400]
+                and missing.status_code == 404)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_extraction_pool_cold_start():
+    """Test that a cold extraction worker's startup does not count against the per-document timeout"""
+    print("\nTesting extraction pool cold start...")
+    
+    from extraction_pool import ExtractionPool
+    
+    # Far shorter than spawning a worker takes, but ample for parsing a few lines of text
+    pool = ExtractionPool(1, timeout=0.05, max_tasks_per_worker=1)
+    try:
+        results = [pool.extract(b"Jane Doe\nPython, Docker", "resume.txt")['text'] for _ in range(3)]
+        print(f"Extracted: {results}")
+        return results == ["Jane Doe\nPython, Docker"] * 3
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        pool.shutdown()
+
+def test_stream_disconnect():
+    """Test that a client leaving a streamed tailoring closes the upstream LLM stream and frees its slot"""
+    print("\nTesting stream disconnect...")
+    
+    from types import SimpleNamespace
+    import app as app_module
+    from llm_client import LLMClient
+    
+    class FakeStream:
+        closed = False
+        
+        def __iter__(self):
+            for _ in range(1000):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Python "))])
+        
+        def close(self):
+            self.closed = True
+    
+    stream = FakeStream()
+    llm_client = LLMClient('test-key', max_concurrency=1)
+    llm_client._client = SimpleNamespace(chat=SimpleNamespace(
+        completions=SimpleNamespace(create=lambda **kwargs: stream)))
+    original = app_module.processor.llm_client
+    app_module.processor.llm_client = llm_client
+    try:
+        response = app_module.app.test_client().post("/api/tailor-resume/stream", buffered=False, json={
+            "resume_text": "Jane Doe\nSKILLS:\n- Python",
+            "job_description": "Backend Engineer\nRequirements:\n- Python",
+            "bypass_cache": True
+        })
+        events = iter(response.response)
+        while b'event: token' not in next(events):
+            pass
+        response.close()  # What the server does when the client disconnects
+        print(f"Upstream closed: {stream.closed}, in flight: {llm_client.in_flight}")
+        return stream.closed and llm_client.in_flight == 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        app_module.processor.llm_client = original
+
+def test_rank_long_resume():
+    """Test that skills and terms past the bounded analysis limit are still found by ranking"""
+    print("\nTesting ranking of a long resume...")
+    
+    # Over the default 50000-character analysis step budget, with the distinctive terms at the end
+    resume = ("Jane Doe\nEXPERIENCE:\n" + "- Wrote reports for the finance team\n" * 1500
+              + "- Ran Terraform modules for the zyxplatform migration\n")
+    try:
+        added = requests.post(f"{BASE_URL}/api/resumes", json={"resume_id": "test-long", "resume_text": resume})
+        response = requests.post(f"{BASE_URL}/api/rank-resumes", json={
+            "job_description": "Infrastructure Engineer for zyxplatform. Requirements: Terraform",
+            "required_skills": ["terraform"]
+        })
+        requests.delete(f"{BASE_URL}/api/resumes/test-long")
+        results = response.json().get('results', [])
+        print(f"Status: {added.status_code}/{response.status_code}, results: {results}")
+        return (added.status_code == 200 and response.status_code == 200
+                and [result['resume_id'] for result in results] == ['test-long']
+                and results[0]['matched_skills'] == ['terraform'])
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_scoring_engine():
+    """Test cosine and BM25 scores against hand-computed values, empty inputs, and IDF learned from indexed resumes"""
+    print("\nTesting scoring engine...")
+    
+    import math
+    import app as app_module
+    from resume_index import ResumeIndex
+    from scoring import IdfTable, ScoringEngine
+    from tokenizer import tokenize
+    
+    # idf = ln((1 + N) / (1 + df)) + 1 with N = 3: python appears everywhere, docker in one document
+    table = IdfTable({'python': 3, 'docker': 1}, total_docs=3, total_tokens=9)
+    idf_python, idf_docker = 1.0, math.log(2) + 1
+    resume, job = ['python', 'python', 'docker'], ['python', 'docker']
+    try:
+        cosine = ScoringEngine(table, 'cosine').score([resume], [job])[0][0]
+        expected_cosine = ((2 * idf_python * idf_python + idf_docker * idf_docker)
+                           / (math.hypot(2 * idf_python, idf_docker) * math.hypot(idf_python, idf_docker)))
+        
+        # Average length 9 / 3 = 3 equals the resume's, so each term's norm is k1 = 1.5
+        bm25 = ScoringEngine(table, 'bm25').score([resume], [job])[0][0]
+        saturated_python = 2 * 2.5 / (2 + 1.5)
+        saturated_docker = 1 * 2.5 / (1 + 1.5)
+        expected_bm25 = ((idf_python * saturated_python + idf_docker * saturated_docker)
+                         / ((idf_python + idf_docker) * 2.5))
+        
+        stopwords_only = tokenize("the and of with")
+        empty = [ScoringEngine(table, method).score(*pair)[0][0]
+                 for method in ScoringEngine.METHODS
+                 for pair in (([[]], [job]), ([resume], [[]]), ([stopwords_only], [stopwords_only]))]
+        
+        learned = IdfTable()
+        index = ResumeIndex(app_module.processor.skill_matcher, idf_table=learned)
+        index.add('a', "Python and Docker services")
+        index.add('b', "Python data pipelines")
+        both = (learned.total_docs, learned.doc_freq.get('python'), learned.doc_freq.get('docker'))
+        index.remove('a')
+        after_remove = (learned.total_docs, learned.doc_freq.get('python'), 'docker' in learned.doc_freq)
+        
+        print(f"cosine {cosine:.6f} vs {expected_cosine:.6f}, bm25 {bm25:.6f} vs {expected_bm25:.6f}, "
+              f"empty {empty}, learned {both} -> {after_remove}")
+        return (math.isclose(cosine, expected_cosine) and math.isclose(bm25, expected_bm25)
+                and stopwords_only == [] and empty == [0.0] * 6
+                and both == (2, 2, 1) and after_remove == (1, 1, False))
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_tailoring_profile():
+    """Test that a profiled tailoring request reports reused analysis passes"""
+    print("\nTesting tailoring profile...")
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/tailor-resume",
+            json={
+                "resume_text": "Jane Doe\nEXPERIENCE:\n- Developed Python services on AWS",
+                "job_description": "Python Engineer\n\nRequirements:\n- Python\n- AWS",
+                "profile": True
+            }
+        )
+        print(f"Status: {response.status_code}")
+        profile = response.json().get('profile', {})
+        print(f"Profile: {json.dumps(profile)}")
+        return response.status_code == 200 and profile.get('passes_avoided', 0) > 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_job_analysis_cache():
+    """Test that re-pasting a posting with different whitespace hits the analysis cache"""
+    print("\nTesting job analysis cache...")
+    
+    sample_job = "Data Engineer\n\nRequirements:\n- Python and SQL\n- Airflow on AWS"
+    
+    try:
+        before = requests.get(f"{BASE_URL}/api/health").json()['caches']['job_analysis']
+        first = requests.post(f"{BASE_URL}/api/analyze-job", json={"job_description": sample_job})
+        second = requests.post(
+            f"{BASE_URL}/api/analyze-job",
+            json={"job_description": "  " + sample_job.replace("\n", "\n\n") + "  "}
+        )
+        after = requests.get(f"{BASE_URL}/api/health").json()['caches']['job_analysis']
+        print(f"Cache stats: {json.dumps(after)}")
+        return (first.status_code == 200 and second.status_code == 200
+                and first.json()['job_analysis'] == second.json()['job_analysis']
+                and after['hits'] > before['hits'])
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_streaming_tailoring():
+    """Test that the SSE tailoring stream sends analysis first, then tokens, then the summary"""
+    print("\nTesting streaming tailoring...")
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/tailor-resume/stream",
+            json={
+                "resume_text": "Jane Doe\nEXPERIENCE:\n- Developed Python services on AWS",
+                "job_description": "Python Engineer\n\nRequirements:\n- Python\n- AWS\n- Docker"
+            },
+            stream=True
+        )
+        print(f"Status: {response.status_code}")
+        events = []
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith('event: '):
+                event = line[len('event: '):]
+            elif line.startswith('data: '):
+                events.append((event, json.loads(line[len('data: '):])))
+        names = [name for name, _ in events]
+        print(f"Events: {names[0]} ... {names[-1]} ({len(names)} total)")
+        tailored = ''.join(data['text'] for name, data in events if name == 'token')
+        done = events[-1][1]
+        return (response.status_code == 200 and names[0] == 'analysis' and names[-1] == 'done'
+                and 'token' in names and bool(tailored) and 'match_score' in done
+                and 'suggested_projects' in done)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_llm_cache_reporting():
+    """Test that tailoring reports the LLM cache outcome and honours the bypass flag"""
+    print("\nTesting LLM cache reporting...")
+    
+    payload = {
+        "resume_text": "Jane Doe\nEXPERIENCE:\n- Developed Python services on AWS",
+        "job_description": "Python Engineer\n\nRequirements:\n- Python\n- AWS"
+    }
+    
+    try:
+        first = requests.post(f"{BASE_URL}/api/tailor-resume", json=payload).json()
+        second = requests.post(f"{BASE_URL}/api/tailor-resume", json=payload).json()
+        bypassed = requests.post(f"{BASE_URL}/api/tailor-resume", json={**payload, "bypass_cache": True}).json()
+        outcomes = [first.get('llm_cache'), second.get('llm_cache'), bypassed.get('llm_cache')]
+        print(f"Cache outcomes: {outcomes}")
+        # Without an API key the LLM (and its cache) is disabled
+        if outcomes[0] == 'disabled':
+            return outcomes == ['disabled'] * 3
+        return outcomes[1] == 'hit' and outcomes[2] == 'bypass'
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_metrics():
+    """Test that /metrics exposes per-stage histograms in Prometheus text format"""
+    print("\nTesting metrics endpoint...")
+    
+    try:
+        requests.post(f"{BASE_URL}/api/analyze-job", json={"job_description": "Python Engineer\nRequirements:\n- Python"})
+        response = requests.get(f"{BASE_URL}/metrics")
+        print(f"Status: {response.status_code}")
+        body = response.text
+        expected = [
+            'resume_tailor_job_analysis_seconds_count',
+            'resume_tailor_json_serialization_seconds_bucket',
+            'resume_tailor_cache_requests_total{cache="job_analysis",outcome="miss"}',
+            'resume_tailor_llm_in_flight'
+        ]
+        missing = [name for name in expected if name not in body]
+        print(f"Missing: {missing}")
+        return response.status_code == 200 and response.headers['Content-Type'].startswith('text/plain') and not missing
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_user_stats_aggregates():
+    """Test that tailoring activity updates the running count, average and capped activity list"""
+    print("\nTesting user stats aggregates...")
+    
+    user_id = f"load-{int(time.time() * 1000)}"
+    
+    try:
+        for score in (70, 80, 90):
+            requests.post(f"{BASE_URL}/api/user/{user_id}/activity",
+                          json={"action": "Resume tailored for Python Engineer", "match_score": score})
+        for i in range(12):
+            requests.post(f"{BASE_URL}/api/user/{user_id}/activity", json={"action": f"Resume uploaded: cv-{i}.pdf"})
+        stats = requests.get(f"{BASE_URL}/api/user/{user_id}/stats").json()['stats']
+        print(f"Tailored: {stats['resumes_tailored']}, average: {stats['average_match_score']}, "
+              f"activities: {len(stats['recent_activity'])}")
+        return (stats['resumes_tailored'] == 3 and stats['average_match_score'] == 80
+                and len(stats['recent_activity']) == 10
+                and stats['recent_activity'][0]['action'] == "Resume uploaded: cv-11.pdf")
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_section_segmentation():
+    """Test that 'about' inside a sentence no longer cuts the requirements section short"""
+    print("\nTesting section segmentation...")
+    
+    job = ("Backend Engineer\n\nRequirements:\n- Care about code quality\n- Python and Django\n"
+           "Preferred Qualifications:\n- Kubernetes\n\nBenefits:\n- Remote work with Docker stipend")
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/analyze-job", json={"job_description": job})
+        analysis = response.json().get('job_analysis', {})
+        skills = analysis.get('required_skills', [])
+        print(f"Required skills: {skills}, role: {analysis.get('role')}")
+        return (response.status_code == 200 and {'python', 'django', 'kubernetes'} <= set(skills)
+                and 'docker' not in skills and analysis.get('role') == 'Backend Engineer')
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_request_budgets():
+    """Test that oversized bodies and text fields are refused with 413 before analysis"""
+    print("\nTesting request budgets...")
+    
+    try:
+        # About one megabyte of pasted posting, over the analyze-job body budget
+        response = requests.post(f"{BASE_URL}/api/analyze-job",
+                                 json={"job_description": "Python developer with Django. " * 35000})
+        print(f"1 MB paste: {response.status_code} {response.json().get('error')}")
+        if response.status_code != 413 or 'limit_bytes' not in response.json():
+            return False
+        
+        # Small body but a resume over the character budget
+        response = requests.post(f"{BASE_URL}/api/tailor-resume", json={
+            "resume_text": "x" * 100001,
+            "job_description": "Python developer"
+        })
+        print(f"Long resume: {response.status_code} {response.json().get('error')}")
+        if response.status_code != 413 or 'limit_chars' not in response.json():
+            return False
+        
+        # Within budget but longer than one analysis step reads
+        job = "Data Engineer\nRequirements:\n" + "- Build pipelines in Python\n" * 2000 + "- Kafka and Spark\n"
+        response = requests.post(f"{BASE_URL}/api/analyze-job", json={"job_description": job})
+        limits = response.json().get('analysis_limits', {})
+        print(f"Long posting: {response.status_code} {limits}")
+        return (response.status_code == 200 and limits.get('mode') == 'bounded'
+                and 'sections' in limits.get('limits_hit', [])
+                and 'kafka' not in response.json()['job_analysis']['required_skills'])
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_bounded_added_keywords():
+    """Test that words past the analysis clip point are not reported as added keywords"""
+    print("\nTesting added keywords in bounded mode...")
+    
+    # Over the default 50000-character step budget, with distinct words only near the end
+    resume = ("Jane Doe\nEXPERIENCE:\n" + "- Built services in Python\n" * 2000
+              + "- Maintained " + " ".join(f"ledger{i}" for i in range(400)) + "\n")
+    try:
+        response = requests.post(f"{BASE_URL}/api/tailor-resume", json={
+            "resume_text": resume,
+            "job_description": "Backend Engineer\nRequirements:\n- Python"
+        })
+        original = set(resume.lower().split())
+        added = response.json().get('added_keywords', [])
+        print(f"Status: {response.status_code}, added keywords: {added}")
+        return response.status_code == 200 and not original.intersection(added)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_upload_within_resume_budget():
+    """Test that an upload longer than the resume budget is cut to it and can still be tailored"""
+    print("\nTesting upload within resume budget...")
+    
+    # Between the 100000-character resume budget and the old 200000-character extraction budget
+    text = "Jane Doe\nSKILLS\nPython, Docker\nEXPERIENCE\n" + "- Built data pipelines in Python\n" * 4500
+    try:
+        upload = requests.post(f"{BASE_URL}/api/upload-resume",
+                               files={"file": ("long-resume.txt", text.encode())}).json()
+        resume_text = upload.get('resume_text', '')
+        tailor = requests.post(f"{BASE_URL}/api/tailor-resume", json={
+            "resume_text": resume_text,
+            "job_description": "Data Engineer\nRequirements:\n- Python"
+        })
+        print(f"Uploaded {len(text)} chars, extracted {len(resume_text)} "
+              f"({upload.get('extraction', {}).get('truncated_by')}), tailor status {tailor.status_code}")
+        return (len(text) > 100000 and 0 < len(resume_text) <= 100000
+                and upload['truncated'] and upload['extraction']['truncated_by'] == 'char_limit'
+                and tailor.status_code == 200)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_async_tailoring_job():
+    """Test submitting a tailoring job and long-polling for its result"""
+    print("\nTesting async tailoring job...")
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/tailor-resume/jobs", json={
+            "resume_text": "Jane Doe\nSoftware Engineer\nExperience:\n- Built APIs in Python",
+            "job_description": "Backend Engineer at Acme\nRequirements:\n- Python, Django, PostgreSQL"
+        })
+        submitted = response.json()
+        print(f"Submitted: {response.status_code} {submitted.get('status')}")
+        if response.status_code != 202 or not submitted.get('job_id'):
+            return False
+        
+        response = requests.get(f"{BASE_URL}{submitted['status_url']}", params={"wait": 20})
+        job = response.json()
+        print(f"Polled: {response.status_code} {job.get('status')}")
+        if response.status_code != 200 or job.get('status') != 'done':
+            return False
+        
+        missing = requests.get(f"{BASE_URL}/api/tailor-resume/jobs/does-not-exist")
+        return bool(job['result'].get('tailored_resume')) and missing.status_code == 404
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_job_queue_depth_after_expiry():
+    """Test that queued jobs past their TTL leave the reported queue depth and free room for new jobs"""
+    print("\nTesting job queue depth after expiry...")
+    
+    from job_queue import MemoryJobBroker, QueueFull, SQLiteJobBroker
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        brokers = {'memory': MemoryJobBroker(max_depth=2, job_ttl=0.2),
+                   'sqlite': SQLiteJobBroker(os.path.join(directory, 'jobs.sqlite3'), max_depth=2, job_ttl=0.2)}
+        try:
+            for name, broker in brokers.items():
+                broker.submit({'n': 1})
+                broker.submit({'n': 2})
+                before = broker.counts()['queued']
+                time.sleep(0.3)
+                after = broker.counts()
+                try:
+                    broker.submit({'n': 3})
+                    accepted = True
+                except QueueFull:
+                    accepted = False
+                results[name] = (before, after['queued'], after['expired'], accepted, broker.counts()['queued'])
+            print(f"(queued, queued after TTL, expired, new job accepted, queued now): {results}")
+            return all(result == (2, 0, 2, True, 1) for result in results.values())
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+        finally:
+            for broker in brokers.values():
+                broker.close()
+
+def test_resume_handle():
+    """Test tailoring an uploaded resume by its resume_id instead of resending the text"""
+    print("\nTesting resume handles...")
+    
+    resume = "Sam Lee\nBackend Developer\nExperience:\n- Developed REST APIs with Flask and PostgreSQL\n"
+    job = "Python Engineer at Initech\nRequirements:\n- Python, Flask, Docker"
+    
+    try:
+        upload = requests.post(f"{BASE_URL}/api/upload-resume",
+                               files={"file": ("handle.txt", resume.encode('utf-8'), "text/plain")}).json()
+        resume_id = upload.get('resume_id')
+        print(f"Resume ID: {resume_id}")
+        if not resume_id:
+            return False
+        
+        by_text = requests.post(f"{BASE_URL}/api/tailor-resume",
+                                json={"resume_text": upload['resume_text'], "job_description": job}).json()
+        by_id = requests.post(f"{BASE_URL}/api/tailor-resume",
+                              json={"resume_id": resume_id, "job_description": job}).json()
+        missing = requests.post(f"{BASE_URL}/api/tailor-resume",
+                                json={"resume_id": "0" * 64, "job_description": job})
+        print(f"Scores: {by_text.get('match_score')} vs {by_id.get('match_score')}, unknown ID: {missing.status_code}")
+        return (by_id.get('success') and by_id['tailored_resume'] == by_text['tailored_resume']
+                and by_id['match_score'] == by_text['match_score'] and missing.status_code == 404)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_skill_gap():
+    """Test that tailoring reports required skills the resume does not mention"""
+    print("\nTesting skill gap...")
+    
+    try:
+        response = requests.post(f"{BASE_URL}/api/tailor-resume", json={
+            "resume_text": "Alex Kim\nExperience:\n- Built services in Python and Docker",
+            "job_description": "Platform Engineer\nRequirements:\n- Python, Kubernetes, Terraform, Docker"
+        })
+        gap = response.json().get('skill_gap')
+        print(f"Skill gap: {gap}")
+        return response.status_code == 200 and set(gap or []) == {'kubernetes', 'terraform'}
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_response_compression():
+    """Test that large responses are compressed when accepted and byte counts reach the metrics"""
+    print("\nTesting response compression...")
+    
+    try:
+        payload = {
+            "resume_text": "Alex Kim\nExperience:\n" + "- Built services in Python and Docker\n" * 40,
+            "job_description": "Platform Engineer\nRequirements:\n- Python, Kubernetes, Terraform, Docker"
+        }
+        compressed = requests.post(f"{BASE_URL}/api/tailor-resume", json=payload,
+                                   headers={"Accept-Encoding": "gzip"})
+        plain = requests.post(f"{BASE_URL}/api/tailor-resume", json=payload,
+                              headers={"Accept-Encoding": "identity"})
+        # A few hundred bytes whatever the server's configuration, well under COMPRESSION_MIN_BYTES
+        small = requests.get(f"{BASE_URL}/api/user/compression-test/stats", headers={"Accept-Encoding": "gzip"})
+        body = requests.get(f"{BASE_URL}/metrics", headers={"Accept-Encoding": "identity"}).text
+        
+        print(f"Encodings: tailor={compressed.headers.get('Content-Encoding')}, "
+              f"identity={plain.headers.get('Content-Encoding')}, stats={small.headers.get('Content-Encoding')}")
+        return (compressed.status_code == 200
+                and compressed.headers.get('Content-Encoding') == 'gzip'
+                and 'Content-Encoding' not in plain.headers
+                and 'Content-Encoding' not in small.headers
+                and compressed.json()['tailored_resume'] == plain.json()['tailored_resume']
+                and 'resume_tailor_response_serialized_bytes_total{endpoint="tailor_resume"}' in body
+                and 'encoding="gzip"' in body)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_json_encoders_match():
+    """Test that orjson and stdlib encoding give the same output as Flask for types Flask handles"""
+    print("\nTesting JSON encoders...")
+    
+    import dataclasses
+    import datetime
+    import decimal
+    import uuid
+    import app as app_module
+    from flask.json.provider import DefaultJSONProvider
+    from response_codec import json_encoder
+    
+    @dataclasses.dataclass
+    class Posting:
+        title: str
+        posted: datetime.date
+    
+    payload = {"score": decimal.Decimal("0.85"), "id": uuid.UUID(int=7), "at": datetime.datetime(2024, 5, 1, 9, 30),
+               "posting": Posting("Engineer", datetime.date(2024, 5, 1)), "big": 2 ** 70, "name": "Zoë"}
+    try:
+        expected = json.loads(DefaultJSONProvider(app_module.app).dumps(payload))
+        outputs = {name: app_module.FastJSONProvider(app_module.app, json_encoder(name)).dumps(payload)
+                   for name in ('orjson', 'stdlib')}
+        pretty = app_module.app.json.dumps(payload, indent=2)
+        print(f"Outputs: {outputs}")
+        return (outputs['orjson'] == outputs['stdlib'] and json.loads(outputs['orjson']) == expected
+                and pretty == DefaultJSONProvider(app_module.app).dumps(payload, indent=2))
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def start_stub_llm(**options):
+    """Stub chat completions server from benchmarks/ on a free local port; returns (server, state, base_url)"""
+    import argparse
+    import os
+    import sys
+    import threading
+    from http.server import ThreadingHTTPServer
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+    from stub_llm_server import StubState, make_handler
+    
+    defaults = dict(latency=0, jitter=0, token_delay=0, failure_rate=0.0, error_status=503, retry_after=1,
+                    hang_rate=0.0, hang_seconds=60, seed=0, verbose=False)
+    state = StubState(argparse.Namespace(**{**defaults, **options}))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+def test_llm_client_retries():
+    """Test that 5xx responses are retried with backoff and counted, and a recovered upstream is used"""
+    print("\nTesting LLM client retries...")
+    
+    from llm_client import CircuitBreaker, LLMClient, LLMUnavailable
+    
+    server, state, base_url = start_stub_llm(failure_rate=1.0)
+    try:
+        client = LLMClient('stub', base_url, max_retries=2, backoff_base=0.01, backoff_max=0.02,
+                           breaker=CircuitBreaker(failure_threshold=10))
+        messages = [{"role": "user", "content": "Original Resume:\nJane Doe\nJob Role: Engineer"}]
+        try:
+            client.chat(messages)
+            failed = False
+        except LLMUnavailable:
+            failed = True
+        failed_stats = client.stats()
+        
+        state.options.failure_rate = 0.0
+        text = client.chat(messages)
+        stats = client.stats()
+        print(f"Upstream calls: {state.calls}, stats after failure: {failed_stats}")
+        return (failed and failed_stats['calls'] == 1 and failed_stats['retries'] == 2
+                and failed_stats['failures'] == 1 and state.failures == 3
+                and text.startswith("TAILORED RESUME (stub)") and state.calls == 4
+                and stats['calls'] == 2 and stats['failures'] == 1 and stats['circuit'] == 'closed')
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        server.shutdown()
+
+def test_llm_circuit_breaker():
+    """Test that the breaker opens after repeated failures, rejects calls, then recovers through a half-open probe"""
+    print("\nTesting LLM circuit breaker...")
+    
+    from llm_client import CircuitBreaker, LLMClient, LLMUnavailable
+    
+    server, state, base_url = start_stub_llm(failure_rate=1.0)
+    try:
+        client = LLMClient('stub', base_url, max_retries=0,
+                           breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.3))
+        messages = [{"role": "user", "content": "Original Resume:\nJane Doe\nJob Role: Engineer"}]
+        
+        def call():
+            try:
+                client.chat(messages)
+                return 'ok'
+            except LLMUnavailable:
+                return 'unavailable'
+        
+        states = []
+        for _ in range(2):
+            call()
+            states.append(client.breaker.state)
+        calls_when_open = state.calls
+        rejected = call()
+        states.append(client.breaker.state)
+        
+        time.sleep(0.35)
+        states.append(client.breaker.state)
+        failed_probe = call()  # The probe fails, so the breaker opens again
+        states.append(client.breaker.state)
+        
+        time.sleep(0.35)
+        state.options.failure_rate = 0.0
+        recovered = call()
+        states.append(client.breaker.state)
+        print(f"Breaker states: {states}, rejected: {client.stats()['rejected']}")
+        return (states == ['closed', 'open', 'open', 'half_open', 'open', 'closed']
+                and rejected == 'unavailable' and failed_probe == 'unavailable' and recovered == 'ok'
+                and calls_when_open == 2 and state.calls == 4 and client.stats()['rejected'] == 1)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        server.shutdown()
+
+def test_llm_queue_wait():
+    """Test that a caller waiting longer than queue_timeout for a slot is rejected without calling upstream"""
+    print("\nTesting LLM queue wait...")
+    
+    import threading
+    from llm_client import LLMClient, LLMUnavailable
+    
+    server, state, base_url = start_stub_llm(latency=500)
+    try:
+        client = LLMClient('stub', base_url, max_concurrency=1, queue_timeout=0.1)
+        messages = [{"role": "user", "content": "Original Resume:\nJane Doe\nJob Role: Engineer"}]
+        holder = threading.Thread(target=client.chat, args=(messages,))
+        holder.start()
+        time.sleep(0.1)
+        in_flight = client.in_flight
+        start = time.perf_counter()
+        try:
+            client.chat(messages)
+            waited_out = False
+        except LLMUnavailable:
+            waited_out = True
+        waited = time.perf_counter() - start
+        holder.join()
+        stats = client.stats()
+        print(f"Rejected after {waited:.2f}s, stats: {stats}")
+        return (waited_out and in_flight == 1 and waited < 0.4 and state.calls == 1
+                and stats['rejected'] == 1 and stats['in_flight'] == 0)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        server.shutdown()
+
+def test_llm_stream_chat():
+    """Test that stream_chat yields the upstream deltas in order and frees its slot"""
+    print("\nTesting LLM stream chat...")
+    
+    from llm_client import LLMClient
+    
+    server, state, base_url = start_stub_llm()
+    try:
+        client = LLMClient('stub', base_url, max_concurrency=1)
+        messages = [{"role": "user", "content": "Original Resume:\nJane Doe\nPython developer\nJob Role: Engineer"}]
+        deltas = list(client.stream_chat(messages))
+        print(f"Deltas: {deltas}")
+        return (len(deltas) > 1 and ''.join(deltas) == "TAILORED RESUME (stub)\nJane Doe\nPython developer"
+                and client.in_flight == 0 and client.stats()['calls'] == 1 and state.calls == 1)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        server.shutdown()
+
+def sample_docx():
+    """DOCX with skills only in the page header and a table, where doc.paragraphs never looks"""
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    def paragraph(text):
+        return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    cells = ''.join(f'<w:tc>{paragraph(skill)}</w:tc>' for skill in ('Kubernetes', 'Terraform'))
+    body = f'{paragraph("Jane Doe")}{paragraph("SKILLS")}<w:tbl><w:tr>{cells}</w:tr></w:tbl>'
+    out = BytesIO()
+    with zipfile.ZipFile(out, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document {w}><w:body>{body}</w:body></w:document>')
+        archive.writestr('word/header1.xml', f'<w:hdr {w}>{paragraph("Python Engineer")}</w:hdr>')
+    return out.getvalue()
+
+def test_docx_tables_and_headers():
+    """Test that DOCX uploads include text from headers and tables"""
+    print("\nTesting DOCX headers and tables...")
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/upload-resume",
+            files={"file": ("resume.docx", sample_docx())}
+        )
+        data = response.json()
+        print(f"Extracted text: {data.get('resume_text')!r}")
+        return (response.status_code == 200
+                and data['resume_text'].split('\n') == ['Python Engineer', 'Jane Doe', 'SKILLS', 'Kubernetes', 'Terraform'])
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_large_upload_spooling():
+    """Test that a chunked multipart upload past the spool threshold parses and is hashed like a plain one"""
+    print("\nTesting large upload spooling...")
+    
+    text = "Jane Doe\nSKILLS\nPython, Docker, Kubernetes\n" + "Built data pipelines and services.\n" * 40000
+    boundary = "spooltestboundary"
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="resume.txt"\r\n'
+            f'Content-Type: text/plain\r\n\r\n{text}\r\n--{boundary}--\r\n').encode()
+    
+    def chunks():
+        # A generator body is sent with chunked transfer encoding and no Content-Length
+        for start in range(0, len(body), 64 * 1024):
+            yield body[start:start + 64 * 1024]
+    
+    try:
+        before = requests.get(f"{BASE_URL}/api/health").json()['caches']['extraction']
+        chunked = requests.post(f"{BASE_URL}/api/upload-resume", data=chunks(),
+                                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+        plain = requests.post(f"{BASE_URL}/api/upload-resume", files={"file": ("resume.txt", text.encode())})
+        after = requests.get(f"{BASE_URL}/api/health").json()['caches']['extraction']
+        print(f"Status: {chunked.status_code}/{plain.status_code}, cache hits: {before['hits']} -> {after['hits']}")
+        return (chunked.status_code == 200 and plain.status_code == 200
+                and chunked.json()['resume_id'] == plain.json()['resume_id']
+                and after['hits'] > before['hits'])
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_startup_state():
+    """Test that health reports how startup state was loaded and lazily imported scoring still works"""
+    print("\nTesting startup state...")
+    
+    try:
+        startup = requests.get(f"{BASE_URL}/api/health").json().get('startup') or {}
+        response = requests.post(f"{BASE_URL}/api/tailor-resume", json={
+            "resume_text": "Alex Kim\nExperience:\n- Built services in Python",
+            "job_description": "Backend Engineer\nRequirements:\n- Python"
+        })
+        print(f"Startup: {startup}")
+        return (startup.get('state') in ('built', 'snapshot')
+                and isinstance(startup.get('warmed_up'), bool)
+                and response.status_code == 200
+                and response.json()['match_score'] > 0)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_pdf_page_limit():
+    """Test that the page budget stops PDF extraction without reading the next page"""
+    print("\nTesting PDF page limit...")
+    
+    try:
+        import PyPDF2
+        from text_extraction import extract_document_file, extract_document_text
+        
+        writer = PyPDF2.PdfWriter()
+        for _ in range(5):
+            writer.add_blank_page(width=612, height=792)
+        pdf = BytesIO()
+        writer.write(pdf)
+        
+        extracted = []
+        original = PyPDF2.PageObject.extract_text
+        PyPDF2.PageObject.extract_text = lambda page, *args, **kwargs: extracted.append(page) or original(page, *args, **kwargs)
+        try:
+            limited = extract_document_text(pdf.getvalue(), "resume.pdf", max_pages=2)
+            limited_calls = len(extracted)
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as handle:
+                handle.write(pdf.getvalue())
+                handle.flush()
+                from_file = extract_document_file(handle.name, "resume.pdf", max_pages=2)
+            file_calls = len(extracted) - limited_calls
+            whole = extract_document_text(pdf.getvalue(), "resume.pdf", max_pages=5)
+        finally:
+            PyPDF2.PageObject.extract_text = original
+        print(f"Pages extracted: {limited_calls} (bytes), {file_calls} (file)")
+        return (limited_calls == 2 and file_calls == 2
+                and limited['truncated_by'] == 'page_limit' and from_file['parts_read'] == 2
+                and not whole['truncated'] and whole['parts_read'] == 5)
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
 def main():
     print("Resume Tailor API Test Suite")
     print("=" * 40)
@@ -115,7 +1083,40 @@ def main():
     tests = [
         ("Health Check", test_health),
         ("Job Analysis", test_job_analysis),
-        ("Resume Tailoring", test_resume_tailoring)
+        ("Resume Tailoring", test_resume_tailoring),
+        ("Skill Word Boundaries", test_skill_word_boundaries),
+        ("Upload Cache", test_upload_cache),
+        ("Upload Cache File Names", test_upload_cache_file_names),
+        ("Batch Tailoring", test_batch_tailoring),
+        ("Resume Ranking", test_rank_resumes),
+        ("Ranking Long Resume", test_rank_long_resume),
+        ("Scoring Engine", test_scoring_engine),
+        ("Tailoring Profile", test_tailoring_profile),
+        ("Job Analysis Cache", test_job_analysis_cache),
+        ("Streaming Tailoring", test_streaming_tailoring),
+        ("Stream Disconnect", test_stream_disconnect),
+        ("LLM Client Retries", test_llm_client_retries),
+        ("LLM Circuit Breaker", test_llm_circuit_breaker),
+        ("LLM Queue Wait", test_llm_queue_wait),
+        ("LLM Stream Chat", test_llm_stream_chat),
+        ("Extraction Pool Cold Start", test_extraction_pool_cold_start),
+        ("LLM Cache Reporting", test_llm_cache_reporting),
+        ("Metrics", test_metrics),
+        ("User Stats Aggregates", test_user_stats_aggregates),
+        ("Section Segmentation", test_section_segmentation),
+        ("Request Budgets", test_request_budgets),
+        ("Bounded Added Keywords", test_bounded_added_keywords),
+        ("Upload Within Resume Budget", test_upload_within_resume_budget),
+        ("Async Tailoring Job", test_async_tailoring_job),
+        ("Job Queue Depth After Expiry", test_job_queue_depth_after_expiry),
+        ("Resume Handles", test_resume_handle),
+        ("Skill Gap", test_skill_gap),
+        ("Response Compression", test_response_compression),
+        ("JSON Encoders", test_json_encoders_match),
+        ("DOCX Headers and Tables", test_docx_tables_and_headers),
+        ("Large Upload Spooling", test_large_upload_spooling),
+        ("Startup State", test_startup_state),
+        ("PDF Page Limit", test_pdf_page_limit)
     ]
     
     results = []
@@ -0,0 +1,237 @@
+"""
+Incremental text extraction for uploaded resumes.
+
+Each iter_* generator yields one PDF page or DOCX paragraph at a time so
+callers can stop early, and extract_document_text collects parts up to a
+page and character budget before joining them once.
+
+DOCX text is streamed out of the zip: each part (headers, document body,
+footers) is decompressed in chunks and fed to an expat parser, so memory
+stays bounded by the chunk size and the paragraph being read rather than
+growing with a full object model. Paragraphs inside tables and text boxes
+are read where they appear, which python-docx's doc.paragraphs skips.
+
+Content may be bytes or any buffer, such as a memoryview of a spooled upload
+or of a memory-mapped file; parsers read it through a file interface over
+that buffer instead of a BytesIO copy.
+"""
+
+import io
+import mmap
+import os
+import re
+import zipfile
+from typing import Dict, Iterator, List, Optional, Union
+from xml.parsers import expat
+
+# Element names as expat reports them with namespace_separator=' '
+_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main '
+_W_P, _W_R, _W_T, _W_TAB, _W_BR, _W_CR = (_W + name for name in ('p', 'r', 't', 'tab', 'br', 'cr'))
+# Text boxes are stored twice, as DrawingML and as a VML fallback; only the first is read
+_MC_FALLBACK = 'http://schemas.openxmlformats.org/markup-compatibility/2006 Fallback'
+
+_DOCX_BODY = 'word/document.xml'
+_DOCX_HEADER = re.compile(r'word/header(\d*)\.xml$')
+_DOCX_FOOTER = re.compile(r'word/footer(\d*)\.xml$')
+_DOCX_CHUNK_BYTES = 64 * 1024
+
+
+Content = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a buffer, copying only the bytes each read asks for"""
+
+    def __init__(self, content: Content):
+        self._view = memoryview(content)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        count = max(min(len(target), len(self._view) - self._position), 0)
+        target[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        # Release the view so a memory map underneath can be closed
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def open_buffer(content: Content) -> io.BufferedReader:
+    """Binary file reading content in place"""
+    return io.BufferedReader(_BufferReader(content))
+
+
+def iter_pdf_text(file_content: Content) -> Iterator[str]:
+    """Yield the text of each PDF page in order"""
+    import PyPDF2  # Imported on the first PDF so startup does not pay for it
+    with open_buffer(file_content) as stream:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ''
+
+
+def pdf_page_count(file_content: Content) -> int:
+    """Number of pages in a PDF, read from its page tree without extracting any text"""
+    import PyPDF2
+    with open_buffer(file_content) as stream:
+        return len(PyPDF2.PdfReader(stream).pages)
+
+
+class _ParagraphCollector:
+    """expat handlers gathering the text of each WordprocessingML paragraph"""
+
+    def __init__(self):
+        self.open: List[List[str]] = []  # Paragraphs being read, innermost (a text box) last
+        self.done: List[str] = []  # Finished paragraphs not yet yielded
+        self.parents: List[str] = []
+        self.in_text = False
+        self.skip_depth = 0
+
+    def start(self, name: str, attrs) -> None:
+        if self.skip_depth or name == _MC_FALLBACK:
+            self.skip_depth += 1
+            return
+        parent = self.parents[-1] if self.parents else None
+        self.parents.append(name)
+        if name == _W_P:
+            self.open.append([])
+        elif name == _W_T:
+            self.in_text = True
+        elif parent == _W_R and self.open:
+            # Tab stops in paragraph properties are also w:tab, so only run children count
+            if name == _W_TAB:
+                self.open[-1].append('\t')
+            elif name in (_W_BR, _W_CR):
+                self.open[-1].append('\n')
+
+    def end(self, name: str) -> None:
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        self.parents.pop()
+        if name == _W_T:
+            self.in_text = False
+        elif name == _W_P:
+            self.done.append(''.join(self.open.pop()))
+
+    def text(self, data: str) -> None:
+        if self.in_text and self.open:
+            self.open[-1].append(data)
+
+
+def _iter_docx_part(archive: zipfile.ZipFile, name: str) -> Iterator[str]:
+    """Yield paragraph texts of one XML part, decompressing and parsing a chunk at a time"""
+    collector = _ParagraphCollector()
+    parser = expat.ParserCreate(namespace_separator=' ')
+    parser.StartElementHandler = collector.start
+    parser.EndElementHandler = collector.end
+    parser.CharacterDataHandler = collector.text
+    parser.buffer_text = True
+    with archive.open(name) as stream:
+        while True:
+            chunk = stream.read(_DOCX_CHUNK_BYTES)
+            parser.Parse(chunk, not chunk)
+            finished, collector.done = collector.done, []
+            yield from finished
+            if not chunk:
+                break
+
+
+def _iter_docx_margin(archive: zipfile.ZipFile, pattern, seen: set) -> Iterator[str]:
+    """Yield non-empty header or footer paragraphs not already yielded, parts in numeric order"""
+    names = [name for name in archive.namelist() if pattern.match(name)]
+    for name in sorted(names, key=lambda name: int(pattern.match(name).group(1) or 0)):
+        for paragraph in _iter_docx_part(archive, name):
+            if paragraph.strip() and paragraph not in seen:
+                seen.add(paragraph)
+                yield paragraph
+
+
+def iter_docx_text(file_content: Content) -> Iterator[str]:
+    """Yield DOCX paragraphs in reading order: headers, the body with its tables and text boxes, then footers
+
+    Header and footer paragraphs repeated across sections (first page, odd and even pages) are yielded once.
+    """
+    with open_buffer(file_content) as stream, zipfile.ZipFile(stream) as archive:
+        seen = set()
+        yield from _iter_docx_margin(archive, _DOCX_HEADER, seen)
+        yield from _iter_docx_part(archive, _DOCX_BODY)
+        yield from _iter_docx_margin(archive, _DOCX_FOOTER, seen)
+
+
+def iter_document_text(file_content: Content, filename: str) -> Iterator[str]:
+    """Yield text parts of an upload based on its file extension"""
+    if filename.lower().endswith('.pdf'):
+        return iter_pdf_text(file_content)
+    elif filename.lower().endswith('.docx'):
+        return iter_docx_text(file_content)
+    else:  # txt file
+        return iter([str(file_content, 'utf-8')])
+
+
+def part_type(filename: str) -> str:
+    """Name of the unit yielded by iter_document_text for this file"""
+    if filename.lower().endswith('.pdf'):
+        return 'page'
+    elif filename.lower().endswith('.docx'):
+        return 'paragraph'
+    return 'text'
+
+
+def extract_document_text(file_content: Content, filename: str,
+                          max_pages: Optional[int] = None,
+                          max_chars: Optional[int] = None) -> Dict[str, any]:
+    """Extract text up to a page and character budget, joining parts once"""
+    kind = part_type(filename)
+    parts = []
+    chars = 0
+    truncated_by = None
+
+    for part in iter_document_text(file_content, filename):
+        if max_chars and chars + len(part) > max_chars:
+            parts.append(part[:max(max_chars - chars, 0)])
+            truncated_by = 'char_limit'
+            break
+        parts.append(part)
+        chars += len(part) + 1  # Account for the joining newline
+        if kind == 'page' and max_pages and len(parts) >= max_pages:
+            # Stop before extracting another page; the page count says whether any were left unread
+            if pdf_page_count(file_content) > max_pages:
+                truncated_by = 'page_limit'
+            break
+
+    return {
+        'text': '\n'.join(parts),
+        'truncated': truncated_by is not None,
+        'truncated_by': truncated_by,
+        'parts_read': len(parts),
+        'part_type': kind
+    }
+
+
+def extract_document_file(path: str, filename: str,
+                          max_pages: Optional[int] = None,
+                          max_chars: Optional[int] = None) -> Dict[str, any]:
+    """extract_document_text over a file on disk, memory-mapped rather than read into memory"""
+    with open(path, 'rb') as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            return extract_document_text(b'', filename, max_pages, max_chars)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return extract_document_text(mapped, filename, max_pages, max_chars)
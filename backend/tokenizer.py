@@ -0,0 +1,26 @@
+"""
+Shared word tokenization for indexing and scoring.
+"""
+
+import re
+from typing import List
+
+# Words, keeping tech spellings such as c++, c#, node.js and ci/cd together
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[+#]+|[./][a-z0-9]+)*")
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same
+she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours yourself
+yourselves etc e.g i.e via per within across using including years year plus
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens in order, without stop words"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
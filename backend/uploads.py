@@ -0,0 +1,87 @@
+"""
+Spooled upload buffers that are hashed while they are written.
+
+The multipart parser writes each uploaded file into an UploadSpool a chunk
+at a time. Small files stay in memory; once a file passes max_memory bytes
+it moves to a named temporary file, so a request holds at most max_memory
+bytes of upload in memory however large the file is. Every chunk also
+updates a SHA-256, so the content address used by the extraction cache is
+ready when parsing ends without reading the file a second time.
+
+view() exposes the content for parsing without copying it: a memoryview of
+the in-memory buffer or of a read-only memory map of the temporary file.
+"""
+
+import hashlib
+import mmap
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Iterator, Optional
+
+
+class UploadSpool:
+    """Append-only file buffer: memory up to max_memory bytes, then a temporary file"""
+
+    def __init__(self, max_memory: int, directory: Optional[str] = None):
+        self.max_memory = max_memory
+        self.directory = directory
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = BytesIO()
+        self._on_disk = False
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest of everything written, matching caching.content_hash"""
+        return self._hash.hexdigest()
+
+    @property
+    def path(self) -> Optional[str]:
+        """Temporary file holding the content, or None while it is still in memory"""
+        return self._file.name if self._on_disk else None
+
+    def write(self, data) -> int:
+        # The multipart parser only appends, so hashing writes in order hashes the content
+        self._hash.update(data)
+        self.size += len(data)
+        if not self._on_disk and self.size > self.max_memory:
+            self._rollover()
+        return self._file.write(data)
+
+    def _rollover(self) -> None:
+        spilled = tempfile.NamedTemporaryFile(dir=self.directory, prefix='upload-')
+        spilled.write(self._file.getbuffer())
+        self._file = spilled
+        self._on_disk = True
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """View of the whole content for parsing, valid inside the with block"""
+        if not self._on_disk:
+            with self._file.getbuffer() as buffer:
+                yield buffer
+            return
+        self._file.flush()
+        if not self.size:
+            yield memoryview(b'')
+            return
+        mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with memoryview(mapped) as buffer:
+                yield buffer
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                pass  # A parser still holds a slice; the map is released when it is collected
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        except BufferError:
+            pass  # Still viewed by an uncollected parser; freed with it
+
+    def __getattr__(self, name):
+        # read/seek/readline and the rest of the file API come from the current buffer
+        return getattr(self._file, name)
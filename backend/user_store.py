@@ -0,0 +1,281 @@
+"""
+Per-user dashboard statistics with constant-time reads.
+
+Each user has running aggregates (resumes tailored, count and sum of match
+scores) and a capped list of their most recent activities, so reading the
+stats never depends on how much history a user has. Two interchangeable
+stores are provided, both with record_activity(), get_stats(), flush() and
+close():
+
+MemoryUserStore keeps everything in this process. SQLiteUserStore keeps it
+in an SQLite file in WAL mode, shared by every worker process and kept
+across restarts. Writes are queued and applied in one transaction per batch
+by a background thread; until then get_stats() in the writing process
+merges the queued changes, and other processes see them after the next
+flush.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+def _is_tailoring(action: str) -> bool:
+    return 'tailored' in action.lower()
+
+
+def _relative_time(created_at: float, now: float) -> str:
+    seconds = max(now - created_at, 0)
+    if seconds < 60:
+        return 'Just now'
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+
+
+def _activity(activity_id: int, action: str, status: str, created_at: float, now: float) -> Dict[str, any]:
+    return {'id': activity_id, 'action': action, 'time': _relative_time(created_at, now), 'status': status}
+
+
+def _stats(tailored: int, score_count: int, score_sum: float, activities: List[Dict]) -> Dict[str, any]:
+    return {
+        'resumes_tailored': tailored,
+        'average_match_score': round(score_sum / score_count) if score_count else 0,
+        'applications_sent': 0,
+        'recent_activity': activities
+    }
+
+
+class _ActivityIds:
+    """Increasing activity IDs from the clock, unique within a process and ordered across processes"""
+
+    def __init__(self):
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            self._last = max(self._last + 1, time.time_ns() // 1000)
+            return self._last
+
+
+class MemoryUserStore:
+    """Aggregates and a ring buffer of recent activity per user, in this process only"""
+
+    def __init__(self, max_activity: int = 10):
+        self.max_activity = max_activity
+        self._users: Dict[str, Dict[str, any]] = {}
+        self._ids = _ActivityIds()
+        self._lock = threading.Lock()
+
+    def record_activity(self, user_id: str, action: str, match_score: float = 0,
+                        status: str = 'completed') -> Dict[str, any]:
+        activity_id = self._ids.next()
+        now = time.time()
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                user = self._users[user_id] = {
+                    'tailored': 0, 'score_count': 0, 'score_sum': 0.0,
+                    'activity': deque(maxlen=self.max_activity)
+                }
+            user['activity'].appendleft((activity_id, action, status, now))
+            if _is_tailoring(action):
+                user['tailored'] += 1
+                if match_score > 0:
+                    user['score_count'] += 1
+                    user['score_sum'] += match_score
+        return _activity(activity_id, action, status, now, now)
+
+    def get_stats(self, user_id: str) -> Dict[str, any]:
+        now = time.time()
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                return _stats(0, 0, 0.0, [])
+            activities = [_activity(*entry, now) for entry in user['activity']]
+            return _stats(user['tailored'], user['score_count'], user['score_sum'], activities)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteUserStore:
+    """User aggregates and capped activity in SQLite, written in batches by a background thread"""
+
+    def __init__(self, path: str, max_activity: int = 10, batch_size: int = 200, flush_interval: float = 0.5):
+        self.path = path
+        self.max_activity = max_activity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._ids = _ActivityIds()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # user_id -> [tailored, score_count, score_sum] not yet written
+        self._pending_stats: Dict[str, List] = {}
+        # (user_id, id, action, status, created_at) not yet written, oldest first
+        self._pending_activity: List[Tuple[str, int, str, str, float]] = []
+        # Odd while a batch is being written; readers retry if it changed under them
+        self._generation = 0
+        self._wake = threading.Event()
+        self._stopped = False
+
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS user_stats (user_id TEXT PRIMARY KEY, '
+                'resumes_tailored INTEGER NOT NULL, score_count INTEGER NOT NULL, score_sum REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS user_activity (user_id TEXT NOT NULL, id INTEGER NOT NULL, '
+                'action TEXT NOT NULL, status TEXT NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (user_id, id))'
+            )
+        self._start_writer()
+        if hasattr(os, 'register_at_fork'):
+            # Only the forking thread survives fork, so a store created before workers fork restarts its writer
+            store = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: store() and store()._after_fork())
+
+    def _start_writer(self) -> None:
+        self._writer = threading.Thread(target=self._run, name='user-store-writer', daemon=True)
+        self._writer.start()
+
+    def _after_fork(self) -> None:
+        # Queued changes belong to the parent, which flushes them; locks may have been held mid-fork
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending_stats, self._pending_activity = {}, []
+        self._generation = 0
+        if not self._stopped:
+            self._start_writer()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not cross threads, nor a fork such as gunicorn --preload
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def record_activity(self, user_id: str, action: str, match_score: float = 0,
+                        status: str = 'completed') -> Dict[str, any]:
+        activity_id = self._ids.next()
+        now = time.time()
+        with self._lock:
+            self._pending_activity.append((user_id, activity_id, action, status, now))
+            if _is_tailoring(action):
+                pending = self._pending_stats.setdefault(user_id, [0, 0, 0.0])
+                pending[0] += 1
+                if match_score > 0:
+                    pending[1] += 1
+                    pending[2] += match_score
+            if len(self._pending_activity) >= self.batch_size:
+                self._wake.set()
+        return _activity(activity_id, action, status, now, now)
+
+    def get_stats(self, user_id: str) -> Dict[str, any]:
+        conn = self._connect()
+        while True:
+            generation = self._generation
+            if generation % 2:
+                time.sleep(0.001)  # A batch is being written
+                continue
+            row = conn.execute(
+                'SELECT resumes_tailored, score_count, score_sum FROM user_stats WHERE user_id = ?', (user_id,)
+            ).fetchone()
+            rows = conn.execute(
+                'SELECT id, action, status, created_at FROM user_activity WHERE user_id = ? '
+                'ORDER BY id DESC LIMIT ?',
+                (user_id, self.max_activity)
+            ).fetchall()
+            # Changes from this process that the writer has not applied yet
+            with self._lock:
+                if self._generation != generation:
+                    continue  # A batch moved from the queue to the table while reading
+                pending = self._pending_stats.get(user_id)
+                pending = list(pending) if pending else None
+                queued = [entry[1:] for entry in self._pending_activity if entry[0] == user_id]
+            break
+
+        tailored, score_count, score_sum = row or (0, 0, 0.0)
+        if pending:
+            tailored += pending[0]
+            score_count += pending[1]
+            score_sum += pending[2]
+        if queued:
+            rows = sorted(set(rows) | set(queued), reverse=True)[:self.max_activity]
+
+        now = time.time()
+        return _stats(tailored, score_count, score_sum, [_activity(*entry, now) for entry in rows])
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Error writing user stats: {e}")
+
+    def flush(self) -> None:
+        """Apply queued changes in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                stats, activity = self._pending_stats, self._pending_activity
+                if not stats and not activity:
+                    return
+                self._pending_stats, self._pending_activity = {}, []
+                self._generation += 1
+            try:
+                self._write(stats, activity)
+            except sqlite3.Error:
+                # Put the batch back so it is retried with the next one
+                with self._lock:
+                    self._generation += 1
+                    for user_id, (tailored, score_count, score_sum) in stats.items():
+                        pending = self._pending_stats.setdefault(user_id, [0, 0, 0.0])
+                        pending[0] += tailored
+                        pending[1] += score_count
+                        pending[2] += score_sum
+                    self._pending_activity[:0] = activity
+                raise
+            with self._lock:
+                self._generation += 1
+
+    def _write(self, stats: Dict[str, List], activity: List[Tuple[str, int, str, str, float]]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO user_stats (user_id, resumes_tailored, score_count, score_sum) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(user_id) DO UPDATE SET '
+                'resumes_tailored = resumes_tailored + excluded.resumes_tailored, '
+                'score_count = score_count + excluded.score_count, '
+                'score_sum = score_sum + excluded.score_sum',
+                [(user_id, *values) for user_id, values in stats.items()]
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO user_activity (user_id, id, action, status, created_at) VALUES (?, ?, ?, ?, ?)',
+                activity
+            )
+            # Trim each touched user's activity back to the newest max_activity rows
+            conn.executemany(
+                'DELETE FROM user_activity WHERE user_id = ? AND id < '
+                '(SELECT MIN(id) FROM (SELECT id FROM user_activity WHERE user_id = ? ORDER BY id DESC LIMIT ?))',
+                [(user_id, user_id, self.max_activity) for user_id in {entry[0] for entry in activity}]
+            )
+
+    def close(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
@@ -17,7 +17,7 @@ echo [2/3] Setting up Python backend...
 cd backend
 
 echo Installing basic Python packages...
-pip install flask flask-cors openai PyPDF2 python-docx python-dotenv requests
+pip install flask flask-cors openai PyPDF2 python-dotenv requests
 
 if not exist ".env" (
     echo Creating .env file...
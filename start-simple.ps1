@@ -16,7 +16,7 @@ Write-Host "[2/3] Setting up Python backend..." -ForegroundColor Yellow
 Set-Location backend
 
 Write-Host "Installing basic Python packages..." -ForegroundColor Green
-pip install flask flask-cors openai PyPDF2 python-docx python-dotenv requests
+pip install flask flask-cors openai PyPDF2 python-dotenv requests
 
 if (!(Test-Path ".env")) {
     Write-Host "Creating .env file..." -ForegroundColor Green